@@ -6,28 +6,26 @@ import sys
 import asyncio
 import threading
 from datetime import datetime
-from dotenv import load_dotenv
-from flask import Flask, jsonify, request, make_response
+from flask import Flask, Response, jsonify, request, make_response, send_file, stream_with_context
 from flask_discord import DiscordOAuth2Session
 from flask_cors import CORS
-import pandas as pd
-import csv
-from functools import lru_cache
 
 # my-flask-app 모듈 임포트 경로 조정
 sys.path.append(os.path.join(os.path.dirname(__file__), 'my_flask_app'))
-from audit_service import AuditService
-
-# 명시적으로 .env 파일 경로를 지정하여 환경 변수 로드
-env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-load_dotenv(dotenv_path=env_path)
+# .env와 로그 형식은 다른 모듈을 임포트하기 전에 한 번만 설정 (config 임포트 자체는 부작용 없음)
+from config import load_environment, configure_logging
+load_environment()
+configure_logging()
+from report_store import ReportStore, REPORT_DIR, PAGE_SIZE, brotli
+from audit_events import audit_events, format_sse
+from file_browser import LISTING_PAGE_SIZE, project_browse_path
+from services import services
+from columnar_export import COLUMNAR_FORMATS, columnar_available, ensure_columnar_report
+from metrics import metrics
 
 app = Flask(__name__)
 CORS(app)
 
-# 서비스 인스턴스 생성
-audit_service = AuditService()
-
 app.secret_key = os.getenv("FLASK_SECRET_KEY")
 app.config["DISCORD_CLIENT_ID"] = os.getenv("DISCORD_CLIENT_ID")
 app.config["DISCORD_CLIENT_SECRET"] = os.getenv("DISCORD_CLIENT_SECRET")
@@ -36,47 +34,10 @@ app.config["DISCORD_BOT_TOKEN"] = os.getenv("DISCORD_BOT_TOKEN")
 
 discord_oauth = DiscordOAuth2Session(app)
 
-# CSV 파일 경로
-CSV_PATH = 'static/report/combined_report_20250305.csv'
+# 통합 보고서 저장소 (static/report/combined_report.csv가 바뀌면 자동으로 다시 로드, AUDIT_REPORT_DIR로 다른 폴더 지정 가능)
+report_store = ReportStore(os.getenv('AUDIT_REPORT_DIR', REPORT_DIR))
 
-@lru_cache(maxsize=128)
-def load_csv_data():
-    """CSV 데이터를 로드하고 캐시"""
-    projects = []
-    try:
-        with open(CSV_PATH, newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                projects.append(row)
-        return projects
-    except Exception as e:
-        print(f"Error loading CSV: {e}")
-        return []
-
-def convert_project_to_json(project):
-    """프로젝트 데이터를 JSON 형식으로 변환"""
-    documents = {
-        'contract': {'exists': bool(int(project['contract_exists'])), 'details': []},
-        'specification': {'exists': bool(int(project['specification_exists'])), 'details': []},
-        'initiation': {'exists': bool(int(project['initiation_exists'])), 'details': []},
-        'agreement': {'exists': bool(int(project['agreement_exists'])), 'details': []},
-        'budget': {'exists': bool(int(project['budget_exists'])), 'details': []},
-        'deliverable1': {'exists': bool(int(project['deliverable1_exists'])), 'details': []},
-        'deliverable2': {'exists': bool(int(project['deliverable2_exists'])), 'details': []},
-        'completion': {'exists': bool(int(project['completion_exists'])), 'details': []},
-        'certificate': {'exists': bool(int(project['certificate_exists'])), 'details': []},
-        'evaluation': {'exists': bool(int(project['evaluation_exists'])), 'details': []}
-    }
-    
-    return {
-        'project_id': project['project_id'],
-        'project_name': project['project_name'],
-        'department': project['department'],
-        'status': project['Status'],
-        'contractor': project['Contractor'],
-        'documents': documents,
-        'timestamp': project['timestamp']
-    }
+# 감사 서비스와 폴더 탐색기는 /files를 처음 호출할 때 생성 (서버 시작 시간 단축)
 
 @app.route('/')
 def index():
@@ -86,8 +47,15 @@ def index():
         'message': 'Project Audit API Server is running',
         'endpoints': {
             'audit_project': '/audit_project/<project_id>',
+            'audit_department': '/audit_department/<department>',
+            'department_summary': '/department_summary',
+            'columnar_report': '/report.arrow|/report.parquet',
+            'audit_events': '/audit_events',
+            'metrics': '/metrics',
+            'files': '/files?path=<path>|project_id=<project_id>',
             'audit_all': '/audit_all'
         },
+        'report': report_store.info(),
         'server_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
         'version': '1.0.0'
     })
@@ -105,16 +73,14 @@ def audit_project(project_id):
     """특정 프로젝트의 감사 데이터를 반환"""
     try:
         use_ai = request.args.get('use_ai', 'false').lower() == 'true'
-        projects = load_csv_data()
-        
-        for project in projects:
-            if project['project_id'] == project_id:
-                result = convert_project_to_json(project)
-                if use_ai:
-                    result['ai_analysis'] = 'AI analysis not implemented'
-                return jsonify(result), 200
-                
-        return jsonify({'error': f'Project {project_id} not found'}), 404
+        project = report_store.get(project_id)
+        if project is None:
+            return jsonify({'error': f'Project {project_id} not found'}), 404
+
+        result = dict(project)
+        if use_ai:
+            result['ai_analysis'] = 'AI analysis not implemented'
+        return jsonify(result), 200
         
     except Exception as e:
         return jsonify({
@@ -122,13 +88,58 @@ def audit_project(project_id):
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }), 500
 
+def _page_response(page):
+    """직렬화된 페이지 응답 (ETag가 같으면 304, Accept-Encoding에 따라 br/gzip)"""
+    if request.if_none_match.contains_weak(page.etag):
+        response = make_response('', 304)
+    else:
+        encodings = ['br', 'gzip', 'identity'] if brotli is not None else ['gzip', 'identity']
+        encoding = request.accept_encodings.best_match(encodings, default='identity')
+        response = make_response(page.encode(encoding), 200)
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(page.etag, weak=True)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def _split_arg(name):
+    """쉼표로 구분된 쿼리 인자 (?status=진행,준공 또는 ?status=진행&status=준공)"""
+    return [value.strip() for raw in request.args.getlist(name) for value in raw.split(',') if value.strip()]
+
+def _limit_arg(default):
+    """limit 쿼리 인자 (숫자가 아니면 ValueError -> 400, 잘못된 cursor와 같은 처리)"""
+    value = request.args.get('limit')
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"limit은 정수여야 합니다: {value}")
+
 @app.route('/audit_all', methods=['GET'])
 def audit_all():
-    """모든 프로젝트의 감사 데이터를 반환"""
+    """모든 프로젝트의 감사 데이터를 페이지 단위로 반환
+
+    쿼리 인자: department, status, contractor, missing(없는 문서 종류), fields(반환할 필드),
+    limit(기본 100), cursor(이전 응답의 next_cursor)
+    """
     try:
-        projects = load_csv_data()
-        result = [convert_project_to_json(project) for project in projects]
-        return jsonify({'projects': result}), 200
+        try:
+            page = report_store.query_page(
+                department=_split_arg('department'),
+                status=_split_arg('status'),
+                contractor=_split_arg('contractor'),
+                missing=_split_arg('missing'),
+                fields=_split_arg('fields'),
+                cursor=request.args.get('cursor'),
+                limit=_limit_arg(PAGE_SIZE)
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        return _page_response(page)
         
     except Exception as e:
         return jsonify({
@@ -136,6 +147,119 @@ def audit_all():
             'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
         }), 500
 
+@app.route('/audit_department/<department>', methods=['GET'])
+def audit_department(department):
+    """특정 부서(코드 또는 부서명)의 감사 데이터를 반환"""
+    try:
+        projects = report_store.by_department(department)
+        if not projects:
+            return jsonify({'error': f'Department {department} not found'}), 404
+        return jsonify({'department': department, 'projects': projects}), 200
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+@app.route('/department_summary', methods=['GET'])
+def department_summary():
+    """부서별 문서 보유 현황과 위험도 분포 (?department=코드 또는 부서명)"""
+    try:
+        return _page_response(report_store.summary_page(request.args.get('department')))
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+@app.route('/report.<fmt>', methods=['GET'])
+def columnar_report(fmt):
+    """통합 보고서 전체를 열 기반 형식으로 반환 (arrow: Arrow IPC 파일, parquet: zstd 압축 Parquet)
+
+    부서/상태/주관사 열은 사전 인코딩되어 있으며, 파일이 바뀌지 않았으면 ETag로 304를 반환한다.
+    """
+    try:
+        if fmt not in COLUMNAR_FORMATS:
+            return jsonify({'error': f'Unsupported format: {fmt}'}), 404
+        if not columnar_available():
+            return jsonify({'error': 'pyarrow is not installed on the server'}), 501
+        csv_path = report_store.refresh().path
+        if csv_path is None:
+            return jsonify({'error': 'Report not found'}), 404
+
+        path = ensure_columnar_report(csv_path, fmt)
+        response = send_file(path, mimetype=COLUMNAR_FORMATS[fmt][1], conditional=True, etag=True, max_age=0)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+@app.route('/files', methods=['GET'])
+def list_files():
+    """프로젝트 폴더를 한 단계씩 조회
+
+    쿼리 인자: path(드라이브 루트 기준 상대 경로), project_id(지정하면 path는 프로젝트 폴더 기준),
+    limit(기본 200), cursor(이전 응답의 next_cursor)
+    """
+    try:
+        path = request.args.get('path', '')
+        project_id = request.args.get('project_id')
+        if project_id:
+            path = project_browse_path(report_store.get(project_id), path)
+            if path is None:
+                return jsonify({'error': f'Project folder for {project_id} not found'}), 404
+        listing = services.get('file_browser').list_directory(
+            path,
+            cursor=request.args.get('cursor'),
+            limit=_limit_arg(LISTING_PAGE_SIZE)
+        )
+        return jsonify(listing), 200
+
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError:
+        return jsonify({'error': f'Directory {path} not found'}), 404
+    except Exception as e:
+        return jsonify({
+            'error': str(e),
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }), 500
+
+@app.route('/audit_events', methods=['GET'])
+def audit_events_stream():
+    """감사 진행 이벤트 스트림 (Server-Sent Events)
+
+    이벤트: audit_started, documents_found, audit_finished, audit_failed, reset
+    재연결 시 Last-Event-ID 헤더(또는 ?last_event_id=)부터 이어서 받고, ?project_id=로 한 프로젝트만 구독할 수 있다.
+    이벤트 버스는 프로세스 안에 있으므로 python app.py처럼 봇과 같은 프로세스에서 실행할 때만 감사 이벤트가 전달된다.
+    Flask 서버에서는 연결마다 스레드 하나를 사용하므로 구독자가 많으면 asgi_app.py를 사용한다.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    project_id = request.args.get('project_id')
+
+    def stream():
+        yield 'retry: 3000\n\n'
+        for item in audit_events.iter_blocking(last_event_id):
+            frame = format_sse(item, project_id)
+            if frame:
+                yield frame
+
+    return Response(stream_with_context(stream()), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus 형식 성능 지표 (디렉토리 스캔, 캐시, CSV 로드, AI 호출, Discord 전송, GitHub 동기화, 감사 단계)"""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4', headers={'Cache-Control': 'no-cache'})
+
 def run_flask():
     app.run(host='0.0.0.0', port=5000, debug=True, use_reloader=False)
 
@@ -0,0 +1,377 @@
+# asgi_app.py
+# app.py와 같은 API를 Quart(ASGI)로 제공하는 비동기 서버 모드
+# 요청마다 스레드를 쓰지 않고 하나의 이벤트 루프에서 처리하며, 감사 실행도 비동기로 요청할 수 있다.
+
+import os
+import sys
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+
+from quart import Quart, jsonify, request, make_response, send_file
+from quart_cors import cors
+
+# my-flask-app 모듈 임포트 경로 조정
+sys.path.append(os.path.join(os.path.dirname(__file__), 'my_flask_app'))
+# .env와 로그 형식은 다른 모듈을 임포트하기 전에 한 번만 설정 (config 임포트 자체는 부작용 없음)
+from config import load_environment, configure_logging
+load_environment()
+configure_logging()
+from report_store import ReportStore, REPORT_DIR, PAGE_SIZE, brotli
+from audit_events import audit_events, format_sse
+from file_browser import LISTING_PAGE_SIZE, project_browse_path
+from services import services
+from columnar_export import COLUMNAR_FORMATS, columnar_available, ensure_columnar_report
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# 동시에 실행할 감사 수 (네트워크 드라이브 부하 제한)
+AUDIT_CONCURRENCY = int(os.getenv('AUDIT_CONCURRENCY', '4'))
+# 보관할 감사 요청 수
+MAX_AUDIT_TASKS = 200
+
+app = cors(Quart(__name__))
+
+# 통합 보고서 저장소 (AUDIT_REPORT_DIR로 다른 폴더 지정 가능, 부하 테스트용)
+report_store = ReportStore(os.getenv('AUDIT_REPORT_DIR', REPORT_DIR))
+
+# 감사 서비스는 첫 감사 요청 시 생성 (봇과 함께 실행하면 같은 services 컨테이너의 인스턴스를 공유)
+_audit_semaphore = None
+audit_tasks = {}
+
+
+def get_audit_service():
+    return services.get('audit_service')
+
+
+def get_file_browser():
+    """프로젝트 폴더 탐색기 (감사 검색기의 디렉토리 캐시 공유)"""
+    return services.get('file_browser')
+
+
+async def _refresh_report_loop():
+    """보고서 변경 확인을 워커 스레드에서 주기적으로 실행 (요청 처리 중에는 파일을 다시 읽지 않음)"""
+    while True:
+        await asyncio.to_thread(report_store.refresh)
+        await asyncio.sleep(report_store.check_interval / 2)
+
+
+@app.before_serving
+async def startup():
+    global _audit_semaphore
+    _audit_semaphore = asyncio.Semaphore(AUDIT_CONCURRENCY)
+    await asyncio.to_thread(report_store.refresh, True)
+    app.add_background_task(_refresh_report_loop)
+
+
+@app.route('/')
+async def index():
+    """메인 페이지"""
+    return jsonify({
+        'status': 'ok',
+        'message': 'Project Audit API Server is running (ASGI)',
+        'endpoints': {
+            'audit_project': '/audit_project/<project_id>',
+            'run_audit': 'POST /audit_project/<project_id>',
+            'audit_task': '/audit_tasks/<task_id>',
+            'audit_events': '/audit_events',
+            'metrics': '/metrics',
+            'files': '/files?path=<path>|project_id=<project_id>',
+            'audit_department': '/audit_department/<department>',
+            'department_summary': '/department_summary',
+            'columnar_report': '/report.arrow|/report.parquet',
+            'audit_all': '/audit_all'
+        },
+        'report': report_store.info(refresh=False),
+        'server_time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'version': '1.0.0'
+    })
+
+
+async def _page_response(page):
+    """직렬화된 페이지 응답 (ETag가 같으면 304, Accept-Encoding에 따라 br/gzip)"""
+    if request.if_none_match.contains_weak(page.etag):
+        response = await make_response('', 304)
+    else:
+        encodings = ['br', 'gzip', 'identity'] if brotli is not None else ['gzip', 'identity']
+        encoding = request.accept_encodings.best_match(encodings, default='identity')
+        response = await make_response(page.encode(encoding), 200)
+        response.headers['Content-Type'] = 'application/json; charset=utf-8'
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+    response.set_etag(page.etag, weak=True)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+def _split_arg(name):
+    """쉼표로 구분된 쿼리 인자 (?status=진행,준공 또는 ?status=진행&status=준공)"""
+    return [value.strip() for raw in request.args.getlist(name) for value in raw.split(',') if value.strip()]
+
+
+def _limit_arg(default):
+    """limit 쿼리 인자 (숫자가 아니면 ValueError -> 400, 잘못된 cursor와 같은 처리)"""
+    value = request.args.get('limit')
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"limit은 정수여야 합니다: {value}")
+
+
+def _error(e, status=500):
+    return jsonify({
+        'error': str(e),
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }), status
+
+
+@app.route('/audit_project/<project_id>', methods=['GET'])
+async def audit_project(project_id):
+    """특정 프로젝트의 감사 데이터를 반환"""
+    try:
+        project = report_store.get(project_id, refresh=False)
+        if project is None:
+            return jsonify({'error': f'Project {project_id} not found'}), 404
+        return jsonify(project), 200
+    except Exception as e:
+        return _error(e)
+
+
+async def _run_audit(task, use_ai, skip_unchanged):
+    async with _audit_semaphore:
+        task['status'] = 'running'
+        task['started_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        try:
+            result = await get_audit_service().audit_project(
+                task['project_id'], use_ai=use_ai, skip_unchanged=skip_unchanged
+            )
+            task['status'] = 'done' if result else 'failed'
+            task['result'] = result or None
+            if not result:
+                task['error'] = 'audit failed'
+        except Exception as e:
+            logger.error(f"감사 요청 {task['id']} 실패: {str(e)}")
+            task['status'] = 'failed'
+            task['error'] = str(e)
+        finally:
+            task['finished_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    return task
+
+
+@app.route('/audit_project/<project_id>', methods=['POST'])
+async def run_audit(project_id):
+    """프로젝트 감사 실행 (기본은 202 + 작업 ID, ?wait=true면 완료까지 대기 후 결과 반환)
+
+    같은 프로젝트의 감사가 이미 대기/실행 중이면 그 작업을 그대로 돌려준다.
+    """
+    try:
+        use_ai = request.args.get('use_ai', 'false').lower() == 'true'
+        skip_unchanged = request.args.get('skip_unchanged', 'false').lower() == 'true'
+        wait = request.args.get('wait', 'false').lower() == 'true'
+
+        task = next((t for t in audit_tasks.values()
+                     if t['project_id'] == project_id and t['status'] in ('queued', 'running')), None)
+        if task is None:
+            task = {
+                'id': uuid.uuid4().hex[:8],
+                'project_id': project_id,
+                'status': 'queued',
+                'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'started_at': None,
+                'finished_at': None,
+                'result': None,
+                'error': None
+            }
+            audit_tasks[task['id']] = task
+            # 대기/실행 중인 작업은 남겨 두고 끝난 작업만 오래된 순서로 정리 (중복 감사 방지, 상태 조회 404 방지)
+            finished = [task_id for task_id, t in audit_tasks.items() if t['status'] in ('done', 'failed')]
+            for task_id in finished[:max(0, len(audit_tasks) - MAX_AUDIT_TASKS)]:
+                del audit_tasks[task_id]
+            task['_future'] = asyncio.ensure_future(_run_audit(task, use_ai, skip_unchanged))
+
+        if wait:
+            await asyncio.shield(task['_future'])
+            return jsonify(_public_task(task)), 200 if task['status'] == 'done' else 500
+        return jsonify(_public_task(task)), 202, {'Location': f"/audit_tasks/{task['id']}"}
+    except Exception as e:
+        return _error(e)
+
+
+def _public_task(task):
+    return {key: value for key, value in task.items() if not key.startswith('_')}
+
+
+@app.route('/audit_tasks/<task_id>', methods=['GET'])
+async def audit_task(task_id):
+    """감사 요청 상태 조회"""
+    task = audit_tasks.get(task_id)
+    if task is None:
+        return jsonify({'error': f'Task {task_id} not found'}), 404
+    return jsonify(_public_task(task)), 200
+
+
+@app.route('/audit_all', methods=['GET'])
+async def audit_all():
+    """모든 프로젝트의 감사 데이터를 페이지 단위로 반환 (app.py와 같은 쿼리 인자)"""
+    try:
+        try:
+            page = report_store.query_page(
+                department=_split_arg('department'),
+                status=_split_arg('status'),
+                contractor=_split_arg('contractor'),
+                missing=_split_arg('missing'),
+                fields=_split_arg('fields'),
+                cursor=request.args.get('cursor'),
+                limit=_limit_arg(PAGE_SIZE),
+                refresh=False
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        return await _page_response(page)
+    except Exception as e:
+        return _error(e)
+
+
+@app.route('/audit_department/<department>', methods=['GET'])
+async def audit_department(department):
+    """특정 부서(코드 또는 부서명)의 감사 데이터를 반환"""
+    try:
+        projects = report_store.by_department(department, refresh=False)
+        if not projects:
+            return jsonify({'error': f'Department {department} not found'}), 404
+        return jsonify({'department': department, 'projects': projects}), 200
+    except Exception as e:
+        return _error(e)
+
+
+@app.route('/department_summary', methods=['GET'])
+async def department_summary():
+    """부서별 문서 보유 현황과 위험도 분포 (?department=코드 또는 부서명)"""
+    try:
+        return await _page_response(report_store.summary_page(request.args.get('department'), refresh=False))
+    except Exception as e:
+        return _error(e)
+
+
+@app.route('/report.<fmt>', methods=['GET'])
+async def columnar_report(fmt):
+    """통합 보고서 전체를 열 기반 형식으로 반환 (arrow: Arrow IPC 파일, parquet: zstd 압축 Parquet)"""
+    try:
+        if fmt not in COLUMNAR_FORMATS:
+            return jsonify({'error': f'Unsupported format: {fmt}'}), 404
+        if not columnar_available():
+            return jsonify({'error': 'pyarrow is not installed on the server'}), 501
+        csv_path = report_store.snapshot(refresh=False).path
+        if csv_path is None:
+            return jsonify({'error': 'Report not found'}), 404
+
+        # 보고서가 바뀐 뒤 첫 요청에서만 변환 (워커 스레드에서 실행)
+        path = await asyncio.to_thread(ensure_columnar_report, csv_path, fmt)
+        response = await send_file(path, mimetype=COLUMNAR_FORMATS[fmt][1], conditional=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
+    except Exception as e:
+        return _error(e)
+
+
+@app.route('/files', methods=['GET'])
+async def list_files():
+    """프로젝트 폴더를 한 단계씩 조회
+
+    쿼리 인자: path(드라이브 루트 기준 상대 경로), project_id(지정하면 path는 프로젝트 폴더 기준),
+    limit(기본 200), cursor(이전 응답의 next_cursor)
+    """
+    path = request.args.get('path', '')
+    try:
+        project_id = request.args.get('project_id')
+        if project_id:
+            path = project_browse_path(report_store.get(project_id, refresh=False), path)
+            if path is None:
+                return jsonify({'error': f'Project folder for {project_id} not found'}), 404
+        # 네트워크 드라이브 접근은 이벤트 루프 밖에서
+        listing = await asyncio.to_thread(
+            get_file_browser().list_directory,
+            path,
+            request.args.get('cursor'),
+            _limit_arg(LISTING_PAGE_SIZE)
+        )
+        return jsonify(listing), 200
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except FileNotFoundError:
+        return jsonify({'error': f'Directory {path} not found'}), 404
+    except Exception as e:
+        return _error(e)
+
+
+@app.route('/audit_events', methods=['GET'])
+async def audit_events_stream():
+    """감사 진행 이벤트 스트림 (Server-Sent Events)
+
+    이벤트: audit_started, documents_found, audit_finished, audit_failed, reset
+    재연결 시 Last-Event-ID 헤더(또는 ?last_event_id=)부터 이어서 받고, ?project_id=로 한 프로젝트만 구독할 수 있다.
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    project_id = request.args.get('project_id')
+
+    async def stream():
+        yield 'retry: 3000\n\n'.encode('utf-8')
+        # 클라이언트가 느리면 전송이 끝날 때까지 다음 이벤트를 읽지 않음 (이벤트는 공유 버퍼에 남아 있음)
+        async for item in audit_events.subscribe(last_event_id):
+            frame = format_sse(item, project_id)
+            if frame:
+                yield frame.encode('utf-8')
+
+    response = await make_response(stream(), 200, {
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.timeout = None
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+async def metrics_endpoint():
+    """Prometheus 형식 성능 지표 (with_bot으로 실행하면 봇의 감사 지표도 포함)"""
+    return await make_response(metrics.render(), 200, {
+        'Content-Type': 'text/plain; version=0.0.4; charset=utf-8',
+        'Cache-Control': 'no-cache'
+    })
+
+
+async def serve(host: str = '0.0.0.0', port: int = 5000, with_bot: bool = False) -> None:
+    """Hypercorn으로 ASGI 앱 실행 (with_bot=True면 Discord 봇과 같은 이벤트 루프에서 실행)"""
+    from hypercorn.asyncio import serve as hypercorn_serve
+    from hypercorn.config import Config
+
+    config = Config()
+    config.bind = [f"{host}:{port}"]
+    config.accesslog = None
+    tasks = [hypercorn_serve(app, config)]
+    if with_bot:
+        import bot
+        tasks.append(bot.run_bot())
+    logger.info(f"ASGI 서버 시작: http://{host}:{port} (봇 {'포함' if with_bot else '미포함'})")
+    await asyncio.gather(*tasks)
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="감사 API ASGI 서버")
+    parser.add_argument('--host', type=str, default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.getenv('PORT', 5000)))
+    parser.add_argument('--with-bot', action='store_true', help="Discord 봇을 같은 이벤트 루프에서 함께 실행")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.with_bot))
+
+# python asgi_app.py --with-bot   # API + 봇 (app.py의 Flask 스레드 대신)
+# python asgi_app.py --port 8000  # API만
+# hypercorn asgi_app:app --bind 0.0.0.0:5000
@@ -0,0 +1,107 @@
+# benchmarks/import_time.py
+# 모듈 임포트(시작) 시간 측정: python -X importtime 출력을 모듈별로 요약
+
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 이름: (작업 디렉토리, 임포트할 모듈) - 각 진입점과 같은 sys.path 구성
+TARGETS = {
+    'config': ('my_flask_app', 'config'),
+    'get_project': ('my_flask_app', 'get_project'),
+    'audit_service': ('my_flask_app', 'audit_service'),
+    'generate_summary': ('my_flask_app', 'generate_summary'),
+    'app': ('.', 'app'),
+    'asgi_app': ('.', 'asgi_app'),
+    'bot': ('.', 'bot')
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """'import time: self [us] | cumulative | imported package' 줄을 dict 목록으로 변환"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append({'module': name.strip(), 'self_ms': int(self_us) / 1000,
+                     'cumulative_ms': int(cumulative_us) / 1000, 'depth': depth})
+    return rows
+
+
+def measure(name: str, repeat: int = 3) -> Dict[str, Any]:
+    """새 인터프리터에서 모듈을 임포트하여 가장 빠른 실행 기준으로 요약"""
+    workdir, module = TARGETS[name]
+    cwd = os.path.join(ROOT, workdir)
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+            cwd=cwd, capture_output=True, text=True, encoding='utf-8', errors='replace'
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        if result.returncode != 0:
+            error = [line for line in result.stderr.splitlines() if not line.startswith('import time:')]
+            return {'target': name, 'error': '\n'.join(error[-5:])}
+        if best is None or wall_ms < best[0]:
+            best = (wall_ms, result.stderr)
+
+    wall_ms, stderr = best
+    rows = parse_importtime(stderr)
+    target_row = next((row for row in reversed(rows) if row['module'] == module and row['depth'] == 0), None)
+    # 대상 모듈이 직접 임포트한 패키지 중 오래 걸린 것 (cumulative 기준)
+    direct = sorted((row for row in rows if row['depth'] == 1), key=lambda r: r['cumulative_ms'], reverse=True)
+    by_self = sorted(rows, key=lambda r: r['self_ms'], reverse=True)
+    return {
+        'target': name,
+        'wall_ms': round(wall_ms, 1),
+        'import_ms': round(target_row['cumulative_ms'], 1) if target_row else None,
+        'modules': len(rows),
+        'top_direct': [{'module': r['module'], 'cumulative_ms': round(r['cumulative_ms'], 1)} for r in direct[:10]],
+        'top_self': [{'module': r['module'], 'self_ms': round(r['self_ms'], 1)} for r in by_self[:10]]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="모듈 임포트 시간 측정 (-X importtime 요약)")
+    parser.add_argument('targets', nargs='*', default=list(TARGETS), help=f"측정 대상 ({', '.join(TARGETS)})")
+    parser.add_argument('--repeat', type=int, default=3, help="대상별 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument('--top', type=int, default=5, help="출력할 상위 모듈 수")
+    parser.add_argument('--json', type=str, default=None, help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    results = []
+    for name in args.targets:
+        if name not in TARGETS:
+            parser.error(f"알 수 없는 대상: {name}")
+        summary = measure(name, args.repeat)
+        results.append(summary)
+        if 'error' in summary:
+            print(f"{name}: 임포트 실패\n{summary['error']}\n")
+            continue
+        print(f"{name}: 임포트 {summary['import_ms']:.0f}ms, 프로세스 전체 {summary['wall_ms']:.0f}ms, 모듈 {summary['modules']}개")
+        for row in summary['top_direct'][:args.top]:
+            print(f"    {row['cumulative_ms']:8.1f}ms  {row['module']}")
+        print()
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': sys.version.split()[0],
+                       'results': results}, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == '__main__':
+    main()
+
+# python benchmarks/import_time.py
+# python benchmarks/import_time.py get_project app --json benchmarks/results/import_time.json
@@ -0,0 +1,155 @@
+# benchmarks/load_test.py
+# 감사 API 부하 테스트: 합성 통합 보고서(fixture)로 ASGI 서버를 띄우고 동시 요청을 보내 지연시간/처리량 측정
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+
+import aiohttp
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'my_flask_app'))
+from config_assets import DOCUMENT_TYPES, DEPARTMENT_NAMES
+
+STATUSES = ['진행', '준공', '중지']
+
+
+def write_fixture_report(report_dir: str, projects: int, seed: int = 0) -> str:
+    """generate_summary와 같은 열 구성의 합성 combined_report.csv 생성"""
+    rng = random.Random(seed)
+    departments = list(DEPARTMENT_NAMES.items())
+    rows = []
+    for i in range(projects):
+        dept_name, dept_code = departments[i % len(departments)]
+        project_id = f"C{20000000 + i}"
+        row = {
+            'ProjectID': project_id,
+            'ProjectName': f"합성 프로젝트 {i}",
+            'Depart': dept_name,
+            'Status': rng.choice(STATUSES),
+            'Contractor': rng.choice(['주관사', '비주관사']),
+            'ProjectID_numeric': project_id[1:],
+            'Depart_ProjectID': f"{dept_code}_{project_id}",
+            'search_folder': f"{dept_code}_{dept_name}\\{project_id}_합성 프로젝트 {i}"
+        }
+        for doc_type in DOCUMENT_TYPES:
+            exists = rng.random() < 0.6
+            row[f'{doc_type}_exists'] = int(exists)
+            row[f'{doc_type}_count'] = rng.randint(1, 20) if exists else 0
+        rows.append(row)
+    path = os.path.join(report_dir, 'combined_report.csv')
+    pd.DataFrame(rows).to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def request_mix(projects: int):
+    """요청 경로 생성기 (단건 조회 60%, 페이지 조회 30%, 부서 요약 10%)"""
+    departments = list(DEPARTMENT_NAMES.values())
+    while True:
+        roll = random.random()
+        if roll < 0.6:
+            yield f"/audit_project/{20000000 + random.randrange(projects)}"
+        elif roll < 0.9:
+            yield f"/audit_all?limit=100&department={random.choice(departments)}&fields=project_id,status,documents"
+        else:
+            yield "/department_summary"
+
+
+async def wait_until_ready(url: str, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            try:
+                async with session.get(url) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise TimeoutError(f"서버가 {timeout}초 안에 준비되지 않았습니다: {url}")
+
+
+async def run_load(base_url: str, projects: int, concurrency: int, total_requests: int):
+    latencies = []
+    errors = 0
+    paths = request_mix(projects)
+    remaining = total_requests
+
+    async def client(session):
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            path = next(paths)
+            start = time.perf_counter()
+            try:
+                async with session.get(base_url + path, headers={'Accept-Encoding': 'gzip'}) as response:
+                    await response.read()
+                    if response.status >= 500:
+                        errors += 1
+            except aiohttp.ClientError:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, errors, elapsed
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))] if ordered else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감사 API 부하 테스트")
+    parser.add_argument('--url', type=str, help="이미 실행 중인 서버 주소 (지정하지 않으면 fixture로 ASGI 서버 실행)")
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--projects', type=int, default=5000, help="합성 프로젝트 수")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    server = None
+    fixture_dir = None
+    base_url = args.url
+    if not base_url:
+        fixture_dir = tempfile.TemporaryDirectory()
+        write_fixture_report(fixture_dir.name, args.projects)
+        env = dict(os.environ, AUDIT_REPORT_DIR=fixture_dir.name)
+        server = subprocess.Popen(
+            [sys.executable, os.path.join(ROOT, 'asgi_app.py'), '--host', '127.0.0.1', '--port', str(args.port)],
+            env=env, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        base_url = f"http://127.0.0.1:{args.port}"
+
+    try:
+        asyncio.run(wait_until_ready(base_url + '/'))
+        latencies, errors, elapsed = asyncio.run(
+            run_load(base_url, args.projects, args.concurrency, args.requests)
+        )
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        if fixture_dir:
+            fixture_dir.cleanup()
+
+    print(f"요청 {len(latencies)}개, 오류 {errors}개, {elapsed:.2f}초 ({len(latencies) / elapsed:.1f} req/s)")
+    print(f"지연시간 p50 {percentile(latencies, 0.50) * 1000:.1f}ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f}ms, p99 {percentile(latencies, 0.99) * 1000:.1f}ms")
+
+
+if __name__ == '__main__':
+    main()
+
+# python benchmarks/load_test.py                       # fixture + ASGI 서버
+# python benchmarks/load_test.py --url http://127.0.0.1:5000 --requests 2000  # 실행 중인 서버 (Flask 비교용)
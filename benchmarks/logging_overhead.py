@@ -0,0 +1,125 @@
+# benchmarks/logging_overhead.py
+# 문서 검색(search_all_documents)의 로깅 비용 측정: 합성 공유 폴더(약 1만 개 파일)에서 로그 레벨/큐 설정별 소요 시간 비교
+
+import io
+import os
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import contextlib
+from typing import Dict, Any, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'my_flask_app'))
+from synthetic_share import build_synthetic_share, write_metadata
+from pipeline import SHARE_ROOT, use_workspace
+from filesystem import MemoryFileSystem
+from config import start_log_queue, stop_log_queue
+
+# (이름, 루트 로그 레벨, 큐 사용 여부)
+SCENARIOS = [
+    ('INFO', logging.INFO, False),
+    ('INFO + queue', logging.INFO, True),
+    ('WARNING', logging.WARNING, False),
+    ('DEBUG + queue', logging.DEBUG, True),
+]
+
+
+def file_names(fs: MemoryFileSystem, root: str) -> List[str]:
+    names = []
+    stack = [root]
+    while stack:
+        for entry in fs.scandir(stack.pop()):
+            if entry.is_dir():
+                stack.append(entry.path)
+            else:
+                names.append(entry.name)
+    return names
+
+
+def configure_root(level: int, log_path: str, use_queue: bool) -> None:
+    """루트 로거를 파일 핸들러 하나로 설정 (실제 서비스처럼 로그를 디스크에 기록)"""
+    stop_log_queue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    handler = logging.FileHandler(log_path, mode='w', encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+    root.addHandler(handler)
+    root.setLevel(level)
+    if use_queue:
+        start_log_queue()
+
+
+async def search_all(fs, project_rows: List[Dict[str, Any]]) -> float:
+    from search_project_data import ProjectDocumentSearcher
+    # 디렉토리/파일 캐시 없이 측정하도록 실행마다 새 검색기 사용
+    searcher = ProjectDocumentSearcher(fs=fs)
+    start = time.perf_counter()
+    for row in project_rows:
+        await searcher.search_all_documents(row['project_id'], row['department_code'])
+    elapsed = time.perf_counter() - start
+    searcher.executor.shutdown(wait=False)
+    return elapsed
+
+
+def match_all(fs, names: List[str]) -> float:
+    """파일마다 호출되는 _match_document_type만 측정 (전체 검색보다 잡음이 적어 로깅 비용 차이가 잘 보임)"""
+    from search_project_data import ProjectDocumentSearcher
+    searcher = ProjectDocumentSearcher(fs=fs)
+    start = time.perf_counter()
+    for name in names:
+        searcher._match_document_type(name.lower())
+    elapsed = time.perf_counter() - start
+    searcher.executor.shutdown(wait=False)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 검색 로깅 비용 벤치마크")
+    parser.add_argument('--departments', type=int, default=3)
+    parser.add_argument('--projects', type=int, default=48, help="부서별 프로젝트 수 (기본값으로 약 1만 개 파일)")
+    parser.add_argument('--files', type=int, default=10, help="폴더별 파일 수")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    import pandas as pd
+    import get_data
+
+    fs = MemoryFileSystem()
+    projects = build_synthetic_share(fs, SHARE_ROOT, args.departments, args.projects, 3, args.files, seed=args.seed)
+    names = file_names(fs, SHARE_ROOT)
+    files = len(names)
+
+    with tempfile.TemporaryDirectory(prefix='audit_logbench_') as workspace:
+        paths = use_workspace(workspace)
+        write_metadata(paths['data'], projects, SHARE_ROOT)
+        departments = sorted({p['department_code'] for p in projects})
+        with contextlib.redirect_stdout(io.StringIO()):
+            get_data.create_project_list(SHARE_ROOT, departments, fs=fs)
+        project_rows = pd.read_csv(get_data.PROJECT_LIST_CSV, dtype={'project_id': str, 'department_code': str}).to_dict('records')
+
+        log_path = os.path.join(workspace, 'bench.log')
+        print(f"합성 공유 폴더: 프로젝트 {len(project_rows)}개, 파일 {files}개, 반복 {args.repeat}회\n")
+        print(f"{'설정':<16} {'최소(s)':>9} {'평균(s)':>9} {'파일당(us)':>11} {'매칭(us)':>9} {'로그(KB)':>9}")
+        for name, level, use_queue in SCENARIOS:
+            configure_root(level, log_path, use_queue)
+            timings = [asyncio.run(search_all(fs, project_rows)) for _ in range(args.repeat)]
+            log_size = os.path.getsize(log_path) / 1024 / args.repeat
+            match_time = min(match_all(fs, names) for _ in range(args.repeat * 3))
+            stop_log_queue()
+            print(f"{name:<16} {min(timings):9.3f} {sum(timings) / len(timings):9.3f} "
+                  f"{min(timings) / files * 1e6:11.1f} {match_time / files * 1e6:9.2f} {log_size:9.0f}")
+        logging.getLogger().handlers[0].close()
+
+
+if __name__ == '__main__':
+    main()
+
+# python benchmarks/logging_overhead.py
+# python benchmarks/logging_overhead.py --projects 100 --repeat 5
@@ -0,0 +1,286 @@
+# benchmarks/pipeline.py
+# 감사 파이프라인 전체 벤치마크: 합성 공유 폴더(메모리 + 호출당 지연)로 단계별 처리량과 p50/p95 지연 측정
+#
+# 단계: create_project_list -> search_all_documents -> audit_multiple_projects -> generate_combined_report -> Flask API
+# 결과는 커밋별 JSON으로 저장하고 --compare로 이전 결과와 비교한다.
+
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+import contextlib
+from typing import Dict, Any, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'my_flask_app'))
+from load_test import percentile
+from synthetic_share import build_synthetic_share, write_metadata
+from filesystem import MemoryFileSystem, LatencyFileSystem
+from services import services
+
+SHARE_ROOT = 'T:'
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if commit and dirty else commit or None
+    except OSError:
+        return None
+
+
+def use_workspace(workspace: str) -> Dict[str, str]:
+    """파이프라인 모듈이 읽고 쓰는 static/data, results 경로를 벤치마크 작업 폴더로 변경 (실제 데이터 보호)"""
+    import get_data
+    import search_project_data
+    import audit_service
+    import generate_summary
+
+    paths = {
+        'data': os.path.join(workspace, 'data'),
+        'results': os.path.join(workspace, 'results'),
+        'report': os.path.join(workspace, 'report')
+    }
+    for path in paths.values():
+        os.makedirs(path, exist_ok=True)
+    project_list_csv = os.path.join(paths['data'], 'project_list.csv')
+
+    get_data.STATIC_DATA_PATH = paths['data']
+    get_data.PROJECT_LIST_CSV = project_list_csv
+    get_data.DEPART_LIST_PATH = os.path.join(paths['data'], 'depart_list.csv')
+    search_project_data.PROJECT_LIST_CSV = project_list_csv
+    audit_service.STATIC_DATA_PATH = paths['data']
+    audit_service.CONTRACT_STATUS_CSV = os.path.join(paths['data'], 'contract_status.csv')
+    audit_service.RESULTS_DIR = paths['results']
+    generate_summary.STATIC_DATA_PATH = paths['data']
+    return paths
+
+
+def summarize(latencies: List[float], items: int, elapsed: float, fs: LatencyFileSystem) -> Dict[str, Any]:
+    stats = fs.stats()
+    fs.reset_stats()
+    return {
+        'runs': len(latencies),
+        'items': items,
+        'total_seconds': round(elapsed, 3),
+        'throughput_per_second': round(items / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'max_ms': round(max(latencies) * 1000, 2) if latencies else 0,
+        'fs_calls': stats['calls'],
+        'fs_simulated_seconds': stats['simulated_seconds']
+    }
+
+
+def bench_project_list(fs, departments: List[str], repeat: int) -> Dict[str, Any]:
+    import pandas as pd
+    import get_data
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        # create_project_list는 진행 상황을 print로 출력하므로 측정 중에는 숨김
+        with contextlib.redirect_stdout(io.StringIO()):
+            get_data.create_project_list(SHARE_ROOT, departments, fs=fs)
+        latencies.append(time.perf_counter() - start)
+    projects = len(pd.read_csv(get_data.PROJECT_LIST_CSV))
+    return summarize(latencies, projects * repeat, sum(latencies), fs)
+
+
+async def bench_search_documents(fs, project_rows: List[Dict[str, Any]], repeat: int) -> Dict[str, Any]:
+    from search_project_data import ProjectDocumentSearcher
+    latencies = []
+    for _ in range(repeat):
+        # 실행마다 새 검색기 (디렉토리 캐시 없이 측정)
+        searcher = ProjectDocumentSearcher(fs=fs)
+        for row in project_rows:
+            start = time.perf_counter()
+            await searcher.search_all_documents(row['project_id'], row['department_code'])
+            latencies.append(time.perf_counter() - start)
+        searcher.executor.shutdown(wait=False)
+    return summarize(latencies, len(latencies), sum(latencies), fs)
+
+
+async def bench_audit(fs, project_ids: List[str], results_dir: str, repeat: int) -> Dict[str, Any]:
+    from audit_service import AuditService
+    latencies = []
+    elapsed = 0.0
+    for _ in range(repeat):
+        shutil.rmtree(results_dir, ignore_errors=True)
+        service = AuditService(fs=fs)
+        start = time.perf_counter()
+        results = await service.audit_multiple_projects(project_ids)
+        elapsed += time.perf_counter() - start
+        latencies.extend(result['performance']['total_time'] for result in results if result)
+    return summarize(latencies, len(latencies), elapsed, fs)
+
+
+async def bench_combined_report(fs, results_dir: str, report_dir: str, repeat: int) -> Dict[str, Any]:
+    from generate_summary import generate_combined_report
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        path = await generate_combined_report(results_dir, os.path.join(report_dir, 'combined_report'))
+        latencies.append(time.perf_counter() - start)
+        if not path:
+            raise RuntimeError("통합 보고서를 생성하지 못했습니다.")
+    return summarize(latencies, repeat, sum(latencies), fs)
+
+
+def bench_flask(fs, report_dir: str, projects: List[Dict[str, Any]], requests: int) -> Dict[str, Dict[str, Any]]:
+    """Flask 테스트 클라이언트로 주요 API 호출 (네트워크 없이 앱 처리 시간만 측정)"""
+    os.environ['AUDIT_REPORT_DIR'] = report_dir
+    from app import app
+    client = app.test_client()
+    endpoints = {
+        '/': lambda i: '/',
+        '/audit_project/<id>': lambda i: f"/audit_project/{projects[i % len(projects)]['numeric_id']}",
+        '/audit_all?limit=100': lambda i: '/audit_all?limit=100',
+        '/audit_department/<dept>': lambda i: f"/audit_department/{projects[i % len(projects)]['department_code']}",
+        '/department_summary': lambda i: '/department_summary',
+        '/report.arrow': lambda i: '/report.arrow'
+    }
+    stages = {}
+    for name, make_path in endpoints.items():
+        latencies = []
+        statuses = set()
+        for i in range(requests):
+            start = time.perf_counter()
+            response = client.get(make_path(i), headers={'Accept-Encoding': 'gzip'})
+            response.get_data()
+            latencies.append(time.perf_counter() - start)
+            statuses.add(response.status_code)
+        stages[f"flask GET {name}"] = {**summarize(latencies, requests, sum(latencies), fs), 'status_codes': sorted(statuses)}
+    return stages
+
+
+def run(args) -> Dict[str, Any]:
+    memory = MemoryFileSystem()
+    projects = build_synthetic_share(memory, SHARE_ROOT, args.departments, args.projects, args.depth, args.files, seed=args.seed)
+    fs = LatencyFileSystem(memory, latency=args.latency_ms / 1000, jitter=args.jitter, seed=args.seed)
+    # 기본 파일 시스템도 합성 공유 폴더로 교체 (fs 인자를 받지 않는 경로까지 같은 조건)
+    services.set('filesystem', fs)
+
+    workspace = tempfile.mkdtemp(prefix='audit_bench_')
+    try:
+        paths = use_workspace(workspace)
+        write_metadata(paths['data'], projects, SHARE_ROOT)
+        departments = sorted({p['department_code'] for p in projects})
+        audit_ids = [p['project_id'] for p in projects[:args.audit_projects or None]]
+
+        stages = {}
+        print("create_project_list ...")
+        stages['create_project_list'] = bench_project_list(fs, departments, args.repeat)
+
+        import pandas as pd
+        import get_data
+        rows = pd.read_csv(get_data.PROJECT_LIST_CSV, dtype={'project_id': str, 'department_code': str}).to_dict('records')
+        print(f"search_all_documents ({len(rows)}개 프로젝트) ...")
+        stages['search_all_documents'] = asyncio.run(bench_search_documents(fs, rows, args.repeat))
+
+        print(f"audit_multiple_projects ({len(audit_ids)}개 프로젝트) ...")
+        stages['audit_multiple_projects'] = asyncio.run(bench_audit(fs, audit_ids, paths['results'], args.repeat))
+
+        print("generate_combined_report ...")
+        stages['generate_combined_report'] = asyncio.run(bench_combined_report(fs, paths['results'], paths['report'], args.repeat))
+
+        if args.requests:
+            print("Flask API ...")
+            stages.update(bench_flask(fs, paths['report'], projects, args.requests))
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+    return {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'params': {key: getattr(args, key) for key in
+                   ('departments', 'projects', 'depth', 'files', 'latency_ms', 'jitter', 'repeat', 'audit_projects', 'requests', 'seed')},
+        'share': {'projects': len(projects)},
+        'stages': stages
+    }
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    print(f"\n{'단계':<36}{'처리량/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'FS 호출':>10}")
+    for name, stage in results['stages'].items():
+        fs_calls = sum(stage['fs_calls'].values())
+        print(f"{name:<36}{stage['throughput_per_second'] or 0:>10.1f}{stage['p50_ms']:>10.1f}{stage['p95_ms']:>10.1f}{fs_calls:>10}")
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> int:
+    """이전 결과 대비 p50/p95/처리량 변화 출력, threshold(비율)보다 나빠진 항목 수 반환"""
+    if baseline.get('params') != results.get('params'):
+        print("⚠️ 측정 조건(params)이 달라 비교 결과가 정확하지 않을 수 있습니다.")
+    print(f"\n비교 기준: {baseline.get('commit')} ({baseline.get('timestamp')})")
+    regressions = 0
+    for name, stage in results['stages'].items():
+        old = baseline.get('stages', {}).get(name)
+        if not old:
+            continue
+        changes = []
+        for key, higher_is_better in (('p50_ms', False), ('p95_ms', False), ('throughput_per_second', True)):
+            if not old.get(key) or stage.get(key) is None:
+                continue
+            ratio = stage[key] / old[key] - 1
+            worse = -ratio if higher_is_better else ratio
+            mark = ' ❌' if worse > threshold else ''
+            regressions += bool(mark)
+            changes.append(f"{key} {ratio:+.0%}{mark}")
+        print(f"  {name:<36}{', '.join(changes)}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="감사 파이프라인 벤치마크 (합성 공유 폴더)")
+    parser.add_argument('--departments', type=int, default=3)
+    parser.add_argument('--projects', type=int, default=20, help="부서별 프로젝트 수")
+    parser.add_argument('--depth', type=int, default=3, help="프로젝트 안의 하위 폴더 깊이")
+    parser.add_argument('--files', type=int, default=8, help="폴더별 파일 수")
+    parser.add_argument('--latency-ms', type=float, default=1.0, help="파일 시스템 호출당 지연 (SMB 왕복 시간 흉내)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연 시간 무작위 비율 (0.2 = ±20%%)")
+    parser.add_argument('--repeat', type=int, default=3, help="단계별 반복 횟수")
+    parser.add_argument('--audit-projects', type=int, default=0, help="감사할 프로젝트 수 (0 = 전체)")
+    parser.add_argument('--requests', type=int, default=200, help="API 엔드포인트별 요청 수 (0 = API 측정 안 함)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', type=str, default=None, help="결과 JSON 경로 (기본: benchmarks/results/pipeline_<커밋>.json)")
+    parser.add_argument('--compare', type=str, default=None, help="비교할 이전 결과 JSON")
+    parser.add_argument('--threshold', type=float, default=0.10, help="회귀로 볼 변화 비율")
+    parser.add_argument('--verbose', action='store_true', help="파이프라인 로그 출력")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.disable(logging.WARNING)
+
+    results = run(args)
+    print_results(results)
+
+    output = args.json or os.path.join(RESULTS_DIR, f"pipeline_{results['commit'] or 'local'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n{regressions}개 항목이 {args.threshold:.0%} 이상 나빠졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
+
+# python benchmarks/pipeline.py
+# python benchmarks/pipeline.py --projects 100 --latency-ms 5 --repeat 1 --audit-projects 50
+# python benchmarks/pipeline.py --compare benchmarks/results/pipeline_1b6318f.json
@@ -0,0 +1,188 @@
+# benchmarks/synthetic_share.py
+# 벤치마크용 합성 부서 공유 폴더: DOCUMENT_TYPES 키워드로 만든 한글 파일명, 부서/프로젝트 CSV 포함
+
+import os
+import sys
+import random
+import argparse
+from typing import Dict, Any, List
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(ROOT, 'my_flask_app'))
+from config_assets import DOCUMENT_TYPES, DEPARTMENT_MAPPING
+from filesystem import MemoryFileSystem, dump_tree
+
+STATUSES = ['진행', '준공']
+# 프로젝트 폴더명 (get_data의 깊이 탐색 키워드와 겹치지 않는 이름)
+PROJECT_TITLES = ['국도 확장 설계', '교량 정밀점검', '도시철도 기본설계', '하천 정비 실시설계',
+                  '상수도 관망 개선', '택지 교통영향평가', '공항 활주로 포장', '항만 배후단지 설계']
+# 프로젝트 안의 하위 폴더 (깊이만큼 중첩)
+SUB_FOLDERS = ['01_계약', '02_착수', '03_성과품', '04_준공', '05_회의록', '06_사진']
+NOISE_FILES = ['회의록', '사진대장', '업무연락', '검토의견', '공문']
+NOISE_EXTENSIONS = ['.jpg', '.txt', '.msg', '.png']
+
+
+def department_list(count: int) -> List[Dict[str, str]]:
+    """DEPARTMENT_MAPPING의 앞에서부터 count개 부서 (코드 중복 제외)"""
+    departments = []
+    seen = set()
+    for pm_name, code in DEPARTMENT_MAPPING.items():
+        if code in seen or code == '99999':
+            continue
+        seen.add(code)
+        short_name = pm_name[:-1] if pm_name.endswith('부') else pm_name
+        departments.append({'code': code, 'name': short_name, 'pm_name': pm_name})
+        if len(departments) == count:
+            break
+    return departments
+
+
+def document_file_name(rng: random.Random, doc_type: str, index: int) -> str:
+    info = DOCUMENT_TYPES[doc_type]
+    keyword = rng.choice([k for k in info['keywords'] if not k.isascii()] or info['keywords'])
+    extension = rng.choice(info.get('type', ['pdf']))
+    return f"{index:02d}_{keyword}_{rng.randint(1, 9)}차.{extension}"
+
+
+def noise_file_name(rng: random.Random, index: int) -> str:
+    return f"{index:02d}_{rng.choice(NOISE_FILES)}{rng.choice(NOISE_EXTENSIONS)}"
+
+
+def build_synthetic_share(fs: MemoryFileSystem, root: str = 'T:', departments: int = 3, projects: int = 20,
+                          depth: int = 3, files_per_folder: int = 8, doc_ratio: float = 0.5,
+                          seed: int = 0) -> List[Dict[str, Any]]:
+    """합성 공유 폴더를 fs에 만들고 프로젝트 목록 반환
+
+    - 부서 폴더 구조: {root}/{부서코드}_{부서명}/{진행|준공}/{프로젝트ID} {제목}/하위폴더(depth 단계)/파일
+      (get_data.create_project_list, ProjectDocumentSearcher.search_all_documents가 탐색)
+    - 감사 폴더 구조: {root}/{부서코드}_{프로젝트ID}/{문서종류}/파일 (AuditService.search_projects_by_id가 탐색)
+    폴더마다 files_per_folder개 파일을 두며 그중 doc_ratio 비율은 문서 키워드가 들어간 파일명이다.
+    """
+    if projects > 1000 or departments > 99:
+        raise ValueError("부서는 최대 99개, 부서당 프로젝트는 최대 1000개까지 만들 수 있습니다.")
+    rng = random.Random(seed)
+    doc_types = list(DOCUMENT_TYPES)
+    result = []
+    for dept_index, dept in enumerate(department_list(departments)):
+        dept_path = f"{root}/{dept['code']}_{dept['name']}"
+        fs.add_dir(dept_path)
+        for i in range(projects):
+            # 8자리 프로젝트 ID: 연도(2015~2024) + 부서 순번 + 일련번호 (부서당 최대 1000개)
+            numeric_id = f"{2015 + i % 10}{dept_index:02d}{i // 10:02d}"
+            title = f"{rng.choice(PROJECT_TITLES)} {i}"
+            status = rng.choice(STATUSES)
+            project_path = f"{dept_path}/{status}/{numeric_id} {title}"
+
+            # 부서 폴더 구조: 단계마다 하위 폴더 2개(하나는 다음 단계로 중첩), 각 폴더에 문서/기타 파일
+            folders = [project_path]
+            parent = project_path
+            for _ in range(depth):
+                nested, sibling = rng.sample(SUB_FOLDERS, 2)
+                folders.append(f"{parent}/{sibling}")
+                parent = f"{parent}/{nested}"
+                folders.append(parent)
+            for folder in folders:
+                fs.add_dir(folder)
+                for n in range(files_per_folder):
+                    if rng.random() < doc_ratio:
+                        name = document_file_name(rng, rng.choice(doc_types), n)
+                    else:
+                        name = noise_file_name(rng, n)
+                    fs.add_file(f"{folder}/{name}", size=rng.randint(10_000, 5_000_000))
+
+            # 감사 폴더 구조: 문서 종류별 폴더 (일부 종류는 없음)
+            audit_path = f"{root}/{dept['code']}_{numeric_id}"
+            fs.add_dir(audit_path)
+            for doc_type in doc_types:
+                if rng.random() < 0.7:
+                    for n in range(rng.randint(1, max(1, files_per_folder // 2))):
+                        fs.add_file(f"{audit_path}/{doc_type}/{document_file_name(rng, doc_type, n)}",
+                                    size=rng.randint(10_000, 5_000_000))
+
+            result.append({
+                'project_id': f"A{numeric_id}",
+                'numeric_id': numeric_id,
+                'project_name': title,
+                'department_code': dept['code'],
+                'department_name': dept['name'],
+                'pm_department': dept['pm_name'],
+                'status': status,
+                'contractor': rng.choice(['주관사', '비주관사']),
+                'folder': project_path
+            })
+    return result
+
+
+def write_metadata(data_dir: str, projects: List[Dict[str, Any]], root: str = 'T:') -> None:
+    """파이프라인이 읽는 CSV (depart_list, contract_status, audit_targets_new) 생성"""
+    os.makedirs(data_dir, exist_ok=True)
+    departments = {p['department_code']: p['department_name'] for p in projects}
+    pd.DataFrame([{'department_code': code, 'department_name': name} for code, name in departments.items()]).to_csv(
+        os.path.join(data_dir, 'depart_list.csv'), index=False, encoding='utf-8')
+    pd.DataFrame([{
+        '사업코드': p['project_id'],
+        '사업명': p['project_name'],
+        'PM부서': p['pm_department'],
+        '진행상태': p['status'],
+        '주관사': p['contractor']
+    } for p in projects]).to_csv(os.path.join(data_dir, 'contract_status.csv'), index=False, encoding='utf-8-sig')
+    pd.DataFrame([{
+        'ProjectID': p['project_id'],
+        'ProjectName': p['project_name'],
+        'Depart': p['department_name'],
+        'Status': p['status'],
+        'Contractor': p['contractor'],
+        'ProjectID_numeric': p['numeric_id'],
+        'Depart_ProjectID': f"{p['department_code']}_{p['project_id']}",
+        'search_folder': p['folder'][len(root):].lstrip('/').replace('/', '\\')
+    } for p in projects]).to_csv(os.path.join(data_dir, 'audit_targets_new.csv'), index=False, encoding='utf-8-sig')
+
+
+def materialize(fs: MemoryFileSystem, root: str, target_dir: str) -> int:
+    """메모리 폴더 구조를 실제 디스크에 생성 (빈 파일, 로컬 파일 시스템 비교용)"""
+    count = 0
+    stack = [(root, target_dir)]
+    while stack:
+        source, target = stack.pop()
+        os.makedirs(target, exist_ok=True)
+        for entry in fs.scandir(source):
+            path = os.path.join(target, entry.name)
+            if entry.is_dir():
+                stack.append((entry.path, path))
+            else:
+                open(path, 'wb').close()
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 부서 공유 폴더 생성")
+    parser.add_argument('--departments', type=int, default=3)
+    parser.add_argument('--projects', type=int, default=20, help="부서별 프로젝트 수")
+    parser.add_argument('--depth', type=int, default=3, help="프로젝트 안의 하위 폴더 깊이")
+    parser.add_argument('--files', type=int, default=8, help="폴더별 파일 수")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--dump', type=str, default=None, help="트리 덤프(JSONL) 저장 경로 (AUDIT_FS_TREE_DUMP로 사용)")
+    parser.add_argument('--materialize', type=str, default=None, help="실제 디스크에 폴더 구조를 만들 경로")
+    parser.add_argument('--data-dir', type=str, default=None, help="부서/계약/감사 대상 CSV를 저장할 경로")
+    args = parser.parse_args()
+
+    fs = MemoryFileSystem()
+    projects = build_synthetic_share(fs, 'T:', args.departments, args.projects, args.depth, args.files, seed=args.seed)
+    print(f"합성 공유 폴더: 부서 {args.departments}개, 프로젝트 {len(projects)}개")
+    if args.dump:
+        print(f"트리 덤프 {dump_tree(fs, 'T:', args.dump)}개 항목 저장: {args.dump}")
+    if args.materialize:
+        print(f"디스크에 {materialize(fs, 'T:', args.materialize)}개 항목 생성: {args.materialize}")
+    if args.data_dir:
+        write_metadata(args.data_dir, projects)
+        print(f"CSV 저장: {args.data_dir}")
+
+
+if __name__ == '__main__':
+    main()
+
+# python benchmarks/synthetic_share.py --projects 100 --dump benchmarks/data/share.jsonl
+# python benchmarks/synthetic_share.py --materialize /tmp/share --data-dir /tmp/share_data
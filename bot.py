@@ -3,17 +3,14 @@
 import os
 import sys
 import asyncio
-from dotenv import load_dotenv
 import discord
 from discord.ext import tasks, commands
 from discord.ext.commands import Context
 import certifi
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 import threading
-import google.generativeai as genai
 import requests
 from datetime import datetime
-import pandas as pd
 import traceback
 import json
 import re
@@ -24,26 +21,27 @@ os.environ['SSL_CERT_FILE'] = certifi.where()
 
 # 플라스크 앱 디렉토리 추가
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'my_flask_app')))
+# .env와 로그 형식은 다른 모듈을 임포트하기 전에 한 번만 설정 (config 임포트 자체는 부작용 없음)
+from config import load_environment, configure_logging, get_settings, stop_log_queue
+load_environment()
+configure_logging()
 
 # 사용자 정의 모듈 임포트
-from config import DOCUMENT_TYPES, PROJECT_LIST_CSV, NETWORK_BASE_PATH, STATIC_PATH, STATIC_DATA_PATH, DISCORD_WEBHOOK_URL
-from search_project_data import ProjectDocumentSearcher
-from audit_service import AuditService
-from export_report import generate_summary_report
-from generate_summary import generate_combined_report
+from config import DOCUMENT_TYPES, PROJECT_LIST_CSV, STATIC_PATH, STATIC_DATA_PATH, DISCORD_WEBHOOK_URL
 from get_project import get_project_info
 from audit_message import send_audit_to_discord, send_audit_status_to_discord
+from discord_notifier import DiscordProgressNotifier, split_message
+from job_queue import JobManager
+from audit_checkpoint import AuditCheckpoint
+from sync_scheduler import sync_scheduler
+from services import services
+from metrics import metrics
+from profiling import RunProfiler
 
 # JSON 파일 저장 경로 설정
 AUDIT_RESULTS_DIR = os.path.join(STATIC_PATH, 'results')
 os.makedirs(AUDIT_RESULTS_DIR, exist_ok=True)
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
 # 디버깅을 위한 로깅 함수
@@ -54,12 +52,9 @@ async def log_debug(ctx, message, error=None):
         debug_msg += f"\n🔍 Traceback:\n```python\n{traceback.format_exc()}```"
     await ctx.send(debug_msg)
 
-# 명시적으로 .env 파일 경로를 지정하여 환경 변수 로드
-env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env')
-load_dotenv(dotenv_path=env_path)
-
 TOKEN = os.getenv('DISCORD_APPLICATION_TOKEN')
-CHANNEL_ID = int(os.getenv('DISCORD_CHANNEL_ID'))
+# 값이 없어도 임포트는 되도록 하고 run_bot()에서 확인
+CHANNEL_ID = int(os.getenv('DISCORD_CHANNEL_ID') or 0)
 GEMINI_API_KEY = os.getenv('GOOGLE_API_KEY')
 
 intents = discord.Intents.default()
@@ -79,12 +74,10 @@ def check_duplicate_message():
 
 bot_started = False
 
-# 서비스 인스턴스 생성
-audit_service = AuditService()
+# 감사 서비스는 services.get('audit_service')로 처음 사용할 때 생성 (pandas 임포트가 느려 봇 시작 시간 단축)
 
-# Gemini API 설정
-genai.configure(api_key=GEMINI_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+# 백그라운드 작업 큐 (전체/부서 감사)
+job_manager = JobManager(workers=int(os.getenv('AUDIT_JOB_WORKERS', '1')))
 
 @bot.event
 async def on_ready():
@@ -99,6 +92,15 @@ async def on_ready():
             logger.error(f'Failed to get channel with ID {CHANNEL_ID}')
         bot_started = True
         await bot.change_presence(activity=discord.Game(name="audit 명령어로 프로젝트 감사"))
+        # 이전 실행에서 끝나지 않은 작업은 체크포인트부터 재개
+        await job_manager.start()
+        # 변경된 보고서/결과 파일의 GitHub 동기화는 백그라운드에서 모아서 처리
+        sync_scheduler.start()
+        # 공유 폴더 감시: 폴더 변경을 메모리 인덱스와 검색기 캐시에 바로 반영 (AUDIT_WATCH_SHARE=1)
+        if get_settings().watch_share:
+            share_watcher = services.get('share_watcher')
+            share_watcher.add_listener(services.get('audit_service').searcher.invalidate_paths)
+            share_watcher.start()
 
 @bot.command(name='test_audit')
 async def test_audit(ctx, project_id: str):
@@ -122,9 +124,7 @@ async def gchat(ctx, *, query: str = None):
         return
 
     try:
-        genai.configure(api_key=GEMINI_API_KEY)
-        model = genai.GenerativeModel('gemini-1.5-flash')
-        response = model.generate_content(query)
+        response = await asyncio.to_thread(services.get('gemini_model').generate_content, query)
         await ctx.send(response.text)
     except Exception as e:
         await ctx.send(f"Gemini와의 대화 중 오류가 발생했습니다: {e}")
@@ -162,7 +162,7 @@ async def analyze_with_gemini(project_data):
 
 분석 결과를 명확하고 구체적으로 제시해주세요."""
 
-        response = model.generate_content(prompt)
+        response = await asyncio.to_thread(services.get('gemini_model').generate_content, prompt)
         analysis = f"""프로젝트 문서 분석 결과:
 {response.text}"""
         return analysis
@@ -170,6 +170,281 @@ async def analyze_with_gemini(project_data):
         logger.error(f"Error in analyze_with_gemini: {e}")
         return f"AI 분석 중 오류 발생: {str(e)}"
 
+async def run_audit_all_job(job, manager):
+    """audit_targets_new.csv의 모든 프로젝트 감사 (백그라운드 작업 핸들러)"""
+    ctx = bot.get_channel(job['channel_id']) if job.get('channel_id') else None
+    use_ai = job['params'].get('use_ai', False)
+    skip_unchanged = job['params'].get('skip_unchanged', False)
+    # 프로젝트별 완료 기록 (재시작 시 완료된 프로젝트는 저장된 결과를 재사용)
+    checkpoint = AuditCheckpoint(f"job_{job['id']}")
+    manager.update(job['id'], checkpoint={'file': checkpoint.path})
+    if len(checkpoint):
+        await send_audit_status_to_discord(ctx, f"♻️ 작업 {job['id']} 재개: 완료된 {checkpoint.counts()['done']}개 프로젝트는 저장된 결과를 재사용합니다...")
+    else:
+        await send_audit_status_to_discord(ctx, f"🔍 [{job['id']}] audit_targets_new.csv에 있는 모든 프로젝트 감사를 시작합니다...")
+
+    audit_targets_csv = os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv')
+    if not os.path.exists(audit_targets_csv):
+        await send_audit_status_to_discord(ctx, f"❌ audit_targets_new.csv 파일을 찾을 수 없습니다: {audit_targets_csv}")
+        logger.error(f"CSV file not found: {audit_targets_csv}")
+        raise FileNotFoundError(audit_targets_csv)
+
+    import pandas as pd
+    df = pd.read_csv(audit_targets_csv, encoding='utf-8-sig')
+    df['ProjectID'] = df['ProjectID'].apply(lambda x: re.sub(r'^[A-Za-z]', '', str(x)))
+    total_projects = len(df)
+
+    await send_audit_status_to_discord(ctx, f"📊 총 {total_projects}개 프로젝트를 처리합니다...")
+
+    all_results = []
+    success_count = 0
+    error_count = 0
+    reused_count = 0
+    unchanged_count = 0
+    # 프로젝트별 상태 메시지는 하나의 진행 메시지로 모아서 주기적으로 수정
+    notifier = DiscordProgressNotifier(f"📋 [{job['id']}] 전체 프로젝트 감사 진행 상황", ctx=ctx).start()
+
+    try:
+        for idx, row in df.iterrows():
+            project_id = str(row['ProjectID'])
+            search_folder = str(row['search_folder'])
+            if checkpoint.is_done(project_id):
+                saved = checkpoint.load_result(project_id)
+                if saved is not None:
+                    all_results.append(saved)
+                    success_count += 1
+                    reused_count += 1
+                    continue
+
+            progress = f"({idx + 1}/{total_projects})"
+            notifier.set_progress(idx, total_projects)
+
+            try:
+                if search_folder in ["No folder", "No directory"]:
+                    result = {
+                        "project_id": project_id,
+                        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                        "documents_found": 0,
+                        "risk_level": 0,
+                        "missing_docs": 0,
+                        "department": row['Depart'],
+                        "status": row['Status'],
+                        "contractor": row['Contractor'],
+                        "project_name": row['ProjectName'],
+                        "result": "0,0,0,0,0,0,0 (Folder missing)"
+                    }
+                    all_results.append(result)
+                    success_count += 1
+                    checkpoint.mark(project_id, result=result)
+                    notifier.notify(f"✅ 프로젝트 {project_id} 감사 완료: 0,0,0,0,0,0,0 (Folder missing) {progress}")
+                    logger.info(f"Project {project_id}: No folder/No directory, returning default result 0,0,0,0,0,0,0")
+                else:
+                    result = await services.get('audit_service').audit_project(project_id, None, use_ai, ctx, notifier=notifier, skip_unchanged=skip_unchanged)  # use_ai 적용
+                    if isinstance(result, list) and result and not any('error' in item for item in result):
+                        all_results.extend(result)
+                        success_count += 1
+                        checkpoint.mark_saved(project_id, result[0])
+                        notifier.notify(f"✅ 프로젝트 {project_id} 감사 완료: {result[0].get('timestamp', '시간정보 없음')} {progress}")
+                        # AI 분석 결과 표시 (use_ai=True일 경우)
+                        if use_ai and 'ai_analysis' in result[0] and result[0]['ai_analysis']:
+                            notifier.notify(f"🤖 AI 분석 결과:\n{result[0]['ai_analysis']}")
+                    elif isinstance(result, dict) and result and 'error' not in result:
+                        all_results.append(result)
+                        success_count += 1
+                        if result.get('skipped_unchanged'):
+                            unchanged_count += 1
+                        checkpoint.mark_saved(project_id, result)
+                        notifier.notify(f"✅ 프로젝트 {project_id} 감사 완료: {result.get('timestamp', '시간정보 없음')} {progress}")
+                        # AI 분석 결과 표시 (use_ai=True일 경우)
+                        if use_ai and 'ai_analysis' in result and result['ai_analysis']:
+                            notifier.notify(f"🤖 AI 분석 결과:\n{result['ai_analysis']}")
+                    else:
+                        error_count += 1
+                        error = result[0].get('error', 'Unknown error') if isinstance(result, list) and result else result.get('error', 'Unknown error')
+                        checkpoint.mark(project_id, status='error', error=str(error))
+                        notifier.notify(f"❌ 프로젝트 {project_id} 감사 실패: {error} {progress}")
+            except Exception as e:
+                error_count += 1
+                error_msg = f"Error processing project {project_id}: {str(e)}"
+                logger.error(error_msg)
+                checkpoint.mark(project_id, status='error', error=str(e))
+                notifier.notify(f"❌ {error_msg} {progress}")
+
+            manager.update(job['id'], progress={'done': idx + 1, 'total': total_projects})
+
+        notifier.set_progress(total_projects, total_projects)
+    finally:
+        await notifier.close()
+
+    results_dir = os.path.join(os.path.dirname(STATIC_DATA_PATH), 'results')
+    output_path = os.path.join(os.path.dirname(STATIC_DATA_PATH), 'report', 'combined_report')
+    from generate_summary import generate_combined_report
+    summary_path = await generate_combined_report(results_dir, output_path, verbose=True)
+
+    report = (
+        "📋 전체 감사 완료 보고서\n"
+        "------------------------\n"
+        f"✅ 감사 성공: {success_count}개\n"
+        f"❌ 감사 실패: {error_count}개\n"
+        f"📊 총 처리: {total_projects}개 (체크포인트 재사용 {reused_count}개, 변경 없음 {unchanged_count}개)\n"
+        "------------------------\n"
+        "📈 위험도 분석:\n"
+    )
+
+    if summary_path:
+        report += f"\n✅ 통합 보고서가 생성되었습니다: {summary_path}"
+    else:
+        report += "\n❌ 통합 보고서 생성에 실패했습니다."
+
+    await send_audit_status_to_discord(ctx, report)
+
+    results_dir = os.path.join(STATIC_PATH, 'results')
+    os.makedirs(results_dir, exist_ok=True)
+    output_path = os.path.join(results_dir, f'audit_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
+        await f.write(json.dumps(all_results, ensure_ascii=False, indent=2))
+
+    logger.info(f"감사 결과 저장 완료: {output_path}")
+    sync_scheduler.mark_dirty(output_path)
+
+    report_dir = os.path.join(STATIC_PATH, 'report')
+    os.makedirs(report_dir, exist_ok=True)
+    from generate_summary import generate_combined_report
+    summary_path = await generate_combined_report(results_dir, os.path.join(report_dir, 'combined_report'), verbose=True)
+
+    if summary_path:
+        report += f"\n✅ 통합 보고서가 생성되었습니다: {summary_path}"
+    else:
+        report += "\n❌ 통합 보고서 생성에 실패했습니다."
+
+    await send_audit_status_to_discord(ctx, report)
+    delivery = await send_audit_to_discord(all_results)
+    await send_audit_status_to_discord(ctx, f"📨 웹훅 전송: 성공 {delivery['delivered']}개, 실패 {delivery['failed']}개")
+    checkpoint.clear()
+    return {'success_count': success_count, 'error_count': error_count, 'reused_count': reused_count, 'unchanged_count': unchanged_count, 'total': total_projects, 'summary_path': summary_path}
+
+
+async def run_audit_dept_job(job, manager):
+    """특정 부서의 모든 프로젝트 감사 (백그라운드 작업 핸들러)"""
+    ctx = bot.get_channel(job['channel_id']) if job.get('channel_id') else None
+    department_code = job['params']['department_code']
+    skip_unchanged = job['params'].get('skip_unchanged', False)
+    checkpoint = AuditCheckpoint(f"job_{job['id']}")
+    manager.update(job['id'], checkpoint={'file': checkpoint.path})
+    if len(checkpoint):
+        await send_audit_status_to_discord(ctx, f"♻️ 작업 {job['id']} 재개: 부서 {department_code}의 완료된 {checkpoint.counts()['done']}개 프로젝트는 저장된 결과를 재사용합니다...")
+    else:
+        await send_audit_status_to_discord(ctx, f"🏢 [{job['id']}] 부서 {department_code}의 모든 프로젝트 감사를 시작합니다...")
+
+    # audit_targets_new.csv에서 해당 부서의 프로젝트만 필터링
+    audit_targets_csv = os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv')
+    if not os.path.exists(audit_targets_csv):
+        await send_audit_status_to_discord(ctx, f"❌ audit_targets_new.csv 파일을 찾을 수 없습니다.")
+        raise FileNotFoundError(audit_targets_csv)
+
+    import pandas as pd
+    df = pd.read_csv(audit_targets_csv, encoding='utf-8-sig')
+    df['ProjectID'] = df['ProjectID'].apply(lambda x: re.sub(r'^[A-Za-z]', '', str(x)))
+
+    # 부서별 필터링
+    dept_projects = df[df['Depart'].str.contains(department_code, na=False)]
+
+    if dept_projects.empty:
+        await send_audit_status_to_discord(ctx, f"❌ 부서 코드 {department_code}에 해당하는 프로젝트가 없습니다.")
+        return {'success_count': 0, 'error_count': 0, 'total': 0}
+
+    total_projects = len(dept_projects)
+    await send_audit_status_to_discord(ctx, f"📊 부서 {department_code}: 총 {total_projects}개 프로젝트를 처리합니다...")
+
+    all_results = []
+    success_count = 0
+    error_count = 0
+    notifier = DiscordProgressNotifier(f"🏢 [{job['id']}] 부서 {department_code} 감사 진행 상황", ctx=ctx).start()
+
+    try:
+        for idx, (_, row) in enumerate(dept_projects.iterrows()):
+            project_id = str(row['ProjectID'])
+            if checkpoint.is_done(project_id):
+                saved = checkpoint.load_result(project_id)
+                if saved is not None:
+                    all_results.append(saved)
+                    success_count += 1
+                    continue
+            progress = f"({idx + 1}/{total_projects})"
+            notifier.set_progress(idx, total_projects)
+
+            try:
+                result = await services.get('audit_service').audit_project(project_id, department_code, False, ctx, notifier=notifier, skip_unchanged=skip_unchanged)
+                if isinstance(result, dict) and result and 'error' not in result:
+                    all_results.append(result)
+                    success_count += 1
+                    checkpoint.mark_saved(project_id, result)
+                    notifier.notify(f"✅ 프로젝트 {project_id} 감사 완료 {progress}")
+                else:
+                    error_count += 1
+                    checkpoint.mark(project_id, status='error', error='audit failed')
+                    notifier.notify(f"❌ 프로젝트 {project_id} 감사 실패 {progress}")
+            except Exception as e:
+                error_count += 1
+                checkpoint.mark(project_id, status='error', error=str(e))
+                notifier.notify(f"❌ 프로젝트 {project_id} 처리 중 오류: {str(e)} {progress}")
+
+            manager.update(job['id'], progress={'done': idx + 1, 'total': total_projects})
+
+        notifier.set_progress(total_projects, total_projects)
+    finally:
+        await notifier.close()
+
+    # 결과 저장
+    results_dir = os.path.join(STATIC_PATH, 'results')
+    os.makedirs(results_dir, exist_ok=True)
+    output_path = os.path.join(results_dir, f'audit_dept_{department_code}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
+    async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
+        await f.write(json.dumps(all_results, ensure_ascii=False, indent=2))
+    sync_scheduler.mark_dirty(output_path)
+
+    report = (
+        f"🏢 **부서 {department_code} 감사 완료 보고서**\n"
+        "------------------------\n"
+        f"✅ 감사 성공: {success_count}개\n"
+        f"❌ 감사 실패: {error_count}개\n"
+        f"📊 총 처리: {total_projects}개\n"
+        "------------------------\n"
+        f"📁 결과 저장: {output_path}"
+    )
+
+    await send_audit_status_to_discord(ctx, report)
+    delivery = await send_audit_to_discord(all_results)
+    await send_audit_status_to_discord(ctx, f"📨 웹훅 전송: 성공 {delivery['delivered']}개, 실패 {delivery['failed']}개")
+    checkpoint.clear()
+    return {'success_count': success_count, 'error_count': error_count, 'total': total_projects, 'output_path': output_path}
+
+
+def profile_option(options):
+    """명령어 옵션의 프로파일 모드 (profile: 전체 스레드 샘플링, cprofile: 이벤트 루프 스레드 함수별 시간)"""
+    lowered = [option.lower() for option in options]
+    if 'cprofile' in lowered:
+        return 'cprofile'
+    return 'sample' if 'profile' in lowered else None
+
+def with_profiling(handler):
+    """작업 파라미터에 profile이 있을 때만 핸들러를 프로파일러 아래에서 실행하고 상위 병목을 채널에 전송"""
+    async def run(job, manager):
+        mode = job['params'].get('profile')
+        if not mode:
+            return await handler(job, manager)
+        profiler = RunProfiler(f"{job['kind']}_{job['id']}", mode)
+        with profiler:
+            result = await handler(job, manager)
+        ctx = bot.get_channel(job['channel_id']) if job.get('channel_id') else None
+        for chunk in split_message(f"⏱️ **작업 {job['id']} 프로파일**\n```\n{profiler.summary(top=10)}\n```"):
+            await send_audit_status_to_discord(ctx, chunk)
+        return {**result, 'profile_path': profiler.output_path}
+    return run
+
+job_manager.register('audit_all', with_profiling(run_audit_all_job))
+job_manager.register('audit_dept', with_profiling(run_audit_dept_job))
+
 @bot.command(name='audit')
 async def audit(ctx, *, query: str = None):
     """프로젝트 감사 명령어"""
@@ -189,120 +464,16 @@ async def audit(ctx, *, query: str = None):
 
         if args[0].lower() == 'all':
             # !audit all 또는 !audit (query가 없으면 all로 간주)
-            await send_audit_status_to_discord(ctx, "🔍 audit_targets_new.csv에 있는 모든 프로젝트 감사를 시작합니다...")
-            
-            audit_targets_csv = os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv')
-            if not os.path.exists(audit_targets_csv):
-                await send_audit_status_to_discord(ctx, f"❌ audit_targets_new.csv 파일을 찾을 수 없습니다: {audit_targets_csv}")
-                logger.error(f"CSV file not found: {audit_targets_csv}")
-                return
-            
-            df = pd.read_csv(audit_targets_csv, encoding='utf-8-sig')
-            df['ProjectID'] = df['ProjectID'].apply(lambda x: re.sub(r'^[A-Za-z]', '', str(x)))
-            total_projects = len(df)
-            
-            await send_audit_status_to_discord(ctx, f"📊 총 {total_projects}개 프로젝트를 처리합니다...")
-            
-            all_results = []
-            success_count = 0
-            error_count = 0
-            
-            for idx, row in df.iterrows():
-                project_id = str(row['ProjectID'])
-                search_folder = str(row['search_folder'])
-                
-                progress = f"({idx + 1}/{total_projects})"
-                
-                if idx % 10 == 0:
-                    await send_audit_status_to_discord(ctx, f"🔄 진행중... {progress}")
-                
-                await send_audit_status_to_discord(ctx, f"🔍 프로젝트 {project_id} 감사를 시작합니다...")
-                try:
-                    if search_folder in ["No folder", "No directory"]:
-                        result = {
-                            "project_id": project_id,
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            "documents_found": 0,
-                            "risk_level": 0,
-                            "missing_docs": 0,
-                            "department": row['Depart'],
-                            "status": row['Status'],
-                            "contractor": row['Contractor'],
-                            "project_name": row['ProjectName'],
-                            "result": "0,0,0,0,0,0,0 (Folder missing)"
-                        }
-                        all_results.append(result)
-                        success_count += 1
-                        await send_audit_status_to_discord(ctx, f"✅ 프로젝트 {project_id} 감사 완료: 0,0,0,0,0,0,0 (Folder missing) {progress}")
-                        logger.info(f"Project {project_id}: No folder/No directory, returning default result 0,0,0,0,0,0,0")
-                    else:
-                        result = await audit_service.audit_project(project_id, None, use_ai, ctx)  # use_ai 적용
-                        if isinstance(result, list) and not any('error' in item for item in result):
-                            all_results.extend(result)
-                            success_count += 1
-                            await send_audit_status_to_discord(ctx, f"✅ 프로젝트 {project_id} 감사 완료: {result[0].get('timestamp', '시간정보 없음')} {progress}")
-                            # AI 분석 결과 표시 (use_ai=True일 경우)
-                            if use_ai and 'ai_analysis' in result[0] and result[0]['ai_analysis']:
-                                await send_audit_status_to_discord(ctx, f"🤖 AI 분석 결과:\n{result[0]['ai_analysis']}")
-                        elif isinstance(result, dict) and 'error' not in result:
-                            all_results.append(result)
-                            success_count += 1
-                            await send_audit_status_to_discord(ctx, f"✅ 프로젝트 {project_id} 감사 완료: {result.get('timestamp', '시간정보 없음')} {progress}")
-                            # AI 분석 결과 표시 (use_ai=True일 경우)
-                            if use_ai and 'ai_analysis' in result and result['ai_analysis']:
-                                await send_audit_status_to_discord(ctx, f"🤖 AI 분석 결과:\n{result['ai_analysis']}")
-                        else:
-                            error_count += 1
-                            error = result[0]['error'] if isinstance(result, list) and result else result.get('error', 'Unknown error')
-                            await send_audit_status_to_discord(ctx, f"❌ 프로젝트 {project_id} 감사 실패: {error} {progress}")
-                    await asyncio.sleep(1)
-                except Exception as e:
-                    error_count += 1
-                    error_msg = f"Error processing project {project_id}: {str(e)}"
-                    logger.error(error_msg)
-                    await send_audit_status_to_discord(ctx, f"❌ {error_msg} {progress}")
-                    continue
-                
-            results_dir = os.path.join(os.path.dirname(STATIC_DATA_PATH), 'results')
-            output_path = os.path.join(os.path.dirname(STATIC_DATA_PATH), 'report', 'combined_report')
-            summary_path = await generate_combined_report(results_dir, output_path, verbose=True)
-            
-            report = (
-                "📋 전체 감사 완료 보고서\n"
-                "------------------------\n"
-                f"✅ 감사 성공: {success_count}개\n"
-                f"❌ 감사 실패: {error_count}개\n"
-                f"📊 총 처리: {total_projects}개\n"
-                "------------------------\n"
-                "📈 위험도 분석:\n"
-            )
-            
-            if summary_path:
-                report += f"\n✅ 통합 보고서가 생성되었습니다: {summary_path}"
-            else:
-                report += "\n❌ 통합 보고서 생성에 실패했습니다."
-            
-            await ctx.send(report)
-            
-            results_dir = os.path.join(STATIC_PATH, 'results')
-            os.makedirs(results_dir, exist_ok=True)
-            output_path = os.path.join(results_dir, f'audit_results_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-            async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(all_results, ensure_ascii=False, indent=2))
-            
-            logger.info(f"감사 결과 저장 완료: {output_path}")
-            
-            report_dir = os.path.join(STATIC_PATH, 'report')
-            os.makedirs(report_dir, exist_ok=True)
-            summary_path = await generate_combined_report(results_dir, os.path.join(report_dir, 'combined_report'), verbose=True)
-            
-            if summary_path:
-                report += f"\n✅ 통합 보고서가 생성되었습니다: {summary_path}"
-            else:
-                report += "\n❌ 통합 보고서 생성에 실패했습니다."
-            
-            await ctx.send(report)
-            await send_audit_to_discord(all_results)
+            # 전체 감사는 백그라운드 작업으로 실행하고 작업 ID만 즉시 반환
+            # !audit all changed: 폴더가 바뀐 프로젝트만 다시 검색
+            # !audit all profile: 감사 작업을 프로파일링해 static/report에 저장 (cprofile 도 가능)
+            options = [arg.lower() for arg in args[1:]]
+            skip_unchanged = 'changed' in options
+            params = {'use_ai': use_ai, 'skip_unchanged': skip_unchanged}
+            if profile_option(options):
+                params['profile'] = profile_option(options)
+            job_id = job_manager.submit('audit_all', params, channel_id=ctx.channel.id)
+            await send_audit_status_to_discord(ctx, f"🗂️ 전체 감사 작업이 등록되었습니다. 작업 ID: `{job_id}` (!jobs 로 상태 확인, !cancel {job_id} 로 취소)")
 
         else:
             project_id = args[0]
@@ -311,7 +482,7 @@ async def audit(ctx, *, query: str = None):
             
             await send_audit_status_to_discord(ctx, f"🔍 프로젝트 {project_id} 감사를 시작합니다...")
             try:
-                result = await audit_service.audit_project(numeric_project_id, department_code, False, ctx)
+                result = await services.get('audit_service').audit_project(numeric_project_id, department_code, False, ctx)
                 if isinstance(result, list) and not any('error' in item for item in result):
                     audit_result = result[0] if result else {}
                     await send_audit_status_to_discord(ctx, f"✅ 프로젝트 {project_id} 감사 완료: {audit_result.get('timestamp', '시간정보 없음')}")
@@ -332,9 +503,11 @@ async def audit(ctx, *, query: str = None):
                     await f.write(json.dumps(audit_results, ensure_ascii=False, indent=2))
                 
                 logger.info(f"감사 결과 저장 완료: {output_path}")
+                sync_scheduler.mark_dirty(output_path)
                 
                 report_dir = os.path.join(STATIC_PATH, 'report')
                 os.makedirs(report_dir, exist_ok=True)
+                from generate_summary import generate_combined_report
                 summary_path = await generate_combined_report(results_dir, os.path.join(report_dir, 'combined_report'), verbose=True)
                 
                 report = f"📋 **프로젝트 ID {numeric_project_id} 감사 결과**\n"
@@ -374,13 +547,15 @@ async def audit(ctx, *, query: str = None):
         await send_audit_status_to_discord(ctx, f"❌ 오류 발생: {str(e)}")
 
 @bot.command(name='audit_dept')
-async def audit_dept(ctx, department_code: str = None):
+async def audit_dept(ctx, department_code: str = None, *options: str):
     """특정 부서의 모든 프로젝트 감사"""
     try:
         if not department_code:
             help_message = (
                 "🏢 부서별 감사 명령어 사용법:\n"
-                "!audit_dept [부서코드] - 특정 부서의 모든 프로젝트 감사\n\n"
+                "!audit_dept [부서코드] - 특정 부서의 모든 프로젝트 감사\n"
+                "!audit_dept [부서코드] changed - 폴더가 바뀐 프로젝트만 다시 감사\n"
+                "!audit_dept [부서코드] profile - 감사를 프로파일링해 상위 병목 표시 (cprofile 도 가능)\n\n"
                 "📋 부서 코드 목록:\n"
                 "01010 - 도로부\n"
                 "01020 - 공항및인프라사업부\n"
@@ -396,79 +571,156 @@ async def audit_dept(ctx, department_code: str = None):
             await ctx.send(help_message)
             return
 
-        await send_audit_status_to_discord(ctx, f"🏢 부서 {department_code}의 모든 프로젝트 감사를 시작합니다...")
-        
-        # audit_targets_new.csv에서 해당 부서의 프로젝트만 필터링
-        audit_targets_csv = os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv')
-        if not os.path.exists(audit_targets_csv):
-            await send_audit_status_to_discord(ctx, f"❌ audit_targets_new.csv 파일을 찾을 수 없습니다.")
-            return
+        skip_unchanged = 'changed' in [option.lower() for option in options]
+        params = {'department_code': department_code, 'skip_unchanged': skip_unchanged}
+        if profile_option(options):
+            params['profile'] = profile_option(options)
+        job_id = job_manager.submit('audit_dept', params, channel_id=ctx.channel.id)
+        await send_audit_status_to_discord(ctx, f"🗂️ 부서 {department_code} 감사 작업이 등록되었습니다. 작업 ID: `{job_id}` (!jobs 로 상태 확인, !cancel {job_id} 로 취소)")
         
-        df = pd.read_csv(audit_targets_csv, encoding='utf-8-sig')
-        df['ProjectID'] = df['ProjectID'].apply(lambda x: re.sub(r'^[A-Za-z]', '', str(x)))
-        
-        # 부서별 필터링
-        dept_projects = df[df['Depart'].str.contains(department_code, na=False)]
-        
-        if dept_projects.empty:
-            await send_audit_status_to_discord(ctx, f"❌ 부서 코드 {department_code}에 해당하는 프로젝트가 없습니다.")
+    except Exception as e:
+        await send_audit_status_to_discord(ctx, f"❌ 부서별 감사 중 오류 발생: {str(e)}")
+        logger.error(f"Error in audit_dept: {e}")
+
+@bot.command(name='jobs')
+async def jobs(ctx):
+    """백그라운드 작업 목록 조회"""
+    try:
+        job_list = job_manager.list_jobs()
+        if not job_list:
+            await ctx.send("📭 등록된 작업이 없습니다.")
             return
-        
-        total_projects = len(dept_projects)
-        await send_audit_status_to_discord(ctx, f"📊 부서 {department_code}: 총 {total_projects}개 프로젝트를 처리합니다...")
-        
-        all_results = []
-        success_count = 0
-        error_count = 0
-        
-        for idx, row in dept_projects.iterrows():
-            project_id = str(row['ProjectID'])
-            progress = f"({idx + 1}/{total_projects})"
-            
-            await send_audit_status_to_discord(ctx, f"🔍 프로젝트 {project_id} 감사를 시작합니다...")
-            try:
-                result = await audit_service.audit_project(project_id, department_code, False, ctx)
-                if isinstance(result, dict) and 'error' not in result:
-                    all_results.append(result)
-                    success_count += 1
-                    await send_audit_status_to_discord(ctx, f"✅ 프로젝트 {project_id} 감사 완료 {progress}")
-                else:
-                    error_count += 1
-                    await send_audit_status_to_discord(ctx, f"❌ 프로젝트 {project_id} 감사 실패 {progress}")
-                await asyncio.sleep(1)
-            except Exception as e:
-                error_count += 1
-                await send_audit_status_to_discord(ctx, f"❌ 프로젝트 {project_id} 처리 중 오류: {str(e)} {progress}")
-                continue
-        
-        # 결과 저장
-        results_dir = os.path.join(STATIC_PATH, 'results')
-        os.makedirs(results_dir, exist_ok=True)
-        output_path = os.path.join(results_dir, f'audit_dept_{department_code}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json')
-        async with aiofiles.open(output_path, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(all_results, ensure_ascii=False, indent=2))
-        
-        report = (
-            f"🏢 **부서 {department_code} 감사 완료 보고서**\n"
+
+        status_icons = {'queued': '⏳', 'running': '🔄', 'done': '✅', 'failed': '❌', 'cancelled': '🚫'}
+        message = "🗂️ **작업 목록**\n------------------------\n"
+        for job in job_list:
+            progress = job['progress']
+            target = job['params'].get('department_code', 'all')
+            message += f"{status_icons.get(job['status'], '❔')} `{job['id']}` {job['kind']}({target}) {job['status']}"
+            if progress.get('total'):
+                message += f" {progress['done']}/{progress['total']}"
+            message += f" - {job['created_at']}\n"
+            if job.get('error'):
+                message += f"    └ 오류: {job['error']}\n"
+        await ctx.send(message)
+    except Exception as e:
+        await ctx.send(f"작업 목록 조회 중 오류 발생: {str(e)}")
+        logger.error(f"Error in jobs command: {e}")
+
+@bot.command(name='cancel')
+async def cancel(ctx, job_id: str = None):
+    """백그라운드 작업 취소"""
+    if not job_id:
+        await ctx.send("사용법: !cancel [작업ID] (작업 ID는 !jobs 로 확인)")
+        return
+    if job_manager.cancel(job_id):
+        await ctx.send(f"🚫 작업 `{job_id}` 취소를 요청했습니다.")
+    else:
+        await ctx.send(f"❌ 취소할 수 있는 작업 `{job_id}`이(가) 없습니다.")
+
+@bot.command(name='sync')
+async def sync(ctx, mode: str = None):
+    """GitHub 동기화 상태 조회 (!sync now 로 대기 중인 파일 즉시 동기화)"""
+    try:
+        if (mode or '').lower() == 'now':
+            await ctx.send("🔄 대기 중인 파일을 GitHub에 동기화합니다...")
+            commit = await sync_scheduler.flush()
+            await ctx.send(f"✅ 동기화 완료: 커밋 `{commit[:7]}`" if commit else "✅ 동기화할 변경 사항이 없습니다.")
+
+        status = sync_scheduler.status()
+        message = (
+            "🔄 **GitHub 동기화 상태**\n"
             "------------------------\n"
-            f"✅ 감사 성공: {success_count}개\n"
-            f"❌ 감사 실패: {error_count}개\n"
-            f"📊 총 처리: {total_projects}개\n"
+            f"스케줄러: {'실행 중' if status['running'] else '중지'}{' (동기화 중)' if status['syncing'] else ''}\n"
+            f"대기 중인 파일: {status['pending_files']}개"
+        )
+        if status['next_sync_in_seconds'] is not None:
+            message += f" (약 {status['next_sync_in_seconds']:.0f}초 후 동기화)"
+        message += (
+            f"\n마지막 동기화: {status['last_sync'] or '없음'}"
+            f"{' (커밋 ' + status['last_commit'][:7] + ')' if status['last_commit'] else ''}\n"
+            f"누적: {status['flushes']}회, {status['files_synced']}개 파일, 실패 {status['failures']}회\n"
+            f"동기화 조건: 마지막 변경 후 {status['idle_seconds']:.0f}초 또는 최대 {status['interval_seconds']:.0f}초"
+        )
+        if status['last_error']:
+            message += f"\n❌ 마지막 오류: {status['last_error']}"
+        await ctx.send(message)
+    except Exception as e:
+        await ctx.send(f"동기화 상태 조회 중 오류 발생: {str(e)}")
+        logger.error(f"Error in sync command: {e}")
+
+@bot.command(name='watch')
+async def watch(ctx, mode: str = None):
+    """공유 폴더 감시 상태 조회 (!watch rescan 으로 캐시된 폴더 즉시 재검색)"""
+    try:
+        if not get_settings().watch_share:
+            await ctx.send("👀 공유 폴더 감시가 꺼져 있습니다. (AUDIT_WATCH_SHARE=1 로 활성화)")
+            return
+        share_watcher = services.get('share_watcher')
+        if (mode or '').lower() == 'rescan':
+            await ctx.send("🔄 캐시된 폴더를 재검색합니다...")
+            changed = await asyncio.to_thread(share_watcher.rescan)
+            services.get('audit_service').searcher.invalidate_paths(changed)
+            await ctx.send(f"✅ 재검색 완료: {len(changed)}개 폴더 갱신")
+
+        status = share_watcher.status()
+        index = status['index']
+        message = (
+            "👀 **공유 폴더 감시 상태**\n"
             "------------------------\n"
-            f"📁 결과 저장: {output_path}"
+            f"감시: {'실행 중' if status['running'] else '중지'} ({status['backend'] or '-'}, watch {status['watches']}개)\n"
+            f"인덱스: 루트 {index['roots']}개, 폴더 {index['cached_dirs']}개, stat {index['cached_stats']}개 "
+            f"(적중 {index['hits']}회, 미스 {index['misses']}회)\n"
+            f"이벤트: {status['events']}개, 갱신한 폴더 {status['refreshed_dirs']}개\n"
+            f"큐 초과: {status['overflows']}회, 재검색 {status['rescans']}회\n"
+            f"마지막 이벤트: {status['last_event'] or '없음'}, 마지막 재검색: {status['last_rescan'] or '없음'}"
         )
-        
-        await ctx.send(report)
-        await send_audit_to_discord(all_results)
-        
+        if status['backend'] == 'polling':
+            message += f"\n폴링 주기: {status['poll_interval']:.0f}초"
+        if status['last_error']:
+            message += f"\n❌ 마지막 오류: {status['last_error']}"
+        await ctx.send(message)
     except Exception as e:
-        await send_audit_status_to_discord(ctx, f"❌ 부서별 감사 중 오류 발생: {str(e)}")
-        logger.error(f"Error in audit_dept: {e}")
+        await ctx.send(f"감시 상태 조회 중 오류 발생: {str(e)}")
+        logger.error(f"Error in watch command: {e}")
+
+@bot.command(name='stats')
+async def stats(ctx):
+    """단계별 성능 지표 요약 (전체 지표는 /metrics)"""
+    try:
+        snapshot = metrics.snapshot()
+        message = "📊 **성능 지표**\n------------------------\n"
+        for name, values in snapshot.items():
+            if not values:
+                continue
+            message += f"**{name}**\n"
+            for labels, value in values.items():
+                if isinstance(value, dict):
+                    p95 = value['p95_le']
+                    p95_text = '∞' if p95 == float('inf') else f"{p95}s"
+                    message += f"  {labels}: {value['count']}회, 평균 {value['avg']}s, p95 ≤ {p95_text}\n"
+                else:
+                    message += f"  {labels}: {value:g}\n"
+
+        cache = snapshot.get('searcher_cache', {})
+        for cache_name in ('dir', 'file'):
+            hits = cache.get(f"{cache_name},hit", 0)
+            total = hits + cache.get(f"{cache_name},miss", 0)
+            if total:
+                message += f"🗃️ {cache_name} 캐시 적중률: {hits / total:.1%} ({int(hits)}/{int(total)})\n"
+
+        if message.count('\n') <= 2:
+            message += "아직 기록된 지표가 없습니다."
+        for chunk in split_message(message):
+            await ctx.send(chunk)
+    except Exception as e:
+        await ctx.send(f"성능 지표 조회 중 오류 발생: {str(e)}")
+        logger.error(f"Error in stats command: {e}")
 
 @bot.command(name='clear_cache')
 async def clear_cache(ctx):
     try:
-        audit_service.searcher.clear_cache()
+        services.get('audit_service').searcher.clear_cache()
         await ctx.send("캐시가 초기화되었습니다.")
         logger.info("Cache cleared successfully")
     except Exception as e:
@@ -515,7 +767,19 @@ async def project(ctx, *, project_id: str = None):
         await ctx.send(f"❌ 오류 발생: {str(e)}")
 
 async def run_bot():
-    await bot.start(TOKEN)
+    if not TOKEN or not CHANNEL_ID:
+        raise RuntimeError("DISCORD_APPLICATION_TOKEN과 DISCORD_CHANNEL_ID를 설정해야 봇을 실행할 수 있습니다.")
+    try:
+        await bot.start(TOKEN)
+    finally:
+        # 종료(Ctrl-C, 재시작, 재배포) 전에 아직 푸시하지 않은 파일을 동기화하고 백그라운드 작업 정리
+        await job_manager.stop()
+        if services.created('share_watcher'):
+            await asyncio.to_thread(services.get('share_watcher').stop)
+        await sync_scheduler.stop(flush=True)
+        if not bot.is_closed():
+            await bot.close()
+        stop_log_queue()
 
 def run_server():
     port = int(os.environ.get('PORT', 5000))
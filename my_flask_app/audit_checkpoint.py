@@ -0,0 +1,125 @@
+# my_flask_app/audit_checkpoint.py
+# 대량 감사의 프로젝트별 완료 기록 (중단 후 재시작 시 이어서 감사)
+
+import os
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+from config import STATIC_PATH
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = os.path.join(STATIC_PATH, 'checkpoints')
+
+# 항목 상태
+DONE = 'done'
+ERROR = 'error'
+
+
+class AuditCheckpoint:
+    """프로젝트 단위 감사 완료 기록
+
+    JSON Lines 파일에 프로젝트 하나가 끝날 때마다 한 줄씩 추가하므로 기록 비용이
+    전체 프로젝트 수와 무관하다. 같은 프로젝트가 여러 번 기록되면 마지막 줄이 우선한다.
+    완료된 프로젝트의 결과는 static/results에 저장된 JSON을 다시 읽어 재사용한다.
+    """
+
+    def __init__(self, name: str, checkpoint_dir: str = CHECKPOINT_DIR):
+        self.name = name
+        self.path = os.path.join(checkpoint_dir, f"{name}.jsonl")
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self._entries[entry['project_id']] = entry
+                except (ValueError, KeyError):
+                    # 기록 도중 중단되어 잘린 마지막 줄은 무시
+                    continue
+        logger.info(f"체크포인트 로드: {self.path} (완료 {self.counts()[DONE]}개, 실패 {self.counts()[ERROR]}개)")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def is_done(self, project_id: str) -> bool:
+        """감사가 성공적으로 끝난 프로젝트인지 (실패한 프로젝트는 재개 시 다시 감사)"""
+        entry = self._entries.get(str(project_id))
+        return bool(entry) and entry['status'] == DONE
+
+    def mark(self, project_id: str, status: str = DONE, result_file: Optional[str] = None,
+             result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        """프로젝트 처리 결과를 한 줄 추가 (즉시 flush)"""
+        entry = {
+            'project_id': str(project_id),
+            'status': status,
+            'result_file': result_file,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        if result is not None and result_file is None:
+            # 결과 파일이 없는 결과(폴더 없음 등)는 체크포인트에 직접 보관
+            entry['result'] = result
+        if error:
+            entry['error'] = error
+        self._entries[entry['project_id']] = entry
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"체크포인트 기록 실패 {self.path}: {str(e)}")
+
+    def mark_saved(self, project_id: str, result: Dict[str, Any]) -> None:
+        """감사 결과 JSON이 실제로 저장된 경우에만 완료로 기록 (저장 실패는 재개 시 다시 감사)"""
+        result_file = result.get('result_file')
+        if result_file:
+            self.mark(project_id, result_file=result_file)
+        else:
+            self.mark(project_id, status=ERROR, error='result not saved')
+
+    def load_result(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """완료된 프로젝트의 저장된 감사 결과 로드"""
+        entry = self._entries.get(str(project_id))
+        if not entry or entry['status'] != DONE:
+            return None
+        if 'result' in entry:
+            return entry['result']
+        result_file = entry.get('result_file')
+        if not result_file or not os.path.exists(result_file):
+            logger.warning(f"저장된 감사 결과를 찾을 수 없습니다: {result_file}")
+            return None
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return data[0] if isinstance(data, list) and data else data
+        except Exception as e:
+            logger.error(f"감사 결과 로드 실패 {result_file}: {str(e)}")
+            return None
+
+    def first_unfinished(self, project_ids: List[str]) -> int:
+        """목록에서 아직 완료되지 않은 첫 프로젝트의 위치"""
+        for index, project_id in enumerate(project_ids):
+            if not self.is_done(project_id):
+                return index
+        return len(project_ids)
+
+    def counts(self) -> Dict[str, int]:
+        counts = {DONE: 0, ERROR: 0}
+        for entry in self._entries.values():
+            counts[entry['status']] = counts.get(entry['status'], 0) + 1
+        return counts
+
+    def clear(self) -> None:
+        """체크포인트 삭제 (전체 감사가 끝났거나 처음부터 다시 시작할 때)"""
+        self._entries.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+            logger.info(f"체크포인트 삭제: {self.path}")
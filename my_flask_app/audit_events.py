@@ -0,0 +1,145 @@
+# my_flask_app/audit_events.py
+# 감사 진행 이벤트 버스 (SSE 스트리밍용)
+
+import re
+import json
+import time
+import asyncio
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, Optional, List, Iterator, AsyncIterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 보관할 최근 이벤트 수 (재연결한 클라이언트가 놓친 이벤트를 이 범위 안에서 다시 받음)
+EVENT_BUFFER_SIZE = 2000
+HEARTBEAT_INTERVAL = 15.0
+
+
+class AuditEventBus:
+    """감사 이벤트를 고정 크기 링 버퍼에 기록하고 구독자에게 전달
+
+    구독자마다 큐를 두지 않고 공유 버퍼에서 각자의 위치(마지막 이벤트 ID)부터 읽으므로
+    느린 클라이언트가 있어도 메모리가 늘지 않는다. 버퍼에서 밀려난 이벤트를 놓친
+    구독자에게는 'reset' 이벤트를 보내 전체 데이터를 다시 조회하도록 한다.
+    이벤트 ID는 '<시작시각>-<순번>' 형식이라 서버가 재시작되면 이전 ID로는 이어받지 않는다.
+    """
+
+    def __init__(self, buffer_size: int = EVENT_BUFFER_SIZE):
+        self.epoch = format(int(time.time()), 'x')
+        self._events = deque(maxlen=buffer_size)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+
+    def publish(self, event: str, **data: Any) -> Dict[str, Any]:
+        """이벤트 기록 (어느 스레드/루프에서 호출해도 됨, 블로킹 없음)"""
+        with self._cond:
+            self._seq += 1
+            item = {
+                'id': f"{self.epoch}-{self._seq}",
+                'seq': self._seq,
+                'event': event,
+                'data': {**data, 'time': time.strftime('%Y-%m-%d %H:%M:%S')}
+            }
+            self._events.append(item)
+            self._cond.notify_all()
+            waiters = list(self._waiters)
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(wakeup.set)
+            except RuntimeError:
+                # 이미 닫힌 루프의 구독자
+                pass
+        return item
+
+    def _parse_last_id(self, last_event_id: Optional[str]) -> Tuple[int, bool]:
+        """Last-Event-ID를 (순번, 다른 실행의 ID 여부)로 변환
+
+        없으면 (0, False) = 버퍼 처음부터, 이전 실행의 ID거나 해석할 수 없으면 (0, True) = reset 후 버퍼 처음부터.
+        현재 순번보다 큰 ID는 현재 순번으로 맞춘다 (대기 루프가 바로 깨어나 CPU를 점유하지 않도록).
+        """
+        if not last_event_id:
+            return 0, False
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return 0, True
+        with self._cond:
+            return min(int(seq), self._seq), False
+
+    def _since(self, seq: int) -> Tuple[List[Dict[str, Any]], bool]:
+        """seq 이후의 이벤트와, 버퍼에서 밀려나 놓친 이벤트가 있는지 여부"""
+        with self._cond:
+            events = [item for item in self._events if item['seq'] > seq]
+            oldest = self._events[0]['seq'] if self._events else self._seq + 1
+            missed = seq > 0 and seq + 1 < oldest
+        return events, missed
+
+    def _reset_event(self) -> Dict[str, Any]:
+        return {'id': None, 'seq': None, 'event': 'reset',
+                'data': {'reason': '놓친 이벤트가 버퍼 범위를 벗어났습니다. 보고서를 다시 조회하세요.'}}
+
+    async def subscribe(self, last_event_id: Optional[str] = None) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """asyncio 구독 (이벤트가 없으면 HEARTBEAT_INTERVAL마다 None을 내보냄)"""
+        seq, foreign = self._parse_last_id(last_event_id)
+        if foreign:
+            yield self._reset_event()
+        wakeup = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), wakeup)
+        with self._cond:
+            self._waiters.append(waiter)
+        try:
+            while True:
+                wakeup.clear()
+                events, missed = self._since(seq)
+                if missed:
+                    yield self._reset_event()
+                for item in events:
+                    seq = item['seq']
+                    yield item
+                if not events:
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), timeout=HEARTBEAT_INTERVAL)
+                    except asyncio.TimeoutError:
+                        yield None
+        finally:
+            with self._cond:
+                self._waiters.remove(waiter)
+
+    def iter_blocking(self, last_event_id: Optional[str] = None) -> Iterator[Optional[Dict[str, Any]]]:
+        """스레드 기반 서버(Flask)용 구독"""
+        seq, foreign = self._parse_last_id(last_event_id)
+        if foreign:
+            yield self._reset_event()
+        while True:
+            events, missed = self._since(seq)
+            if missed:
+                yield self._reset_event()
+            for item in events:
+                seq = item['seq']
+                yield item
+            if not events:
+                with self._cond:
+                    notified = self._cond.wait_for(lambda: self._seq > seq, timeout=HEARTBEAT_INTERVAL)
+                if not notified:
+                    yield None
+
+
+def format_sse(item: Optional[Dict[str, Any]], project_id: Optional[str] = None) -> Optional[str]:
+    """SSE 프레임 문자열 (None이면 연결 유지용 주석, 다른 프로젝트 이벤트면 None)"""
+    if item is None:
+        return ': keep-alive\n\n'
+    if project_id and item['event'] != 'reset':
+        # 영문 접두어 유무와 관계없이 숫자 ID로 비교
+        if re.sub(r'[^0-9]', '', str(item['data'].get('project_id', ''))) != re.sub(r'[^0-9]', '', project_id):
+            return None
+    frame = ''
+    if item['id']:
+        frame += f"id: {item['id']}\n"
+    frame += f"event: {item['event']}\ndata: {json.dumps(item['data'], ensure_ascii=False)}\n\n"
+    return frame
+
+
+# 프로세스 공용 이벤트 버스 (AuditService가 기록, API 서버가 스트리밍)
+audit_events = AuditEventBus()
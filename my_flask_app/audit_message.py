@@ -1,10 +1,10 @@
 # my_flask_app/audit_message.py
 
-import discord
-import aiohttp
+import asyncio
 from datetime import datetime
 from config import DISCORD_WEBHOOK_URL
 from config_assets import DOCUMENT_TYPES
+from discord_notifier import WebhookTransport
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,125 +12,142 @@ logger = logging.getLogger(__name__)
 async def send_audit_status_to_discord(ctx, message):
     """디스코드 채널에 감사 상태 메시지 전송"""
     try:
-        if ctx and ctx.channel:
+        # ctx(명령 컨텍스트) 또는 채널 객체 모두 send()를 지원
+        if ctx:
             await ctx.send(message)
             logger.info(f"Sent audit status to Discord channel: {message}")
     except Exception as e:
         logger.error(f"Error sending audit status to Discord channel: {str(e)}")
 
-async def send_audit_to_discord(data):
-    """디스코드 웹훅으로 감사 결과 전송"""
-    if not DISCORD_WEBHOOK_URL:
+# Discord 웹훅 embed 제한
+WEBHOOK_MAX_EMBEDS = 10          # 메시지당 embed 수
+WEBHOOK_MAX_EMBED_CHARS = 6000   # 메시지당 embed 전체 글자 수
+EMBED_DESCRIPTION_LIMIT = 4096
+EMBED_FIELD_LIMIT = 1024
+
+def _truncate(text, limit):
+    text = str(text)
+    return text if len(text) <= limit else text[:limit - 3] + '...'
+
+def build_audit_embed(item):
+    """감사 결과(또는 오류) 하나를 Discord embed로 변환"""
+    timestamp = item.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+    department = item.get('department', item.get('department_code', 'Unknown'))
+
+    if 'error' in item:
+        return {
+            'title': f"❌ Audit Error: {item.get('project_id', 'Unknown')}",
+            'color': 0xE74C3C,
+            'fields': [
+                {'name': 'Department', 'value': _truncate(department, EMBED_FIELD_LIMIT), 'inline': True},
+                {'name': 'Status', 'value': _truncate(item.get('status', 'Unknown'), EMBED_FIELD_LIMIT), 'inline': True},
+                {'name': 'Contractor', 'value': _truncate(item.get('contractor', 'Unknown'), EMBED_FIELD_LIMIT), 'inline': True},
+                {'name': 'Error', 'value': _truncate(item['error'], EMBED_FIELD_LIMIT), 'inline': False},
+            ],
+            'footer': {'text': f"⏰ {timestamp}"}
+        }
+
+    found_docs = []
+    missing_docs = []
+    for doc_type, doc_info in item.get('documents', {}).items():
+        doc_name = DOCUMENT_TYPES.get(doc_type, {}).get('name', doc_type)
+        if doc_info.get('exists', False):
+            found_docs.append(f"{doc_name} ({len(doc_info.get('details', []))}개)")
+        else:
+            missing_docs.append(f"{doc_name} (0개)")
+
+    project_name = item.get('project_name') or f"Project {item.get('project_id', 'Unknown')}"
+    description = f"Path: {item.get('project_path', 'Unknown')}"
+    if item.get('ai_analysis'):
+        description += f"\n\n🤖 AI Analysis:\n{item['ai_analysis']}"
+
+    return _fit_embed({
+        'title': _truncate(f"📋 {item.get('project_id', 'Unknown')} {project_name}", 256),
+        'description': _truncate(description, EMBED_DESCRIPTION_LIMIT),
+        'color': 0xE67E22 if missing_docs else 0x2ECC71,
+        'fields': [
+            {'name': 'Department', 'value': _truncate(department, EMBED_FIELD_LIMIT), 'inline': True},
+            {'name': 'Status', 'value': _truncate(item.get('status', 'Unknown'), EMBED_FIELD_LIMIT), 'inline': True},
+            {'name': 'Contractor', 'value': _truncate(item.get('contractor', 'Unknown'), EMBED_FIELD_LIMIT), 'inline': True},
+            {'name': '✅ Found', 'value': _truncate('\n'.join(found_docs) or '-', EMBED_FIELD_LIMIT), 'inline': False},
+            {'name': '❌ Missing', 'value': _truncate('\n'.join(missing_docs) or '-', EMBED_FIELD_LIMIT), 'inline': False},
+        ],
+        'footer': {'text': f"⏰ {timestamp}"}
+    })
+
+def _fit_embed(embed, max_chars=WEBHOOK_MAX_EMBED_CHARS):
+    """embed 하나의 글자 수가 제한을 넘으면 설명, 그다음 긴 필드 순으로 줄임 (혼자 보내도 400이 나지 않도록)"""
+    excess = _embed_length(embed) - max_chars
+    if excess <= 0:
+        return embed
+    description = embed.get('description', '')
+    if description:
+        embed['description'] = _truncate(description, max(3, len(description) - excess))
+        excess = _embed_length(embed) - max_chars
+    for field in sorted(embed.get('fields', []), key=lambda f: len(f['value']), reverse=True):
+        if excess <= 0:
+            break
+        value = field['value']
+        field['value'] = _truncate(value, max(3, len(value) - excess))
+        excess = _embed_length(embed) - max_chars
+    return embed
+
+def _embed_length(embed):
+    """Discord가 제한을 계산하는 방식대로 embed 글자 수 합산"""
+    length = len(embed.get('title', '')) + len(embed.get('description', ''))
+    length += len(embed.get('footer', {}).get('text', ''))
+    for field in embed.get('fields', []):
+        length += len(field['name']) + len(field['value'])
+    return length
+
+def pack_embeds(embeds, max_embeds=WEBHOOK_MAX_EMBEDS, max_chars=WEBHOOK_MAX_EMBED_CHARS):
+    """embed 목록을 메시지당 개수/글자 수 제한에 맞게 묶음"""
+    batches = []
+    current, current_chars = [], 0
+    for embed in embeds:
+        length = _embed_length(embed)
+        if current and (len(current) >= max_embeds or current_chars + length > max_chars):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(embed)
+        current_chars += length
+    if current:
+        batches.append(current)
+    return batches
+
+async def send_audit_to_discord(data, concurrency=4, max_retries=3, webhook_url=None):
+    """디스코드 웹훅으로 감사 결과 전송 (embed로 묶어서 병렬 전송)
+
+    반환값: {'delivered': 전송 성공 프로젝트 수, 'failed': 실패 수, 'messages': 전송 메시지 수}
+    """
+    webhook_url = webhook_url or DISCORD_WEBHOOK_URL
+    items = data if isinstance(data, list) else [data]
+    stats = {'delivered': 0, 'failed': 0, 'messages': 0}
+    if not webhook_url:
         logger.warning("DISCORD_WEBHOOK_URL is not configured, skipping webhook send.")
-        return
+        stats['failed'] = len(items)
+        return stats
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            if isinstance(data, list):
-                for item in data:
-                    if 'error' not in item:
-                        project_name = item.get('project_name') or f"Project {item.get('project_id', 'Unknown')}"
-                        message = (
-                            f"📋 **Project Audit Result**\n"
-                            f"ID: {item.get('project_id', 'Unknown')}\n"
-                            f"Department: {item.get('department', item.get('department_code', 'Unknown'))}\n"
-                            f"Name: {project_name}\n"
-                            f"Status: {item.get('status', 'Unknown')}\n"  # Status 추가
-                            f"Contractor: {item.get('contractor', 'Unknown')}\n"  # Contractor 추가
-                            f"Path: {item.get('project_path', 'Unknown')}\n\n"
-                            f"📑 Documents:\n"
-                        )
-
-                        found_docs = []
-                        missing_docs = []
-                        documents = item.get('documents', {})
-                        for doc_type in documents.keys():
-                            doc_name = DOCUMENT_TYPES.get(doc_type, {}).get('name', doc_type)  # DOC_TYPES → DOCUMENT_TYPES 수정
-                            doc_info = documents.get(doc_type, {'exists': False, 'details': []})
-                            if doc_info.get('exists', False):
-                                count = len(doc_info.get('details', []))
-                                found_docs.append(f"{doc_name} ({count}개)")
-                            else:
-                                missing_docs.append(f"{doc_name} (0개)")
-
-                        if found_docs:
-                            message += "✅ Found:\n- " + "\n- ".join(found_docs) + "\n\n"
-                        if missing_docs:
-                            message += "❌ Missing:\n- " + "\n- ".join(missing_docs) + "\n\n"
-
-                        if 'ai_analysis' in item and item['ai_analysis']:
-                            message += f"🤖 AI Analysis:\n{item['ai_analysis']}"
-
-                        message += f"\n⏰ {item.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
-                        async with session.post(DISCORD_WEBHOOK_URL, json={'content': message}, timeout=10) as response:
-                            if response.status != 204:
-                                logger.warning(f"Webhook response status: {response.status}")
-                                print(f"Failed to send audit result to Discord webhook: {message}")
-                    else:
-                        message = (
-                            f"❌ **Audit Error**\n"
-                            f"Project ID: {item.get('project_id', 'Unknown')}\n"
-                            f"Department: {item.get('department', item.get('department_code', 'Unknown'))}\n"
-                            f"Error: {item['error']}\n"
-                            f"⏰ {item.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
-                        )
-                        async with session.post(DISCORD_WEBHOOK_URL, json={'content': message}, timeout=10) as response:
-                            if response.status != 204:
-                                logger.warning(f"Webhook response status: {response.status}")
-                                print(f"Failed to send audit error to Discord webhook: {message}")
-            else:
-                if 'error' not in data:
-                    project_name = data.get('project_name') or f"Project {data.get('project_id', 'Unknown')}"
-                    message = (
-                        f"📋 **Project Audit Result**\n"
-                        f"ID: {data.get('project_id', 'Unknown')}\n"
-                        f"Department: {data.get('department', data.get('department_code', 'Unknown'))}\n"
-                        f"Name: {project_name}\n"
-                        f"Status: {data.get('status', 'Unknown')}\n"  # Status 추가
-                        f"Contractor: {data.get('contractor', 'Unknown')}\n"  # Contractor 추가
-                        f"Path: {data.get('project_path', 'Unknown')}\n\n"
-                        f"📑 Documents:\n"
-                    )
-
-                    found_docs = []
-                    missing_docs = []
-                    documents = data.get('documents', {})
-                    for doc_type in documents.keys():
-                        doc_name = DOCUMENT_TYPES.get(doc_type, {}).get('name', doc_type)  # DOC_TYPES → DOCUMENT_TYPES 수정
-                        doc_info = documents.get(doc_type, {'exists': False, 'details': []})
-                        if doc_info.get('exists', False):
-                            count = len(doc_info.get('details', []))
-                            found_docs.append(f"{doc_name} ({count}개)")
-                        else:
-                            missing_docs.append(f"{doc_name} (0개)")
-
-                    if found_docs:
-                        message += "✅ Found:\n- " + "\n- ".join(found_docs) + "\n\n"
-                    if missing_docs:
-                        message += "❌ Missing:\n- " + "\n- ".join(missing_docs) + "\n\n"
-
-                    if 'ai_analysis' in data and data['ai_analysis']:
-                        message += f"🤖 AI Analysis:\n{data['ai_analysis']}"
-
-                    message += f"\n⏰ {data.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
-                    async with session.post(DISCORD_WEBHOOK_URL, json={'content': message}, timeout=10) as response:
-                        if response.status != 204:
-                            logger.warning(f"Webhook response status: {response.status}")
-                            print(f"Failed to send audit result to Discord webhook: {message}")
-                else:
-                    message = (
-                        f"❌ **Audit Error**\n"
-                        f"Project ID: {data.get('project_id', 'Unknown')}\n"
-                        f"Department: {data.get('department', data.get('department_code', 'Unknown'))}\n"
-                        f"Status: {data.get('status', 'Unknown')}\n"  # Status 추가
-                        f"Contractor: {data.get('contractor', 'Unknown')}\n"  # Contractor 추가
-                        f"Error: {data['error']}\n"
-                        f"⏰ {data.get('timestamp', datetime.now().strftime('%Y-%m-%d %H:%M:%S'))}"
-                    )
-                    async with session.post(DISCORD_WEBHOOK_URL, json={'content': message}, timeout=10) as response:
-                        if response.status != 204:
-                            logger.warning(f"Webhook response status: {response.status}")
-                            print(f"Failed to send audit error to Discord webhook: {message}")
+    batches = pack_embeds([build_audit_embed(item) for item in items if item])
+    transport = WebhookTransport(webhook_url, max_retries=max_retries)
+    semaphore = asyncio.Semaphore(concurrency)
 
+    async def deliver(batch):
+        async with semaphore:
+            response = await transport.post({'embeds': batch})
+        if response is None:
+            stats['failed'] += len(batch)
+            logger.warning(f"Failed to send {len(batch)} audit results to Discord webhook")
+        else:
+            stats['delivered'] += len(batch)
+            stats['messages'] += 1
+
+    try:
+        await asyncio.gather(*(deliver(batch) for batch in batches))
     except Exception as e:
-        logger.error(f"Error sending audit to Discord webhook: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error sending audit to Discord webhook: {str(e)}")
+    finally:
+        await transport.close()
+
+    logger.info(f"Discord webhook delivery: {stats['delivered']} delivered, {stats['failed']} failed ({stats['messages']} messages)")
+    return stats
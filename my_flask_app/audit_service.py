@@ -11,33 +11,50 @@ from typing import List, Dict, Any, Optional
 import aiohttp
 import asyncio
 from config import (
-    STATIC_DATA_PATH, CONTRACT_STATUS_CSV, NETWORK_BASE_PATH, RESULTS_DIR,
-    DISCORD_WEBHOOK_URL, TAVILY_API_KEY
+    STATIC_DATA_PATH, CONTRACT_STATUS_CSV, RESULTS_DIR,
+    DISCORD_WEBHOOK_URL, get_network_drive, report_network_drive_failure
 )
 from config_assets import (
     DOCUMENT_TYPES, DEPARTMENT_MAPPING, DEPARTMENT_NAMES
 )
 from search_project_data import ProjectDocumentSearcher
-from tavily import TavilyClient
+from audit_checkpoint import AuditCheckpoint
+from audit_events import audit_events
+from folder_fingerprint import compute_folder_fingerprint, fingerprint_matches, FINGERPRINT_MAX_DEPTH
+from services import services
+from metrics import (
+    DIR_SCAN_SECONDS, CSV_LOAD_SECONDS, AI_CALL_SECONDS, DISCORD_SEND_SECONDS,
+    AUDIT_STAGE_SECONDS, AUDITS, timed
+)
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class AuditService:
-    def __init__(self):
-        self.searcher = ProjectDocumentSearcher(verbose=False)
+    def __init__(self, fs=None):
+        # 프로젝트 폴더 조회에 사용할 파일 시스템 (기본: services의 공용 파일 시스템)
+        self.fs = fs if fs is not None else services.get('filesystem')
+        self.searcher = ProjectDocumentSearcher(verbose=False, fs=self.fs)
         self._session = None
-        self.tavily_client = TavilyClient(api_key=TAVILY_API_KEY)
+        self._contract_cache = None  # (파일 mtime, DataFrame)
+        self.events = audit_events  # 진행 이벤트 (SSE로 스트리밍)
+
+    @property
+    def tavily_client(self):
+        """Tavily 클라이언트 (AI 분석을 처음 요청할 때 생성)"""
+        return services.get('tavily_client')
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """aiohttp 세션 생성"""
         return aiohttp.ClientSession()
 
     def load_contract_data(self) -> pd.DataFrame:
-        """contract_status.csv에서 프로젝트 정보를 로드"""
+        """contract_status.csv에서 프로젝트 정보를 로드 (파일이 바뀌지 않았으면 캐시 사용)"""
         try:
-            df = pd.read_csv(CONTRACT_STATUS_CSV, encoding='utf-8-sig')
+            mtime = os.path.getmtime(CONTRACT_STATUS_CSV)
+            if self._contract_cache is not None and self._contract_cache[0] == mtime:
+                return self._contract_cache[1]
+            with CSV_LOAD_SECONDS.time(file='contract_status'):
+                df = pd.read_csv(CONTRACT_STATUS_CSV, encoding='utf-8-sig')
             if '사업코드' not in df.columns or 'PM부서' not in df.columns or '진행상태' not in df.columns or '사업명' not in df.columns or '주관사' not in df.columns:
                 raise ValueError("CSV must contain '사업코드', 'PM부서', '진행상태', '사업명', and '주관사' columns")
 
@@ -45,24 +62,66 @@ class AuditService:
                 dept_name = pm_dept.strip()
                 dept_code = DEPARTMENT_MAPPING.get(dept_name, '99999')
                 if dept_code == '99999':
-                    logger.warning(f"Unknown department: {dept_name}, mapped to default code '99999'. Please update DEPARTMENT_MAPPING.")
-                logger.debug(f"Mapping department: {dept_name} -> {dept_code}")
+                    logger.warning("Unknown department: %s, mapped to default code '99999'. Please update DEPARTMENT_MAPPING.", dept_name)
+                logger.debug("Mapping department: %s -> %s", dept_name, dept_code)
                 return dept_code
 
             df['ProjectID'] = df['사업코드'].apply(lambda x: str(x))
             df['Depart_Code'] = df['PM부서'].apply(map_department)
             df['Depart'] = df['Depart_Code'].map(DEPARTMENT_NAMES).fillna(df['PM부서'])
-            logger.debug(f"Loaded contract data: {df[['ProjectID', 'Depart_Code', 'Depart']].to_dict(orient='records')}")
+            if logger.isEnabledFor(logging.DEBUG):
+                # 전체 계약 목록을 dict로 바꾸는 비용이 크므로 DEBUG일 때만 변환
+                logger.debug("Loaded contract data: %s", df[['ProjectID', 'Depart_Code', 'Depart']].to_dict(orient='records'))
             df['Contractor'] = df['주관사'].apply(lambda x: '주관사' if x == '주관사' else '비주관사')
-            return df[['ProjectID', 'Depart_Code', 'Depart', '진행상태', '사업명', 'Contractor']]
+            df = df[['ProjectID', 'Depart_Code', 'Depart', '진행상태', '사업명', 'Contractor']]
+            self._contract_cache = (mtime, df)
+            return df
         except Exception as e:
-            logger.error(f"Failed to load contract data from {CONTRACT_STATUS_CSV}: {str(e)}")
+            logger.error("Failed to load contract data from %s: %s", CONTRACT_STATUS_CSV, e)
             return pd.DataFrame()
 
+    def _scan_project_folder(self, dept_code: str, numeric_project_id: str):
+        """프로젝트 폴더의 문서 종류별 파일 목록과 지문 (네트워크 드라이브 I/O, 워커 스레드에서 실행)"""
+        search_folder = None
+        fingerprint = None
+        processed_documents = {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES}
+
+        base_path = get_network_drive()
+        for attempt in range(2):
+            project_path = os.path.join(base_path, f"{dept_code}_{numeric_project_id}")
+            try:
+                # exists()는 OSError를 삼켜 끊긴 드라이브도 '폴더 없음'으로 보이므로 stat으로 구분
+                try:
+                    self.fs.stat(project_path)
+                except FileNotFoundError:
+                    # 드라이브 루트도 확인 (Windows는 끊긴 드라이브도 FileNotFoundError), 루트가 없으면 아래 OSError 처리로 장애 전환
+                    self.fs.stat(base_path)
+                    return search_folder, processed_documents, fingerprint
+                search_folder = project_path
+                # 지문을 먼저 계산: 목록을 읽는 중 파일이 바뀌면 지문이 결과보다 오래된 상태가 되어 다음 실행에서 다시 검색됨
+                fingerprint = compute_folder_fingerprint(project_path, fs=self.fs)
+                for doc_type in DOCUMENT_TYPES:
+                    doc_path = os.path.join(project_path, doc_type)
+                    if self.fs.exists(doc_path):
+                        processed_documents[doc_type]['exists'] = True
+                        processed_documents[doc_type]['details'] = [f for f in self.fs.listdir(doc_path) if self.fs.isfile(os.path.join(doc_path, f))]
+                return search_folder, processed_documents, fingerprint
+            except OSError as e:
+                # 스캔 중 공유 폴더 연결이 끊기면 다른 드라이브로 전환하여 한 번 더 시도
+                report_network_drive_failure(base_path)
+                failover_path = get_network_drive()
+                if attempt or failover_path == base_path:
+                    raise
+                logger.warning("드라이브 %s 오류로 %s에서 다시 검색합니다: %s", base_path, failover_path, e)
+                base_path = failover_path
+                search_folder = fingerprint = None
+                processed_documents = {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES}
+        return search_folder, processed_documents, fingerprint
+
     async def search_projects_by_id(self, project_id: str) -> List[Dict[str, Any]]:
         """프로젝트 ID로 프로젝트 검색"""
         projects = []
-        contract_df = self.load_contract_data()
+        contract_df = await asyncio.to_thread(self.load_contract_data)
         numeric_project_id = re.sub(r'[^0-9]', '', str(project_id))
         contract_match = contract_df[contract_df['ProjectID'].str.replace(r'[^0-9]', '', regex=True) == numeric_project_id]
 
@@ -74,21 +133,13 @@ class AuditService:
             project_name = row['사업명']
             status = row['진행상태']
             contractor = row['Contractor']
-            search_folder = None
-            processed_documents = {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES}
-
-            for base_path in [NETWORK_BASE_PATH]:
-                project_path = os.path.join(base_path, f"{dept_code}_{numeric_project_id}")
-                if os.path.exists(project_path):
-                    search_folder = project_path
-                    for doc_type in DOCUMENT_TYPES:
-                        doc_path = os.path.join(project_path, doc_type)
-                        if os.path.exists(doc_path):
-                            processed_documents[doc_type]['exists'] = True
-                            processed_documents[doc_type]['details'] = [f for f in os.listdir(doc_path) if os.path.isfile(os.path.join(doc_path, f))]
-                    break
-
-            logger.info(f"=== 프로젝트 {project_id} 검색 시작 (부서: {dept_code}_{dept_name}) ===")
+            # 폴더 검색은 블로킹 I/O이므로 이벤트 루프(봇, ASGI 서버)를 막지 않도록 스레드에서 실행
+            with DIR_SCAN_SECONDS.time(source='project_folder'):
+                search_folder, processed_documents, fingerprint = await asyncio.to_thread(
+                    self._scan_project_folder, dept_code, numeric_project_id
+                )
+
+            logger.info("=== 프로젝트 %s 검색 시작 (부서: %s_%s) ===", project_id, dept_code, dept_name)
             projects.append({
                 'project_id': original_project_id,
                 'department_code': dept_code,
@@ -98,27 +149,93 @@ class AuditService:
                 'original_folder': search_folder,
                 'status': status,
                 'contractor': contractor,
-                'documents': processed_documents
+                'documents': processed_documents,
+                'fingerprint': fingerprint
             })
         return projects
 
-    async def save_audit_result(self, result: Dict[str, Any]) -> None:
-        """감사 결과를 저장"""
-        try:
-            project_id = result.get('project_id')
-            department = result.get('department', 'Unknown_Unknown')
-            department_code = department.split('_')[0] if '_' in department else 'Unknown'
+    def get_result_file(self, result: Dict[str, Any]) -> str:
+        """감사 결과 JSON 파일 경로 (static/results/<부서>/audit_<프로젝트ID>.json)"""
+        department = result.get('department', 'Unknown_Unknown')
+        return os.path.join(RESULTS_DIR, department, f"audit_{result.get('project_id')}.json")
 
-            result_folder = os.path.join(RESULTS_DIR, department)
-            os.makedirs(result_folder, exist_ok=True)
+    async def save_audit_result(self, result: Dict[str, Any]) -> Optional[str]:
+        """감사 결과를 저장하고 저장된 파일 경로 반환 (실패하면 None)
 
-            result_file = os.path.join(result_folder, f"audit_{project_id}.json")
-            with open(result_file, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=4)
-
-            logger.info(f"✅ 감사 결과 저장 완료: {result_file}")
+        임시 파일에 쓴 뒤 교체하여 중간에 중단되어도 잘린 JSON이 남지 않도록 한다.
+        """
+        try:
+            result_file = self.get_result_file(result)
+            os.makedirs(os.path.dirname(result_file), exist_ok=True)
+            tmp_path = f"{result_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({key: value for key, value in result.items() if key != 'result_file'}, f, ensure_ascii=False, indent=4)
+            os.replace(tmp_path, result_file)
+
+            logger.info("✅ 감사 결과 저장 완료: %s", result_file)
+            return result_file
+        except Exception as e:
+            logger.error("감사 결과 저장 실패: %s", e)
+            return None
+
+    async def _save_with_timings(self, result: Dict[str, Any], ai_analysis: Optional[str], start_time: float, search_time: float, ai_time: float) -> Optional[str]:
+        """AI 분석 결과와 단계별 시간을 채운 뒤 감사 결과 저장 (저장된 파일 경로 반환)
+
+        skip_unchanged와 --resume은 저장된 JSON을 다시 읽어 사용하므로 저장 전에 채워야 한다.
+        저장에 걸린 시간은 저장 후 메모리의 결과에만 반영된다.
+        """
+        result['ai_analysis'] = ai_analysis
+        result['performance'] = {
+            'total_time': time.time() - start_time,
+            'search_time': search_time,
+            'ai_time': ai_time,
+            'save_time': 0
+        }
+        save_start = time.time()
+        result_file = await self.save_audit_result(result)
+        # 체크포인트는 실제로 저장된 경우에만 완료로 기록 (저장 실패 시 None)
+        result['result_file'] = result_file
+        result['performance']['save_time'] = time.time() - save_start
+        result['performance']['total_time'] = time.time() - start_time
+        return result_file
+
+    async def load_unchanged_result(self, project_id: str, use_ai: bool = False) -> Optional[Dict[str, Any]]:
+        """프로젝트 폴더 지문이 저장된 감사 결과의 지문과 같으면 저장된 결과 반환 (다르면 None)"""
+        contract_df = await asyncio.to_thread(self.load_contract_data)
+        if contract_df.empty:
+            return None
+        numeric_project_id = re.sub(r'[^0-9]', '', str(project_id))
+        contract_match = contract_df[contract_df['ProjectID'].str.replace(r'[^0-9]', '', regex=True) == numeric_project_id]
+        if contract_match.empty:
+            return None
+
+        row = contract_match.iloc[0]
+        result_file = self.get_result_file({
+            'project_id': row['ProjectID'],
+            'department': f"{row['Depart_Code']}_{row['Depart']}"
+        })
+        if not os.path.exists(result_file):
+            return None
+        try:
+            with open(result_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
         except Exception as e:
-            logger.error(f"감사 결과 저장 실패: {str(e)}")
+            logger.warning("저장된 감사 결과를 읽을 수 없습니다 %s: %s", result_file, e)
+            return None
+
+        saved_fingerprint = saved.get('fingerprint')
+        if not saved_fingerprint or (use_ai and not saved.get('ai_analysis')):
+            return None
+        # 드라이브 상태 확인이 만료되면 probe_timeout까지 멈출 수 있으므로 워커 스레드에서 조회
+        network_drive = await asyncio.to_thread(get_network_drive)
+        project_path = os.path.join(network_drive, f"{row['Depart_Code']}_{numeric_project_id}")
+        current = await asyncio.to_thread(
+            compute_folder_fingerprint, project_path, saved_fingerprint.get('max_depth', FINGERPRINT_MAX_DEPTH), self.fs
+        )
+        if not fingerprint_matches(saved_fingerprint, current):
+            logger.debug("프로젝트 %s 폴더 변경 감지: %s -> %s", project_id, saved_fingerprint.get('hash'), current and current.get('hash'))
+            return None
+        return saved
 
     async def _send_single_to_discord(self, message: str) -> None:
         """Discord로 메시지 전송"""
@@ -126,35 +243,85 @@ class AuditService:
             logger.warning("Discord Webhook URL이 설정되지 않았습니다.")
             return
 
+        start = time.perf_counter()
+        outcome = 'error'
         async with aiohttp.ClientSession() as session:
             try:
                 payload = {"content": message}
                 async with session.post(DISCORD_WEBHOOK_URL, json=payload) as response:
                     if response.status != 204:
-                        logger.error(f"Discord 메시지 전송 실패: {response.status}")
+                        logger.error("Discord 메시지 전송 실패: %s", response.status)
+                    else:
+                        outcome = 'ok'
             except Exception as e:
-                logger.error(f"Discord 메시지 전송 중 오류: {str(e)}")
-
-    async def audit_project(self, project_id: str, department_code: Optional[str] = None, use_ai: bool = False, ctx: Optional[Any] = None) -> Dict[str, Any]:
-        """단일 프로젝트 감사"""
+                logger.error("Discord 메시지 전송 중 오류: %s", e)
+        DISCORD_SEND_SECONDS.observe(time.perf_counter() - start, transport='webhook', outcome=outcome)
+
+    async def _send_status(self, message: str, ctx: Optional[Any] = None, notifier: Optional[Any] = None) -> None:
+        """진행 알림기가 있으면 버퍼링, 없으면 ctx가 있을 때만 웹훅으로 바로 전송"""
+        if notifier is not None:
+            notifier.notify(message)
+        elif ctx:
+            await self._send_single_to_discord(message)
+
+    def _observe_performance(self, performance: Dict[str, float]) -> None:
+        """감사 단계별 시간을 지표로 기록 (total_time -> stage="total")"""
+        for key, seconds in performance.items():
+            AUDIT_STAGE_SECONDS.observe(seconds, stage=key[:-len('_time')] if key.endswith('_time') else key)
+        AUDITS.inc(outcome='ok')
+
+    def _publish_documents(self, project_id: str, result: Dict[str, Any]) -> None:
+        """문서 종류별 검색 결과 이벤트"""
+        self.events.publish(
+            'documents_found',
+            project_id=project_id,
+            project_name=result.get('project_name'),
+            department=result.get('department'),
+            project_path=result.get('project_path'),
+            documents={doc_type: len(info['details']) if info['exists'] else 0 for doc_type, info in result['documents'].items()}
+        )
+
+    def _publish_finished(self, project_id: str, result: Dict[str, Any]) -> None:
+        self.events.publish(
+            'audit_finished',
+            project_id=project_id,
+            project_name=result.get('project_name'),
+            department=result.get('department'),
+            performance=result.get('performance'),
+            skipped_unchanged=bool(result.get('skipped_unchanged'))
+        )
+
+    async def audit_project(self, project_id: str, department_code: Optional[str] = None, use_ai: bool = False, ctx: Optional[Any] = None, notifier: Optional[Any] = None, skip_unchanged: bool = False) -> Dict[str, Any]:
+        """단일 프로젝트 감사 (skip_unchanged=True면 폴더가 바뀌지 않은 경우 저장된 결과 반환)"""
         start_time = time.time()
+        self.events.publish('audit_started', project_id=project_id, use_ai=use_ai)
         try:
-            logger.info(f"\n=== 프로젝트 {project_id} (ID: {re.sub(r'[^0-9]', '', str(project_id))}) 감사 시작 ===")
-            if ctx:
-                await self._send_single_to_discord(f"🔍 프로젝트 {project_id} 감사를 시작합니다...")
+            if skip_unchanged:
+                saved = await self.load_unchanged_result(project_id, use_ai=use_ai)
+                if saved is not None:
+                    await self._send_status(f"⏭️ 프로젝트 {project_id} 폴더 변경 없음, 저장된 결과 사용 ({saved.get('timestamp', '시간정보 없음')})", ctx, notifier)
+                    logger.info("프로젝트 %s 폴더 변경 없음 (%.2f초), 저장된 결과 사용", project_id, time.time() - start_time)
+                    result = {**saved, 'skipped_unchanged': True, 'result_file': self.get_result_file(saved)}
+                    AUDITS.inc(outcome='unchanged')
+                    self._publish_finished(project_id, result)
+                    return result
+
+            logger.info("\n=== 프로젝트 %s (ID: %s) 감사 시작 ===", project_id, re.sub(r'[^0-9]', '', str(project_id)))
+            await self._send_status(f"🔍 프로젝트 {project_id} 감사를 시작합니다...", ctx, notifier)
 
             # audit_targets_new.csv에서 원래 ProjectID 가져오기
             csv_path = os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv')
             original_project_id = project_id
             try:
-                df = pd.read_csv(csv_path, encoding='utf-8-sig')
+                with CSV_LOAD_SECONDS.time(file='audit_targets'):
+                    df = await asyncio.to_thread(pd.read_csv, csv_path, encoding='utf-8-sig')
                 numeric_project_id = re.sub(r'[^0-9]', '', str(project_id))
                 project_row = df[df['ProjectID'].str.replace(r'[^0-9]', '', regex=True) == numeric_project_id]
                 if not project_row.empty:
                     original_project_id = project_row['ProjectID'].iloc[0]
-                    logger.debug(f"Found original ProjectID: {original_project_id}")
+                    logger.debug("Found original ProjectID: %s", original_project_id)
             except Exception as e:
-                logger.error(f"Error reading audit_targets_new.csv: {str(e)}")
+                logger.error("Error reading audit_targets_new.csv: %s", e)
 
             projects = await self.search_projects_by_id(project_id)
             if not projects:
@@ -188,12 +355,12 @@ class AuditService:
                     }
 
                     search_time = time.time() - start_time
+                    self._publish_documents(project_id, result)
                     ai_analysis = None
                     ai_time = 0
                     if use_ai:
-                        if ctx:
-                            await self._send_single_to_discord(f"\n=== AI 분석 시작 ({dept_name}) ===")
-                        logger.info(f"\n=== AI 분석 시작 ({dept_name}) ===")
+                        await self._send_status(f"\n=== AI 분석 시작 ({dept_name}) ===", ctx, notifier)
+                        logger.info("\n=== AI 분석 시작 (%s) ===", dept_name)
                         ai_start = time.time()
                         ai_input = {
                             'project_id': original_project_id,
@@ -215,34 +382,25 @@ class AuditService:
                         try:
                             ai_analysis = await self.analyze_with_tavily_mcp(ai_input)
                         except Exception as e:
-                            logger.error(f"AI 분석 오류: {str(e)}")
+                            logger.error("AI 분석 오류: %s", e)
                             ai_analysis = f"AI 분석 중 오류 발생: {str(e)}"
                         ai_time = time.time() - ai_start
-                        if ctx:
-                            await self._send_single_to_discord(f"=== AI 분석 완료 ({ai_time:.2f}초) ({dept_name})\nAI Analysis: {ai_analysis}")
-                        logger.info(f"=== AI 분석 완료 ({ai_time:.2f}초) ({dept_name})\nAI Analysis: {ai_analysis}")
-
-                    save_start = time.time()
-                    await self.save_audit_result(result)
-                    save_time = time.time() - save_start
-
-                    total_time = time.time() - start_time
-                    result['ai_analysis'] = ai_analysis
-                    result['performance'] = {
-                        'total_time': total_time,
-                        'search_time': search_time,
-                        'ai_time': ai_time,
-                        'save_time': save_time
-                    }
+                        await self._send_status(f"=== AI 분석 완료 ({ai_time:.2f}초) ({dept_name})\nAI Analysis: {ai_analysis}", ctx, notifier)
+                        logger.info("=== AI 분석 완료 (%.2f초) (%s)\nAI Analysis: %s", ai_time, dept_name, ai_analysis)
+
+                    await self._save_with_timings(result, ai_analysis, start_time, search_time, ai_time)
+                    total_time = result['performance']['total_time']
 
-                    if ctx:
-                        await self._send_single_to_discord(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)")
-                    logger.info(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)")
+                    self._observe_performance(result['performance'])
+                    self._publish_finished(project_id, result)
+                    await self._send_status(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)", ctx, notifier)
+                    logger.info("✅ 프로젝트 %s 감사 완료 (%.2f초)", project_id, total_time)
                     return result
                 else:
-                    logger.warning(f"프로젝트 {project_id}에 대한 계약 데이터를 찾을 수 없습니다.")
-                    if ctx:
-                        await self._send_single_to_discord(f"⚠️ 프로젝트 {project_id}에 대한 계약 데이터를 찾을 수 없습니다.")
+                    logger.warning("프로젝트 %s에 대한 계약 데이터를 찾을 수 없습니다.", project_id)
+                    AUDITS.inc(outcome='not_found')
+                    self.events.publish('audit_failed', project_id=project_id, error='contract data not found')
+                    await self._send_status(f"⚠️ 프로젝트 {project_id}에 대한 계약 데이터를 찾을 수 없습니다.", ctx, notifier)
                     return {}
             else:
                 project_info = projects[0]
@@ -254,6 +412,7 @@ class AuditService:
                     'contractor': project_info.get('contractor', 'Unknown'),
                     'documents': project_info['documents'].copy(),
                     'project_path': project_info.get('original_folder'),
+                    'fingerprint': project_info.get('fingerprint'),
                     'ai_analysis': None,
                     'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
                     'performance': {
@@ -265,12 +424,12 @@ class AuditService:
                 }
 
                 search_time = time.time() - start_time
+                self._publish_documents(project_id, result)
                 ai_analysis = None
                 ai_time = 0
                 if use_ai:
-                    if ctx:
-                        await self._send_single_to_discord(f"\n=== AI 분석 시작 ({project_info['department_name']}) ===")
-                    logger.info(f"\n=== AI 분석 시작 ({project_info['department_name']}) ===")
+                    await self._send_status(f"\n=== AI 분석 시작 ({project_info['department_name']}) ===", ctx, notifier)
+                    logger.info("\n=== AI 분석 시작 (%s) ===", project_info['department_name'])
                     ai_start = time.time()
                     ai_input = {
                         'project_id': project_info['project_id'],
@@ -292,57 +451,72 @@ class AuditService:
                     try:
                         ai_analysis = await self.analyze_with_tavily_mcp(ai_input)
                     except Exception as e:
-                        logger.error(f"AI 분석 오류: {str(e)}")
+                        logger.error("AI 분석 오류: %s", e)
                         ai_analysis = f"AI 분석 중 오류 발생: {str(e)}"
                     ai_time = time.time() - ai_start
-                    if ctx:
-                        await self._send_single_to_discord(f"=== AI 분석 완료 ({ai_time:.2f}초) ({project_info['department_name']})\nAI Analysis: {ai_analysis}")
-                    logger.info(f"=== AI 분석 완료 ({ai_time:.2f}초) ({project_info['department_name']})\nAI Analysis: {ai_analysis}")
-
-                save_start = time.time()
-                await self.save_audit_result(result)
-                save_time = time.time() - save_start
-
-                total_time = time.time() - start_time
-                result['ai_analysis'] = ai_analysis
-                result['performance'] = {
-                    'total_time': total_time,
-                    'search_time': search_time,
-                    'ai_time': ai_time,
-                    'save_time': save_time
-                }
+                    await self._send_status(f"=== AI 분석 완료 ({ai_time:.2f}초) ({project_info['department_name']})\nAI Analysis: {ai_analysis}", ctx, notifier)
+                    logger.info("=== AI 분석 완료 (%.2f초) (%s)\nAI Analysis: %s", ai_time, project_info['department_name'], ai_analysis)
 
-                if ctx:
-                    await self._send_single_to_discord(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)")
-                logger.info(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)")
+                await self._save_with_timings(result, ai_analysis, start_time, search_time, ai_time)
+                total_time = result['performance']['total_time']
+
+                self._observe_performance(result['performance'])
+                self._publish_finished(project_id, result)
+                await self._send_status(f"✅ 프로젝트 {project_id} 감사 완료 ({total_time:.2f}초)", ctx, notifier)
+                logger.info("✅ 프로젝트 %s 감사 완료 (%.2f초)", project_id, total_time)
                 return result
 
         except Exception as e:
-            logger.error(f"프로젝트 {project_id} 감사 중 오류: {str(e)}")
-            if ctx:
-                await self._send_single_to_discord(f"❌ 프로젝트 {project_id} 감사 중 오류 발생: {str(e)}")
+            logger.error("프로젝트 %s 감사 중 오류: %s", project_id, e)
+            AUDITS.inc(outcome='failed')
+            self.events.publish('audit_failed', project_id=project_id, error=str(e))
+            await self._send_status(f"❌ 프로젝트 {project_id} 감사 중 오류 발생: {str(e)}", ctx, notifier)
             return {}
 
-    async def audit_multiple_projects(self, project_ids: List[str], use_ai: bool = False, ctx: Optional[Any] = None) -> List[Dict[str, Any]]:
-        """여러 프로젝트 감사"""
+    async def audit_multiple_projects(self, project_ids: List[str], use_ai: bool = False, ctx: Optional[Any] = None, notifier: Optional[Any] = None, checkpoint: Optional[AuditCheckpoint] = None, skip_unchanged: bool = False) -> List[Dict[str, Any]]:
+        """여러 프로젝트 감사 (checkpoint가 있으면 이미 끝난 프로젝트는 저장된 결과를 재사용)"""
         results = []
+        reused = 0
+        unchanged = 0
         for project_id in project_ids:
-            result = await self.audit_project(project_id, use_ai=use_ai, ctx=ctx)
+            if checkpoint is not None and checkpoint.is_done(project_id):
+                saved = checkpoint.load_result(project_id)
+                if saved is not None:
+                    results.append(saved)
+                    reused += 1
+                    continue
+            result = await self.audit_project(project_id, use_ai=use_ai, ctx=ctx, notifier=notifier, skip_unchanged=skip_unchanged)
             if result:
                 results.append(result)
+                if result.get('skipped_unchanged'):
+                    unchanged += 1
+            if checkpoint is not None:
+                if result:
+                    checkpoint.mark_saved(project_id, result)
+                else:
+                    checkpoint.mark(project_id, status='error', error='audit failed')
+        if reused:
+            logger.info("체크포인트에서 %s개 프로젝트 결과 재사용", reused)
+        if unchanged:
+            logger.info("폴더 변경이 없는 %s개 프로젝트는 저장된 결과 사용", unchanged)
         return results
 
-    async def process_audit_targets(self, use_ai: bool = False, ctx: Optional[Any] = None) -> List[Dict[str, Any]]:
-        """audit_targets_new.csv에서 프로젝트 목록을 가져와 감사"""
+    async def process_audit_targets(self, use_ai: bool = False, ctx: Optional[Any] = None, notifier: Optional[Any] = None, resume: bool = False, skip_unchanged: bool = False) -> List[Dict[str, Any]]:
+        """audit_targets_new.csv에서 프로젝트 목록을 가져와 감사 (resume=True면 체크포인트부터 재개)"""
         try:
             df = pd.read_csv(os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv'), encoding='utf-8-sig')
-            project_ids = df['ProjectID'].tolist()
-            logger.info(f"총 {len(project_ids)}개의 프로젝트를 감사합니다: {project_ids}")
-            return await self.audit_multiple_projects(project_ids, use_ai=use_ai, ctx=ctx)
+            project_ids = [str(project_id) for project_id in df['ProjectID'].tolist()]
+            checkpoint = AuditCheckpoint('audit_targets')
+            if not resume:
+                checkpoint.clear()
+            start = checkpoint.first_unfinished(project_ids)
+            logger.info("총 %s개의 프로젝트를 감사합니다 (재개 위치: %s번째): %s", len(project_ids), start + 1, project_ids)
+            results = await self.audit_multiple_projects(project_ids, use_ai=use_ai, ctx=ctx, notifier=notifier, checkpoint=checkpoint, skip_unchanged=skip_unchanged)
+            checkpoint.clear()
+            return results
         except Exception as e:
-            logger.error(f"audit_targets_new.csv 처리 중 오류: {str(e)}")
-            if ctx:
-                await self._send_single_to_discord(f"❌ audit_targets_new.csv 처리 중 오류 발생: {str(e)}")
+            logger.error("audit_targets_new.csv 처리 중 오류: %s", e)
+            await self._send_status(f"❌ audit_targets_new.csv 처리 중 오류 발생: {str(e)}", ctx, notifier)
             return []
 
     async def analyze_with_tavily_mcp(self, ai_input: Dict[str, Any]) -> str:
@@ -360,10 +534,11 @@ class AuditService:
 
             # 검색 쿼리 생성
             query = f"프로젝트 ID: {project_id}, 프로젝트명: {project_name}, 부서: {department}, 진행상태: {status}, 주관사: {contractor}\n문서 상태:\n{doc_summary}"
-            logger.info(f"Tavily MCP 검색 쿼리: {query}")
+            logger.info("Tavily MCP 검색 쿼리: %s", query)
 
             # Tavily MCP 검색 수행
-            response = self.tavily_client.search(query=query, search_depth="advanced", max_results=5)
+            with timed(AI_CALL_SECONDS, provider='tavily'):
+                response = self.tavily_client.search(query=query, search_depth="advanced", max_results=5)
             if response and 'results' in response:
                 analysis = "Tavily MCP 검색 결과:\n"
                 for result in response['results']:
@@ -372,43 +547,56 @@ class AuditService:
             else:
                 return "Tavily MCP 검색 결과가 없습니다."
         except Exception as e:
-            logger.error(f"Tavily MCP 분석 중 오류: {str(e)}")
+            logger.error("Tavily MCP 분석 중 오류: %s", e)
             return f"Tavily MCP 분석 중 오류 발생: {str(e)}"
 
 if __name__ == "__main__":
     import argparse
+    from config import configure_logging
+    from profiling import profile_run, add_profile_argument
+    configure_logging()
 
     parser = argparse.ArgumentParser(description="프로젝트 감사 서비스")
     parser.add_argument('--project-id', type=str, help="감사할 프로젝트 ID")
     parser.add_argument('--department', type=str, help="특정 부서만 감사 (예: 01010 for 도로부)")
     parser.add_argument('--use-ai', action='store_true', help="AI 분석 사용 여부")
+    parser.add_argument('--resume', action='store_true', help="중단된 전체 감사를 체크포인트부터 재개")
+    parser.add_argument('--skip-unchanged', action='store_true', help="폴더 지문이 같은 프로젝트는 저장된 결과 사용")
+    add_profile_argument(parser)
     args = parser.parse_args()
 
     audit_service = AuditService()
     loop = asyncio.get_event_loop()
-
     if args.project_id:
-        result = loop.run_until_complete(audit_service.audit_project(args.project_id, use_ai=args.use_ai))
-        print(json.dumps(result, ensure_ascii=False, indent=4))
+        profile_name = f"audit_{args.project_id}"
     elif args.department:
-        # 특정 부서의 프로젝트들만 감사
-        dept_code = args.department.zfill(5)  # 5자리로 패딩
-        print(f"부서 {dept_code}의 프로젝트들을 감사합니다...")
+        profile_name = f"audit_dept_{args.department.zfill(5)}"
+    else:
+        profile_name = "audit_all"
+
+    with profile_run(profile_name, args.profile):
+        if args.project_id:
+            result = loop.run_until_complete(audit_service.audit_project(args.project_id, use_ai=args.use_ai, skip_unchanged=args.skip_unchanged))
+            print(json.dumps(result, ensure_ascii=False, indent=4))
+        elif args.department:
+            # 특정 부서의 프로젝트들만 감사
+            dept_code = args.department.zfill(5)  # 5자리로 패딩
+            print(f"부서 {dept_code}의 프로젝트들을 감사합니다...")
         
-        # contract_status.csv에서 해당 부서의 프로젝트들 필터링
-        contract_df = audit_service.load_contract_data()
-        dept_projects = contract_df[contract_df['Depart_Code'] == dept_code]
+            # contract_status.csv에서 해당 부서의 프로젝트들 필터링
+            contract_df = audit_service.load_contract_data()
+            dept_projects = contract_df[contract_df['Depart_Code'] == dept_code]
         
-        if dept_projects.empty:
-            print(f"부서 {dept_code}에 해당하는 프로젝트가 없습니다.")
+            if dept_projects.empty:
+                print(f"부서 {dept_code}에 해당하는 프로젝트가 없습니다.")
+            else:
+                project_ids = dept_projects['ProjectID'].tolist()
+                print(f"감사할 프로젝트 목록: {project_ids}")
+                results = loop.run_until_complete(audit_service.audit_multiple_projects(project_ids, use_ai=args.use_ai, skip_unchanged=args.skip_unchanged))
+                print(json.dumps(results, ensure_ascii=False, indent=4))
         else:
-            project_ids = dept_projects['ProjectID'].tolist()
-            print(f"감사할 프로젝트 목록: {project_ids}")
-            results = loop.run_until_complete(audit_service.audit_multiple_projects(project_ids, use_ai=args.use_ai))
+            results = loop.run_until_complete(audit_service.process_audit_targets(use_ai=args.use_ai, resume=args.resume, skip_unchanged=args.skip_unchanged))
             print(json.dumps(results, ensure_ascii=False, indent=4))
-    else:
-        results = loop.run_until_complete(audit_service.process_audit_targets(use_ai=args.use_ai))
-        print(json.dumps(results, ensure_ascii=False, indent=4))
     
 # python audit_service.py
 # python audit_service.py --project-id 20180076 --use-ai
@@ -416,4 +604,8 @@ if __name__ == "__main__":
 # python audit_service.py --project-id 20190088 --use-ai # 준공폴더,9999
 # python audit_service.py --project-id 20240001 --use-ai
 # python audit_service.py --department 01010 --use-ai  # 도로부만 감사
-# python audit_service.py --department 04010 --use-ai  # 도시계획부만 감사 
\ No newline at end of file
+# python audit_service.py --department 04010 --use-ai  # 도시계획부만 감사
+# python audit_service.py --resume  # 중단된 전체 감사를 이어서 실행
+# python audit_service.py --skip-unchanged  # 폴더가 바뀐 프로젝트만 다시 검색 
+# python audit_service.py --department 01010 --profile  # 부서 감사를 cProfile로 프로파일링 (static/report/profile_*.prof)
+# python audit_service.py --department 01010 --profile sample  # 폴더 스캔 스레드까지 스택 샘플링 (static/report/profile_*.folded)
\ No newline at end of file
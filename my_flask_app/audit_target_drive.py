@@ -3,7 +3,7 @@ import pandas as pd
 import os
 import re
 import logging
-from config import PROJECT_LIST_CSV, NETWORK_BASE_PATH
+from config import PROJECT_LIST_CSV, get_network_drive
 
 # 로깅 설정 (디버깅 로그 레벨로 변경)
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s [%(levelname)s] %(message)s')
@@ -37,7 +37,7 @@ def find_project_folder(project_id):
                 original_folder = project_row['original_folder'].iloc[0]
                 # 네트워크 드라이브 접두사 제거 (예: Z:\, Y:\, X:\) 및 전체 경로 생성
                 folder_without_drive = re.sub(r'^[A-Z]:\\', '', original_folder)
-                full_path = os.path.join(NETWORK_BASE_PATH, folder_without_drive)
+                full_path = os.path.join(get_network_drive(), folder_without_drive)
                 
                 if os.path.exists(full_path):
                     logger.debug(f"Found project folder for ID {project_id} (numeric: {numeric_project_id}): {full_path}")
@@ -0,0 +1,123 @@
+# my_flask_app/columnar_export.py
+# 통합 보고서(combined_report.csv)를 열 기반 형식(Arrow IPC, Parquet)으로 내보내기
+
+import os
+import logging
+import tempfile
+import threading
+import importlib.util
+from typing import TYPE_CHECKING, Dict, Optional, Iterable
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+
+# 형식별 확장자와 MIME 타입
+COLUMNAR_FORMATS = {
+    'arrow': ('.arrow', 'application/vnd.apache.arrow.file'),
+    'parquet': ('.parquet', 'application/vnd.apache.parquet')
+}
+# 값 종류가 적어 사전(dictionary) 인코딩하는 열 (현재/이전 보고서 형식 모두)
+DICTIONARY_COLUMNS = ('Depart', 'department', 'department_code', 'Status', 'Contractor')
+# 앞자리 0이나 영문 접두어가 사라지지 않도록 문자열로 읽을 열
+STRING_COLUMNS = ('ProjectID', 'ProjectID_numeric', 'Depart_ProjectID', 'project_id', 'department_code')
+
+# 여러 요청이 동시에 같은 파일을 다시 만들지 않도록 (ensure_columnar_report가 잡은 채로 write_columnar_report 호출)
+_write_lock = threading.RLock()
+
+
+def columnar_available() -> bool:
+    """pyarrow 설치 여부 (pyarrow/pandas는 실제로 변환할 때 임포트하여 서버 시작 시간을 줄임)"""
+    return importlib.util.find_spec('pyarrow') is not None
+
+
+def columnar_path(csv_path: str, fmt: str) -> str:
+    return os.path.splitext(csv_path)[0] + COLUMNAR_FORMATS[fmt][0]
+
+
+def build_report_table(csv_path: str) -> 'pa.Table':
+    """보고서 CSV를 Arrow 테이블로 변환 (부서/상태/주관사는 사전 인코딩, 문서 플래그/개수는 작은 정수형)"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    df = pd.read_csv(csv_path, encoding='utf-8-sig', dtype={column: str for column in STRING_COLUMNS})
+    for column in df.columns:
+        if column.endswith('_exists'):
+            df[column] = df[column].fillna(0).astype('int8')
+        elif column.endswith('_count'):
+            df[column] = df[column].fillna(0).astype('int32')
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for column in DICTIONARY_COLUMNS:
+        index = table.schema.get_field_index(column)
+        if index >= 0:
+            table = table.set_column(index, column, pc.dictionary_encode(table[column]))
+    return table
+
+
+def write_columnar_report(csv_path: str, formats: Iterable[str] = ('arrow', 'parquet')) -> Dict[str, str]:
+    """보고서 CSV 옆에 열 기반 파일 생성 후 {형식: 경로} 반환 (pyarrow가 없으면 빈 dict)
+
+    Arrow IPC 파일은 압축하지 않아 메모리 매핑으로 열을 복사 없이 읽을 수 있고,
+    Parquet은 zstd로 압축하여 전송량을 줄인다.
+    """
+    if not columnar_available():
+        logger.warning("pyarrow가 설치되어 있지 않아 열 기반 보고서를 생성하지 않습니다.")
+        return {}
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    with _write_lock:
+        table = build_report_table(csv_path)
+        written = {}
+        for fmt in formats:
+            output_path = columnar_path(csv_path, fmt)
+            # 봇과 Flask 프로세스가 같은 보고서를 동시에 쓸 수 있으므로 임시 파일 이름은 호출마다 다르게
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path) or '.',
+                                            prefix=os.path.basename(output_path) + '.', suffix='.tmp')
+            os.close(fd)
+            try:
+                if fmt == 'arrow':
+                    with ipc.new_file(tmp_path, table.schema) as writer:
+                        writer.write_table(table)
+                else:
+                    pq.write_table(table, tmp_path, compression='zstd')
+                os.replace(tmp_path, output_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            written[fmt] = output_path
+            logger.info(f"열 기반 보고서 생성: {output_path} ({os.path.getsize(output_path):,} bytes)")
+    return written
+
+
+def ensure_columnar_report(csv_path: str, fmt: str) -> Optional[str]:
+    """CSV보다 오래되었거나 없는 열 기반 파일을 다시 만든 뒤 경로 반환"""
+    if fmt not in COLUMNAR_FORMATS:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+    if not columnar_available():
+        return None
+    output_path = columnar_path(csv_path, fmt)
+    with _write_lock:
+        if not os.path.exists(output_path) or os.path.getmtime(output_path) < os.path.getmtime(csv_path):
+            write_columnar_report(csv_path, (fmt,))
+    return output_path
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import configure_logging
+    configure_logging()
+    from report_store import find_latest_report
+
+    parser = argparse.ArgumentParser(description="통합 보고서 열 기반 내보내기")
+    parser.add_argument('--csv', type=str, default=None, help="보고서 CSV 경로 (기본: 최신 combined_report.csv)")
+    args = parser.parse_args()
+
+    csv_path = args.csv or find_latest_report()
+    for fmt, path in write_columnar_report(csv_path).items():
+        print(f"{fmt}: {path} ({os.path.getsize(path):,} bytes, CSV {os.path.getsize(csv_path):,} bytes)")
+
+# python columnar_export.py
@@ -1,23 +1,21 @@
 # /my_flask_app/config.py
+# 설정값은 Settings 객체로 한 번만 만들고, 기존 모듈 상수(GOOGLE_API_KEY, NETWORK_BASE_PATH 등)는
+# 처음 접근할 때 Settings에서 가져온다. 임포트만으로는 .env 읽기, 로깅 설정, 드라이브 조회를 하지 않는다.
 import os
-from pathlib import Path  # Path 클래스를 사용하기 위해 pathlib 모듈 임포트
+import queue
+import atexit
+import threading
 import logging
-from dotenv import load_dotenv
+from logging.handlers import QueueHandler, QueueListener
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path  # Path 클래스를 사용하기 위해 pathlib 모듈 임포트
+from typing import Dict, Mapping, Optional, Tuple
 from config_assets import AUDIT_FILTERS, AUDIT_FILTERS_depart, DOCUMENT_TYPES
 
-load_dotenv()
-
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
-# Google API 설정
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY', '')
-
-# API 키 설정
-TAVILY_API_KEY = os.getenv('TAVILY_API', '')
-BRAVE_API_KEY = os.getenv('BRAVE_API', '')
-
 # 프로젝트 루트 경로
 PROJECT_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 STATIC_PATH = os.path.join(PROJECT_ROOT, 'static')
@@ -29,47 +27,223 @@ AUDIT_TARGETS_CSV = os.path.join(STATIC_DATA_PATH, 'audit_targets.csv')  # 감
 CONTRACT_STATUS_CSV = os.path.join(STATIC_DATA_PATH, 'contract_status.csv')
 RESULTS_DIR = os.path.join(STATIC_PATH, 'results')
 
+DEFAULT_NETWORK_DRIVES = ('T:', 'Z:', 'Y:', 'X:', 'U:')
+
+
+def _split_list(value: Optional[str], default: Tuple[str, ...]) -> Tuple[str, ...]:
+    if not value:
+        return default
+    return tuple(item.strip() for item in value.split(',') if item.strip())
+
+
+@dataclass(frozen=True)
+class Settings:
+    """환경 변수(+ 선택적 .env 파일)에서 만든 읽기 전용 설정"""
+    google_api_key: str = ''
+    tavily_api_key: str = ''
+    brave_api_key: str = ''
+    discord_bot_token: Optional[str] = None
+    discord_channel_id: int = 0
+    discord_webhook_url: Optional[str] = None
+    github_token: Optional[str] = None
+    # 기본 네트워크 드라이브 (AUDIT_NETWORK_DRIVE로 고정, 없으면 후보 중 첫 번째)
+    network_drive: str = DEFAULT_NETWORK_DRIVES[0]
+    network_drive_candidates: Tuple[str, ...] = DEFAULT_NETWORK_DRIVES
+    # 드라이브 하나를 확인할 때 기다리는 최대 시간 (초), 끊긴 SMB 연결에서 os.path.exists가 오래 멈추는 것 방지
+    drive_probe_timeout: float = 2.0
+    # 선택된 드라이브를 다시 확인하는 주기 (초)
+    drive_health_ttl: float = 30.0
+    # 시작할 때 후보 드라이브를 실제로 확인할지 여부 (기본은 이전과 같이 확인하지 않고 기본 드라이브 사용)
+    probe_network_drive: bool = False
+    path_cache_size: int = 4096
+    # 스캔에 사용할 파일 시스템: 트리 덤프 파일(있으면 실제 드라이브 대신 사용)과 호출당 추가 지연 시간 (ms)
+    fs_tree_dump: Optional[str] = None
+    fs_latency_ms: float = 0.0
+    # 로그 출력을 별도 스레드(QueueListener)에서 처리할지 여부 (콘솔/파일 쓰기로 이벤트 루프가 멈추지 않도록)
+    log_queue: bool = True
+    # 프로젝트 폴더 감시 (켜면 스캔 결과를 메모리 인덱스에 두고 변경 이벤트로 갱신)
+    watch_share: bool = False
+    # auto: Linux 로컬 마운트는 inotify, 그 외(Windows 드라이브, 트리 덤프)는 폴링
+    watch_backend: str = 'auto'
+    # 폴링 감시 주기 (초), 캐시된 폴더마다 stat 한 번
+    watch_poll_interval: float = 30.0
+    env_file: Optional[str] = field(default=None, compare=False)
+
+    @classmethod
+    def from_env(cls, environ: Optional[Mapping[str, str]] = None, env_file: Optional[str] = None) -> 'Settings':
+        """환경 변수와 .env 파일 값으로 생성 (환경 변수가 우선, os.environ은 바꾸지 않음)"""
+        values: Dict[str, str] = {}
+        if env_file is None:
+            from dotenv import find_dotenv
+            env_file = find_dotenv() or None
+        if env_file and os.path.exists(env_file):
+            from dotenv import dotenv_values
+            values.update({key: value for key, value in dotenv_values(env_file).items() if value is not None})
+        values.update(os.environ if environ is None else environ)
+
+        candidates = _split_list(values.get('AUDIT_NETWORK_DRIVES'), DEFAULT_NETWORK_DRIVES)
+        return cls(
+            google_api_key=values.get('GOOGLE_API_KEY', ''),
+            tavily_api_key=values.get('TAVILY_API', ''),
+            brave_api_key=values.get('BRAVE_API', ''),
+            discord_bot_token=values.get('DISCORD_BOT_TOKEN'),
+            discord_channel_id=int(values.get('DISCORD_CHANNEL_ID') or '0'),
+            discord_webhook_url=values.get('DISCORD_WEBHOOK_URL'),
+            github_token=values.get('GITHUB_TOKEN') or values.get('PERSONAL_ACCESS_TOKEN'),
+            network_drive=values.get('AUDIT_NETWORK_DRIVE') or candidates[0],
+            network_drive_candidates=candidates,
+            drive_probe_timeout=float(values.get('AUDIT_DRIVE_PROBE_TIMEOUT', '2.0')),
+            drive_health_ttl=float(values.get('AUDIT_DRIVE_HEALTH_TTL', '30')),
+            probe_network_drive=values.get('AUDIT_PROBE_NETWORK_DRIVE', '').lower() in ('1', 'true', 'yes'),
+            path_cache_size=int(values.get('AUDIT_PATH_CACHE_SIZE', '4096')),
+            fs_tree_dump=values.get('AUDIT_FS_TREE_DUMP') or None,
+            fs_latency_ms=float(values.get('AUDIT_FS_LATENCY_MS', '0')),
+            log_queue=values.get('AUDIT_LOG_QUEUE', '1').lower() not in ('0', 'false', 'no'),
+            watch_share=values.get('AUDIT_WATCH_SHARE', '').lower() in ('1', 'true', 'yes'),
+            watch_backend=values.get('AUDIT_WATCH_BACKEND', 'auto').lower(),
+            watch_poll_interval=float(values.get('AUDIT_WATCH_POLL_INTERVAL', '30')),
+            env_file=env_file
+        )
+
+
+def load_environment(override: bool = False) -> Optional[str]:
+    """.env 파일을 os.environ에 로드 (진입점 스크립트에서 다른 모듈을 임포트하기 전에 호출)"""
+    from dotenv import find_dotenv, load_dotenv
+    env_file = find_dotenv()
+    if env_file:
+        load_dotenv(env_file, override=override)
+    return env_file or None
+
+
+def configure_logging(level: int = logging.INFO, use_queue: Optional[bool] = None) -> None:
+    """기본 로그 형식 설정 (진입점 스크립트에서 호출, 이미 설정되어 있으면 변경 없음)
+
+    use_queue(기본: AUDIT_LOG_QUEUE, 켜짐)면 루트 핸들러를 로그 전용 스레드로 옮긴다.
+    """
+    logging.basicConfig(level=level, format='%(asctime)s [%(levelname)s] %(message)s')
+    if use_queue if use_queue is not None else get_settings().log_queue:
+        start_log_queue()
+
+
+_log_listener: Optional[QueueListener] = None
+_log_lock = threading.Lock()
+
+def start_log_queue() -> None:
+    """루트 로거의 핸들러를 QueueListener 스레드로 옮김
+
+    로그를 남기는 쪽은 레코드를 큐에 넣기만 하고 콘솔/파일 쓰기는 리스너 스레드가 하므로
+    이벤트 루프와 스캔 스레드가 로그 I/O를 기다리지 않는다. 종료 시 남은 로그를 모두 쓴다.
+    """
+    global _log_listener
+    with _log_lock:
+        root = logging.getLogger()
+        if _log_listener is not None or not root.handlers:
+            return
+        handlers = list(root.handlers)
+        log_queue = queue.SimpleQueue()
+        for handler in handlers:
+            root.removeHandler(handler)
+        root.addHandler(QueueHandler(log_queue))
+        _log_listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _log_listener.start()
+    atexit.register(stop_log_queue)
+
+def stop_log_queue() -> None:
+    """큐에 남은 로그를 모두 쓰고 원래 핸들러로 되돌림"""
+    global _log_listener
+    with _log_lock:
+        listener, _log_listener = _log_listener, None
+        if listener is None:
+            return
+        listener.stop()
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            if isinstance(handler, QueueHandler):
+                root.removeHandler(handler)
+        for handler in listener.handlers:
+            root.addHandler(handler)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """프로세스 공용 설정 (처음 호출할 때 한 번만 생성)"""
+    return Settings.from_env()
+
+
 # 네트워크 드라이브 설정 (캐싱)
 _NETWORK_DRIVE_CACHE = None
-_PATH_CACHE = {}
+_drive_locator = None
+_network_drive_lock = threading.Lock()
+
+def get_drive_locator():
+    """후보 드라이브 탐색/상태 확인기 (처음 호출할 때 생성)"""
+    global _drive_locator
+    with _network_drive_lock:
+        if _drive_locator is None:
+            from network_drive import NetworkDriveLocator
+            from services import services
+            settings = get_settings()
+            _drive_locator = NetworkDriveLocator(
+                settings.network_drive_candidates,
+                probe_timeout=settings.drive_probe_timeout,
+                health_ttl=settings.drive_health_ttl,
+                default=settings.network_drive,
+                exists=services.get('filesystem').exists
+            )
+        return _drive_locator
 
 def get_network_drive(verbose=False):
-    """사용 가능한 네트워크 드라이브 찾기 (캐싱 적용)"""
+    """사용 가능한 네트워크 드라이브 찾기 (캐싱 적용)
+
+    verbose=True거나 AUDIT_PROBE_NETWORK_DRIVE가 설정되어 있으면 후보 드라이브를 동시에 확인하고
+    이후 호출에서도 TTL마다 상태를 확인하여 끊기면 다른 드라이브로 전환한다.
+    아니면 확인 없이 기본 드라이브를 사용한다.
+    """
     global _NETWORK_DRIVE_CACHE
-    
-    if _NETWORK_DRIVE_CACHE is not None:
+
+    if _NETWORK_DRIVE_CACHE is not None and not verbose:
         return _NETWORK_DRIVE_CACHE
 
-    # 기본값 설정
-    _NETWORK_DRIVE_CACHE = 'T:'
-    
-    if verbose:
-        drives = ['T:', 'Z:', 'Y:', 'X:', 'U:']
-        for drive in drives:
-            try:
-                if os.path.exists(drive):
-                    _NETWORK_DRIVE_CACHE = drive
-                    logger.debug(f"Found network drive: {drive}")
-                    break
-            except Exception:
-                continue
-        
-        if _NETWORK_DRIVE_CACHE == 'T:':
-            logger.warning("No network drive found, using default T:")
-    
+    if verbose or _drive_locator is not None or get_settings().probe_network_drive:
+        _NETWORK_DRIVE_CACHE = None
+        drive = get_drive_locator().current()
+        _sync_path_cache(drive)
+        return drive
+
+    _NETWORK_DRIVE_CACHE = get_settings().network_drive
     return _NETWORK_DRIVE_CACHE
 
+def report_network_drive_failure(drive):
+    """스캔 중 드라이브 I/O 오류 보고 (탐색 모드면 다음 조회에서 다른 드라이브로 전환)"""
+    if _drive_locator is not None:
+        _drive_locator.report_failure(drive)
+
+# 상대 경로 -> 절대 경로 변환 캐시 (최근 사용 순, 최대 path_cache_size개)
+_PATH_CACHE = OrderedDict()
+_path_cache_lock = threading.Lock()
+_path_cache_drive = None
+
+def _sync_path_cache(drive):
+    """드라이브가 바뀌면 이전 드라이브 기준으로 변환된 경로 캐시를 비움"""
+    global _path_cache_drive
+    with _path_cache_lock:
+        if _path_cache_drive is not None and _path_cache_drive != drive:
+            _PATH_CACHE.clear()
+        _path_cache_drive = drive
+
 def get_full_path(relative_path, check_exists=False, verbose=False):
     """상대 경로를 절대 경로로 변환하되, 네트워크 조회를 최소화"""
     if not relative_path:
         return None
-    
+
     cache_key = str(relative_path)
-    if cache_key in _PATH_CACHE:
-        return _PATH_CACHE[cache_key]
-    
+    with _path_cache_lock:
+        if cache_key in _PATH_CACHE:
+            _PATH_CACHE.move_to_end(cache_key)
+            return _PATH_CACHE[cache_key]
+
     drive = get_network_drive(verbose=False)  # verbose를 False로 고정
-    
+
     if ':' in relative_path:
         _, path = relative_path.split(':', 1)
         full_path = f"{drive}{path}"
@@ -78,55 +252,75 @@ def get_full_path(relative_path, check_exists=False, verbose=False):
 
     # 경로 정규화 (실제 파일 시스템 접근 없이)
     full_path = str(Path(full_path))
-    
+
     # 네트워크 드라이브 확인 최소화
     if check_exists and verbose:  # check_exists가 True이고 verbose가 True일 때만 확인
         if not os.path.exists(full_path):
             logger.warning(f"Path does not exist: {full_path}")
 
-    _PATH_CACHE[cache_key] = full_path
+    with _path_cache_lock:
+        _PATH_CACHE[cache_key] = full_path
+        if len(_PATH_CACHE) > get_settings().path_cache_size:
+            _PATH_CACHE.popitem(last=False)
     if verbose:
         logger.debug(f"Converted path: {relative_path} -> {full_path}")
-    
+
     return full_path
 
 def clear_path_cache():
     """경로 캐시 초기화"""
-    global _PATH_CACHE, _NETWORK_DRIVE_CACHE
-    _PATH_CACHE = {}
+    global _NETWORK_DRIVE_CACHE
+    with _path_cache_lock:
+        _PATH_CACHE.clear()
     _NETWORK_DRIVE_CACHE = None
     logger.info("Path cache cleared")
 
-# 네트워크 드라이브 초기화 (시작 시 한 번만)
-NETWORK_BASE_PATH = get_network_drive()
-
-# Discord 설정
-DISCORD_BOT_TOKEN = os.getenv('DISCORD_BOT_TOKEN')
-DISCORD_CHANNEL_ID = int(os.getenv('DISCORD_CHANNEL_ID', '0'))
-DISCORD_WEBHOOK_URL = os.getenv('DISCORD_WEBHOOK_URL')
-GITHUB_TOKEN = os.getenv('GITHUB_TOKEN')
-
-# MCP 서버 설정
-MCP_SERVERS = {
-    "tavily-mcp": {
-        "command": "npx",
-        "args": ["-y", "tavily-mcp@0.1.2"],
-        "env": {
-            "TAVILY_API_KEY": TAVILY_API_KEY
-        }
-    },
-    "brave-search": {
-        "command": "npx",
-        "args": ["-y", "@modelcontextprotocol/server-brave-search"],
-        "env": {
-            "BRAVE_API_KEY": BRAVE_API_KEY
+def _mcp_servers(settings: Settings) -> Dict[str, dict]:
+    """MCP 서버 설정"""
+    return {
+        "tavily-mcp": {
+            "command": "npx",
+            "args": ["-y", "tavily-mcp@0.1.2"],
+            "env": {
+                "TAVILY_API_KEY": settings.tavily_api_key
+            }
+        },
+        "brave-search": {
+            "command": "npx",
+            "args": ["-y", "@modelcontextprotocol/server-brave-search"],
+            "env": {
+                "BRAVE_API_KEY": settings.brave_api_key
+            }
+        },
+        "sequential-thinking": {
+            "command": "npx",
+            "args": ["-y", "@modelcontextprotocol/server-sequential-thinking"]
         }
-    },
-    "sequential-thinking": {
-        "command": "npx",
-        "args": ["-y", "@modelcontextprotocol/server-sequential-thinking"]
     }
+
+# 기존 모듈 상수 이름 -> 설정값 (from config import GOOGLE_API_KEY 등이 그대로 동작)
+_LAZY_SETTINGS = {
+    'GOOGLE_API_KEY': lambda s: s.google_api_key,
+    'TAVILY_API_KEY': lambda s: s.tavily_api_key,
+    'BRAVE_API_KEY': lambda s: s.brave_api_key,
+    'DISCORD_BOT_TOKEN': lambda s: s.discord_bot_token,
+    'DISCORD_CHANNEL_ID': lambda s: s.discord_channel_id,
+    'DISCORD_WEBHOOK_URL': lambda s: s.discord_webhook_url,
+    'GITHUB_TOKEN': lambda s: s.github_token,
+    'MCP_SERVERS': _mcp_servers,
+    # 네트워크 드라이브 (접근할 때마다 현재 드라이브, 장애 전환 반영)
+    'NETWORK_BASE_PATH': lambda s: get_network_drive()
 }
+# 모듈 전역에 저장하지 않는 값 (새 코드는 from import 대신 사용하는 곳에서 get_network_drive() 호출)
+_LIVE_SETTINGS = {'NETWORK_BASE_PATH'}
+
+def __getattr__(name):
+    if name in _LAZY_SETTINGS:
+        value = _LAZY_SETTINGS[name](get_settings())
+        if name not in _LIVE_SETTINGS:
+            globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 감사 대상 필터링 설정 (config_assets에서 가져옴)
-# config_assets에서 정의된 AUDIT_FILTERS와 AUDIT_FILTERS_depart를 사용
\ No newline at end of file
+# config_assets에서 정의된 AUDIT_FILTERS와 AUDIT_FILTERS_depart를 사용
@@ -0,0 +1,136 @@
+# my_flask_app/department_summary.py
+# 부서별 문서 현황/위험도 집계 (대시보드용, 보고서가 바뀐 프로젝트만 다시 반영)
+
+import logging
+from typing import Dict, Any, List, Optional, Tuple
+
+from config_assets import DOCUMENT_TYPES
+from export_report import calculate_risk_score
+
+logger = logging.getLogger(__name__)
+
+COMPLETED_STATUSES = {'준공', '완료', 'completed'}
+# 집계에 영향을 주는 필드 (timestamp 등 나머지 필드만 바뀐 프로젝트는 다시 반영하지 않음)
+AGGREGATE_FIELDS = ('department', 'department_code', 'status', 'documents')
+
+
+def risk_level(risk_score: int) -> str:
+    """export_report와 같은 기준의 위험도 등급 (0-40 high, 41-70 medium, 71-100 low)"""
+    if risk_score <= 40:
+        return 'high'
+    if risk_score <= 70:
+        return 'medium'
+    return 'low'
+
+
+def _aggregate_key(project: Dict[str, Any]) -> Tuple:
+    return tuple(project[field] for field in AGGREGATE_FIELDS)
+
+
+def _empty_department(department: str, department_code: str) -> Dict[str, Any]:
+    return {
+        'department': department,
+        'department_code': department_code,
+        'total_projects': 0,
+        'completed_projects': 0,
+        'in_progress_projects': 0,
+        'status': {},
+        'documents': {doc_type: {'exists': 0, 'missing': 0, 'files': 0} for doc_type in DOCUMENT_TYPES},
+        'risk_levels': {'high': 0, 'medium': 0, 'low': 0},
+        'risk_score_sum': 0
+    }
+
+
+class DepartmentSummaryIndex:
+    """부서별 집계를 프로젝트 단위 증감으로 유지
+
+    새 보고서가 로드되면 이전 보고서와 프로젝트별로 비교해 바뀐 프로젝트만
+    기존 집계에서 빼고 다시 더한다. 전체 보고서를 다시 집계하지 않는다.
+    """
+
+    def __init__(self):
+        self._projects: Dict[str, Dict[str, Any]] = {}
+        self._departments: Dict[str, Dict[str, Any]] = {}
+
+    def _apply_project(self, project: Dict[str, Any], sign: int) -> None:
+        department = project['department']
+        stats = self._departments.get(department)
+        if stats is None:
+            stats = self._departments[department] = _empty_department(department, project['department_code'])
+
+        completed = project['status'] in COMPLETED_STATUSES
+        stats['total_projects'] += sign
+        stats['completed_projects'] += sign if completed else 0
+        stats['in_progress_projects'] += 0 if completed else sign
+        stats['status'][project['status']] = stats['status'].get(project['status'], 0) + sign
+
+        missing_docs = []
+        for doc_type, info in project['documents'].items():
+            doc_stats = stats['documents'][doc_type]
+            if info['exists']:
+                doc_stats['exists'] += sign
+            else:
+                doc_stats['missing'] += sign
+                missing_docs.append(doc_type)
+            doc_stats['files'] += sign * info.get('count', 0)
+
+        risk_score = calculate_risk_score(missing_docs)
+        stats['risk_levels'][risk_level(risk_score)] += sign
+        stats['risk_score_sum'] += sign * risk_score
+
+        if stats['total_projects'] == 0:
+            del self._departments[department]
+        elif stats['status'][project['status']] == 0:
+            del stats['status'][project['status']]
+
+    def apply(self, projects: List[Dict[str, Any]]) -> Tuple[int, int, int]:
+        """새 보고서의 프로젝트 목록 반영 후 (추가, 변경, 삭제) 수 반환"""
+        current = {project['project_id']: project for project in projects}
+        added = changed = removed = 0
+        for project_id, old in list(self._projects.items()):
+            new = current.get(project_id)
+            if new is None:
+                self._apply_project(old, -1)
+                del self._projects[project_id]
+                removed += 1
+            elif _aggregate_key(new) != _aggregate_key(old):
+                self._apply_project(old, -1)
+                self._apply_project(new, 1)
+                self._projects[project_id] = new
+                changed += 1
+            else:
+                self._projects[project_id] = new
+        for project_id, new in current.items():
+            if project_id not in self._projects:
+                self._apply_project(new, 1)
+                self._projects[project_id] = new
+                added += 1
+        logger.info(f"부서별 집계 갱신: 추가 {added}개, 변경 {changed}개, 삭제 {removed}개")
+        return added, changed, removed
+
+    def summary(self, department_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """부서별 집계 (문서 보유율, 평균 위험도 포함)"""
+        summaries = []
+        for stats in sorted(self._departments.values(), key=lambda s: s['department']):
+            if department_code and stats['department_code'] != department_code:
+                continue
+            total = stats['total_projects']
+            documents = {
+                doc_type: {**doc_stats, 'rate': round(doc_stats['exists'] / total * 100, 1)}
+                for doc_type, doc_stats in stats['documents'].items()
+            }
+            summaries.append({
+                'department': stats['department'],
+                'department_code': stats['department_code'],
+                'total_projects': total,
+                'completed_projects': stats['completed_projects'],
+                'in_progress_projects': stats['in_progress_projects'],
+                'status': dict(stats['status']),
+                'documents': documents,
+                'document_completion_rate': round(
+                    sum(doc_stats['exists'] for doc_stats in stats['documents'].values()) / (total * len(DOCUMENT_TYPES)) * 100, 1
+                ),
+                'risk_levels': dict(stats['risk_levels']),
+                'average_risk_score': round(stats['risk_score_sum'] / total, 1)
+            })
+        return summaries
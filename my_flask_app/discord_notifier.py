@@ -0,0 +1,299 @@
+# my_flask_app/discord_notifier.py
+# 감사 진행 상황을 하나의 Discord 메시지로 모아서 주기적으로 수정(edit)하는 알림기
+
+import asyncio
+import time
+import logging
+from collections import deque
+from typing import Optional, Any, List
+
+import aiohttp
+from config import DISCORD_WEBHOOK_URL
+from metrics import DISCORD_SEND_SECONDS, timed
+
+logger = logging.getLogger(__name__)
+
+# Discord 메시지 길이 제한
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """메시지를 Discord 길이 제한에 맞게 분할 (가능하면 줄 단위로 자름)"""
+    if not text:
+        return []
+    chunks = []
+    current = ''
+    for line in text.split('\n'):
+        # 한 줄이 제한보다 긴 경우 강제로 자름
+        while len(line) > limit:
+            if current:
+                chunks.append(current)
+                current = ''
+            chunks.append(line[:limit])
+            line = line[limit:]
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) > limit:
+            chunks.append(current)
+            current = line
+        else:
+            current = candidate
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class WebhookTransport:
+    """Discord 웹훅 전송 (메시지 생성/수정, rate limit 헤더 준수)"""
+
+    def __init__(self, webhook_url: str, max_retries: int = 5, timeout: float = 10):
+        self.webhook_url = webhook_url.rstrip('/')
+        self.max_retries = max_retries
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self._session = None
+        self._blocked_until = 0.0  # rate limit 해제 시각 (monotonic)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=self.timeout)
+        return self._session
+
+    def _update_rate_limit(self, headers) -> None:
+        """X-RateLimit-* 헤더로 다음 요청 가능 시각 계산"""
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_after = headers.get('X-RateLimit-Reset-After')
+        if remaining is not None and reset_after is not None:
+            try:
+                if int(remaining) <= 0:
+                    self._blocked_until = time.monotonic() + float(reset_after)
+            except ValueError:
+                pass
+
+    async def _request(self, method: str, url: str, payload: dict) -> Optional[dict]:
+        """요청 전송 (재시도 포함 소요 시간을 지표로 기록)"""
+        start = time.perf_counter()
+        result = await self._request_with_retry(method, url, payload)
+        DISCORD_SEND_SECONDS.observe(time.perf_counter() - start, transport='webhook',
+                                     outcome='ok' if result is not None else 'error')
+        return result
+
+    async def _request_with_retry(self, method: str, url: str, payload: dict) -> Optional[dict]:
+        """요청 전송 (429는 retry_after만큼, 5xx/네트워크 오류는 지수 백오프 후 재시도)"""
+        session = await self._get_session()
+        for attempt in range(self.max_retries):
+            wait = self._blocked_until - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                async with session.request(method, url, json=payload) as response:
+                    self._update_rate_limit(response.headers)
+                    if response.status == 429:
+                        retry_after = response.headers.get('Retry-After')
+                        try:
+                            body = await response.json(content_type=None)
+                            retry_after = body.get('retry_after', retry_after)
+                        except Exception:
+                            pass
+                        retry_after = float(retry_after or 1)
+                        logger.warning(f"Discord rate limit, {retry_after:.2f}초 후 재시도 ({attempt + 1}/{self.max_retries})")
+                        self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                        continue
+                    if response.status >= 500:
+                        logger.warning(f"Discord 서버 오류 {response.status}, 재시도 ({attempt + 1}/{self.max_retries})")
+                        await asyncio.sleep(0.5 * 2 ** attempt)
+                        continue
+                    if response.status >= 400:
+                        logger.error(f"Discord 웹훅 요청 실패: {response.status} {await response.text()}")
+                        return None
+                    if response.status == 204:
+                        return {}
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.warning(f"Discord 웹훅 연결 오류: {str(e)}, 재시도 ({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(0.5 * 2 ** attempt)
+        logger.error(f"Discord 웹훅 요청 재시도 초과: {method} {url}")
+        return None
+
+    async def post(self, payload: dict) -> Optional[dict]:
+        """임의의 페이로드(content/embeds) 전송, 실패 시 None"""
+        return await self._request('POST', f"{self.webhook_url}?wait=true", payload)
+
+    async def send(self, content: str) -> Optional[str]:
+        """새 메시지 전송 후 메시지 ID 반환"""
+        data = await self.post({'content': content})
+        return data.get('id') if data else None
+
+    async def edit(self, message_id: str, content: str) -> None:
+        """기존 메시지 내용 수정"""
+        await self._request('PATCH', f"{self.webhook_url}/messages/{message_id}", {'content': content})
+
+    async def close(self) -> None:
+        if self._session and not self._session.closed:
+            await self._session.close()
+
+
+class ChannelTransport:
+    """discord.py 컨텍스트(ctx)를 통한 채널 메시지 전송 (rate limit은 discord.py가 처리)"""
+
+    def __init__(self, ctx: Any):
+        self.ctx = ctx
+        self._messages = {}
+
+    async def send(self, content: str) -> Optional[str]:
+        with timed(DISCORD_SEND_SECONDS, transport='channel'):
+            message = await self.ctx.send(content)
+        self._messages[str(message.id)] = message
+        return str(message.id)
+
+    async def edit(self, message_id: str, content: str) -> None:
+        message = self._messages.get(message_id)
+        if message:
+            with timed(DISCORD_SEND_SECONDS, transport='channel'):
+                await message.edit(content=content)
+
+    async def close(self) -> None:
+        self._messages.clear()
+
+
+class DiscordProgressNotifier:
+    """상태 이벤트를 버퍼링하여 주기적으로 하나의 메시지를 수정하는 진행 알림기
+
+    notify()는 큐에 넣기만 하므로 감사 파이프라인을 절대 블로킹하지 않는다.
+    메시지가 2,000자를 넘으면 현재 메시지를 확정하고 새 메시지를 시작한다.
+    """
+
+    def __init__(self, title: str = '', ctx: Any = None, webhook_url: Optional[str] = None,
+                 flush_interval: float = 2.0, max_pending: int = 1000):
+        if ctx is not None:
+            self.transport = ChannelTransport(ctx)
+        elif webhook_url or DISCORD_WEBHOOK_URL:
+            self.transport = WebhookTransport(webhook_url or DISCORD_WEBHOOK_URL)
+        else:
+            self.transport = None
+            logger.warning("Discord 전송 대상이 없어 진행 알림을 로그로만 기록합니다.")
+
+        self.title = title
+        self.flush_interval = flush_interval
+        self._pending = deque(maxlen=max_pending)  # 가득 차면 오래된 이벤트부터 버림
+        self._lines = []  # 현재 수정 중인 메시지의 본문 줄
+        self._message_id = None
+        self._rendered = None
+        self._done = 0
+        self._total = 0
+        self._dropped = 0
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._closed = False
+
+    def start(self) -> 'DiscordProgressNotifier':
+        """백그라운드 flush 태스크 시작"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    def notify(self, message: str) -> None:
+        """상태 이벤트 추가 (블로킹 없음)"""
+        if self._closed:
+            return
+        if len(self._pending) == self._pending.maxlen:
+            self._dropped += 1
+        self._pending.append(message)
+        logger.info(message)
+
+    def set_progress(self, done: int, total: Optional[int] = None) -> None:
+        """진행률 갱신 (다음 flush에 반영)"""
+        self._done = done
+        if total is not None:
+            self._total = total
+
+    def _header(self) -> str:
+        header = self.title
+        if self._total:
+            percent = self._done / self._total * 100
+            header += f"\n🔄 진행: {self._done}/{self._total} ({percent:.1f}%)"
+        if self._dropped:
+            header += f"\n⚠️ 생략된 이벤트: {self._dropped}개"
+        return header.strip()
+
+    def _render(self) -> str:
+        return '\n'.join([self._header()] + self._lines).strip()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+            if self._closed:
+                break
+
+    async def flush(self) -> None:
+        """버퍼의 이벤트를 현재 메시지에 반영 (한도 초과 시 새 메시지로 넘김)"""
+        if self.transport is None:
+            self._pending.clear()
+            return
+        try:
+            while self._pending:
+                for chunk in split_message(self._pending.popleft(), DISCORD_MESSAGE_LIMIT // 2):
+                    self._lines.append(chunk)
+                    if len(self._render()) > DISCORD_MESSAGE_LIMIT and len(self._lines) > 1:
+                        # 현재 메시지를 확정하고 새 메시지 시작
+                        self._lines.pop()
+                        await self._publish()
+                        self._message_id = None
+                        self._rendered = None
+                        self._lines = [chunk]
+            await self._publish()
+        except Exception as e:
+            logger.error(f"진행 알림 전송 중 오류: {str(e)}")
+
+    async def _publish(self) -> None:
+        content = self._render()[:DISCORD_MESSAGE_LIMIT]
+        if not content or content == self._rendered:
+            return
+        if self._message_id is None:
+            self._message_id = await self.transport.send(content)
+        else:
+            await self.transport.edit(self._message_id, content)
+        self._rendered = content
+
+    async def close(self) -> None:
+        """남은 이벤트를 모두 전송하고 종료"""
+        self._closed = True
+        if self._task:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        else:
+            await self.flush()
+        if self.transport:
+            await self.transport.close()
+
+    async def __aenter__(self) -> 'DiscordProgressNotifier':
+        return self.start()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    from config import configure_logging
+    configure_logging()
+
+    parser = argparse.ArgumentParser(description="Discord 진행 알림 테스트")
+    parser.add_argument('--webhook-url', type=str, default=DISCORD_WEBHOOK_URL, help="웹훅 URL (로컬 테스트 서버 가능)")
+    parser.add_argument('--count', type=int, default=50, help="전송할 이벤트 수")
+    args = parser.parse_args()
+
+    async def run_test():
+        async with DiscordProgressNotifier("📋 진행 알림 테스트", webhook_url=args.webhook_url, flush_interval=0.5) as notifier:
+            for i in range(args.count):
+                notifier.set_progress(i + 1, args.count)
+                notifier.notify(f"✅ 프로젝트 {20240000 + i} 감사 완료")
+                await asyncio.sleep(0.05)
+
+    asyncio.run(run_test())
+
+# python discord_notifier.py --webhook-url http://127.0.0.1:8080/api/webhooks/1/token --count 200
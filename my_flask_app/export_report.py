@@ -269,6 +269,8 @@ def calculate_risk_score(missing_docs):
     return max(0, base_score)
 
 if __name__ == "__main__":
+    from config import configure_logging
+    configure_logging()
     parser = argparse.ArgumentParser(description="Export department-wise project audit reports")
     parser.add_argument('--dept', type=str, required=True, help="Specific department code (e.g., 01010)")
     parser.add_argument('--output', type=str, required=True, help="Output CSV file path (e.g., ./report/report_01010.csv)")
@@ -0,0 +1,144 @@
+# my_flask_app/file_browser.py
+# 네트워크 드라이브 프로젝트 폴더를 한 단계씩 페이지 단위로 조회 (Flutter 파일 탐색기용)
+
+import os
+import time
+import bisect
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import get_network_drive
+from report_store import encode_cursor, decode_cursor
+
+logger = logging.getLogger(__name__)
+
+LISTING_PAGE_SIZE = 200
+MAX_LISTING_PAGE_SIZE = 1000
+LISTING_CACHE_TTL = 60.0
+LISTING_CACHE_SIZE = 512
+
+
+def _sort_key(item: Dict[str, Any]) -> Tuple[int, str]:
+    """폴더 먼저, 그 다음 이름순"""
+    return (0 if item['isDirectory'] else 1, item['name'].lower())
+
+
+def _cursor_key(key: Tuple[int, str]) -> str:
+    return f"{key[0]}/{key[1]}"
+
+
+def project_browse_path(project: Optional[Dict[str, Any]], sub_path: str = '') -> Optional[str]:
+    """보고서의 search_folder 기준 경로 (프로젝트 폴더가 없으면 None)"""
+    if not project:
+        return None
+    folder = (project.get('search_folder') or '').replace('\\', '/').strip('/')
+    if not folder or folder in ('No folder', 'No directory'):
+        return None
+    sub_path = (sub_path or '').replace('\\', '/').strip('/')
+    return f"{folder}/{sub_path}" if sub_path else folder
+
+
+class FileBrowser:
+    """디렉토리 한 단계 목록 + 문서 유형 태그
+
+    디렉토리 항목은 감사 검색기(ProjectDocumentSearcher)의 _dir_cache를 함께 사용하므로
+    감사 중 이미 스캔한 폴더는 드라이브에 다시 접근하지 않는다. 가공된 목록은 TTL 동안
+    보관하고, 만료되면 검색기 캐시에서도 지운 뒤 다시 스캔한다.
+    """
+
+    def __init__(self, searcher, root: Optional[str] = None, ttl: float = LISTING_CACHE_TTL):
+        self.searcher = searcher
+        self.root = root
+        self.ttl = ttl
+        self._listings: 'OrderedDict[str, Tuple[float, List[Dict[str, Any]], List[Tuple[int, str]]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def resolve(self, rel_path: str) -> str:
+        """루트 기준 상대 경로를 절대 경로로 변환 (루트 밖으로 나가는 경로는 ValueError)"""
+        rel_path = (rel_path or '').replace('\\', '/').strip('/')
+        parts = [part for part in rel_path.split('/') if part and part != '.']
+        if any(part == '..' or ':' in part for part in parts):
+            raise ValueError(f"허용되지 않는 경로입니다: {rel_path}")
+        # root를 지정하지 않으면 현재 네트워크 드라이브 (드라이브가 전환되면 따라감)
+        root = self.root or get_network_drive()
+        return os.path.join(root, *parts) if parts else root
+
+    def _describe(self, rel_path: str, entries) -> List[Dict[str, Any]]:
+        items = []
+        for entry in entries:
+            if self.searcher.should_skip(entry.name):
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                stat = entry.stat(follow_symlinks=False)
+            except OSError as e:
+                logger.debug(f"항목 정보 조회 실패 {entry.path}: {str(e)}")
+                continue
+            items.append({
+                'name': entry.name,
+                'path': f"{rel_path}/{entry.name}" if rel_path else entry.name,
+                'isDirectory': is_dir,
+                'size': None if is_dir else stat.st_size,
+                'mtime': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                'doc_type': None if is_dir else self.searcher.classify(entry.name)
+            })
+        items.sort(key=_sort_key)
+        self.searcher.flush_cache_metrics()
+        return items
+
+    def _listing(self, rel_path: str) -> Tuple[List[Dict[str, Any]], List[Tuple[int, str]]]:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._listings.get(rel_path)
+            if cached and now - cached[0] < self.ttl:
+                self._listings.move_to_end(rel_path)
+                return cached[1], cached[2]
+
+        full_path = self.resolve(rel_path)
+        try:
+            # TTL이 지났으면 검색기 캐시도 무효화하여 최신 목록을 읽음
+            entries = self.searcher.list_dir(full_path, refresh=bool(cached))
+        except FileNotFoundError:
+            raise FileNotFoundError(rel_path or '/')
+
+        items = self._describe(rel_path, entries)
+        keys = [_sort_key(item) for item in items]
+        with self._lock:
+            self._listings[rel_path] = (now, items, keys)
+            if len(self._listings) > LISTING_CACHE_SIZE:
+                self._listings.popitem(last=False)
+        return items, keys
+
+    def list_directory(self, rel_path: str = '', cursor: Optional[str] = None,
+                       limit: int = LISTING_PAGE_SIZE) -> Dict[str, Any]:
+        """디렉토리 한 단계 목록의 한 페이지 (블로킹 I/O, 비동기 서버에서는 스레드에서 호출)"""
+        if not 1 <= limit <= MAX_LISTING_PAGE_SIZE:
+            raise ValueError(f"limit은 1~{MAX_LISTING_PAGE_SIZE} 사이여야 합니다: {limit}")
+        rel_path = (rel_path or '').replace('\\', '/').strip('/')
+        self.resolve(rel_path)
+        items, keys = self._listing(rel_path)
+
+        start = 0
+        if cursor:
+            kind, _, name = decode_cursor(cursor).partition('/')
+            start = bisect.bisect_right(keys, (int(kind) if kind.isdigit() else 0, name))
+        page = items[start:start + limit]
+        has_more = start + limit < len(items)
+        return {
+            'path': rel_path,
+            'entries': page,
+            'count': len(page),
+            'total': len(items),
+            'next_cursor': encode_cursor(_cursor_key(_sort_key(page[-1]))) if has_more and page else None
+        }
+
+    def invalidate(self, rel_path: Optional[str] = None) -> None:
+        """목록 캐시 무효화 (rel_path가 없으면 전체)"""
+        with self._lock:
+            if rel_path is None:
+                self._listings.clear()
+            else:
+                self._listings.pop(rel_path.replace('\\', '/').strip('/'), None)
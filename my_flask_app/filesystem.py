@@ -0,0 +1,619 @@
+# my_flask_app/filesystem.py
+# 스캔 코드가 사용하는 파일 시스템 추상화: 로컬(os), 트리 덤프, 메모리, 지연 시간 시뮬레이션 래퍼
+#
+# get_data.scan_directory, ProjectDocumentSearcher, AuditService, folder_fingerprint는 os 함수를
+# 직접 부르지 않고 여기의 FileSystem 객체(services.get('filesystem'))를 사용한다.
+# 실제 T: 드라이브 없이도 덤프해 둔 폴더 구조 + 호출당 지연 시간으로 SMB와 비슷한 조건을 재현할 수 있다.
+
+import os
+import json
+import time
+import errno
+import random
+import posixpath
+import threading
+import logging
+from abc import ABC, abstractmethod
+from collections import Counter
+from stat import S_IFDIR, S_IFREG, S_ISDIR, S_ISREG
+from typing import Dict, Any, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+class FileStat(NamedTuple):
+    """os.stat_result 중 스캔 코드가 사용하는 필드"""
+    st_mode: int
+    st_size: int
+    st_mtime: float
+    st_mtime_ns: int
+
+
+class FileSystem(ABC):
+    """파일 시스템 인터페이스 (하위 클래스는 scandir과 stat만 구현하면 나머지는 기본 구현 사용)
+
+    scandir()은 os.DirEntry와 같은 속성(name, path, is_dir(), is_file(), stat())을 가진 항목의 리스트를 반환한다.
+    """
+
+    @abstractmethod
+    def scandir(self, path: str) -> List[Any]:
+        ...
+
+    @abstractmethod
+    def stat(self, path: str):
+        ...
+
+    def exists(self, path: str) -> bool:
+        try:
+            self.stat(path)
+            return True
+        except OSError:
+            return False
+
+    def isdir(self, path: str) -> bool:
+        try:
+            return S_ISDIR(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def isfile(self, path: str) -> bool:
+        try:
+            return S_ISREG(self.stat(path).st_mode)
+        except OSError:
+            return False
+
+    def listdir(self, path: str) -> List[str]:
+        return [entry.name for entry in self.scandir(path)]
+
+
+class LocalFileSystem(FileSystem):
+    """os 모듈을 그대로 사용하는 기본 구현"""
+
+    def scandir(self, path: str) -> List[os.DirEntry]:
+        with os.scandir(path) as it:
+            return list(it)
+
+    def stat(self, path: str):
+        return os.stat(path)
+
+    def exists(self, path: str) -> bool:
+        return os.path.exists(path)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(path)
+
+    def isfile(self, path: str) -> bool:
+        return os.path.isfile(path)
+
+    def listdir(self, path: str) -> List[str]:
+        return os.listdir(path)
+
+
+class _Node:
+    __slots__ = ('children', 'size', 'mtime_ns')
+
+    def __init__(self, is_dir: bool, size: int = 0, mtime_ns: int = 0):
+        self.children: Optional[Dict[str, '_Node']] = {} if is_dir else None
+        self.size = size
+        self.mtime_ns = mtime_ns
+
+    def stat(self) -> FileStat:
+        mode = S_IFDIR | 0o755 if self.children is not None else S_IFREG | 0o644
+        return FileStat(mode, self.size, self.mtime_ns / 1e9, self.mtime_ns)
+
+
+class MemoryDirEntry:
+    """os.DirEntry와 같은 방식으로 쓰는 메모리 항목"""
+    __slots__ = ('name', 'path', '_node')
+
+    def __init__(self, name: str, path: str, node: _Node):
+        self.name = name
+        self.path = path
+        self._node = node
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self._node.children is not None
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self._node.children is None
+
+    def is_symlink(self) -> bool:
+        return False
+
+    def stat(self, follow_symlinks: bool = True) -> FileStat:
+        return self._node.stat()
+
+    def __fspath__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"<MemoryDirEntry {self.name!r}>"
+
+
+def _split(path: str) -> List[str]:
+    """경로를 구성 요소로 분리 (\\와 / 모두 구분자로 취급, 'T:' 같은 드라이브도 하나의 구성 요소)"""
+    normalized = posixpath.normpath(str(path).replace('\\', '/'))
+    parts = [part for part in normalized.split('/') if part and part != '.']
+    # Windows에서 os.path.join('T:', 'x')는 'T:x'이므로 드라이브를 따로 분리
+    if parts and len(parts[0]) > 2 and parts[0][1] == ':' and parts[0][0].isalpha():
+        parts[0:1] = [parts[0][:2], parts[0][2:]]
+    return parts
+
+
+class MemoryFileSystem(FileSystem):
+    """메모리에 폴더 구조를 두는 구현 (테스트, 벤치마크용)
+
+    항목을 추가/삭제하면 실제 파일 시스템처럼 상위 폴더의 mtime이 바뀐다.
+    """
+
+    def __init__(self):
+        self._root = _Node(True)
+        self._lock = threading.RLock()
+
+    def _lookup(self, path: str) -> _Node:
+        node = self._root
+        for part in _split(path):
+            if node.children is None:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), str(path))
+            node = node.children.get(part)
+            if node is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+        return node
+
+    def _add(self, path: str, is_dir: bool, size: int, mtime: Optional[float]) -> _Node:
+        mtime_ns = int((time.time() if mtime is None else mtime) * 1e9)
+        parts = _split(path)
+        if not parts:
+            return self._root
+        with self._lock:
+            node = self._root
+            for part in parts[:-1]:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _Node(True, mtime_ns=mtime_ns)
+                elif child.children is None:
+                    raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), str(path))
+                node = child
+            existing = node.children.get(parts[-1])
+            if existing is not None and is_dir and existing.children is not None:
+                return existing
+            new = node.children[parts[-1]] = _Node(is_dir, size, mtime_ns)
+            node.mtime_ns = max(node.mtime_ns, mtime_ns)
+            return new
+
+    def add_dir(self, path: str, mtime: Optional[float] = None) -> None:
+        """폴더 추가 (상위 폴더가 없으면 함께 생성)"""
+        self._add(path, True, 0, mtime)
+
+    def add_file(self, path: str, size: int = 0, mtime: Optional[float] = None) -> None:
+        """파일 추가 (상위 폴더가 없으면 함께 생성)"""
+        self._add(path, False, size, mtime)
+
+    def remove(self, path: str) -> None:
+        """파일 또는 폴더(하위 항목 포함) 삭제"""
+        parts = _split(path)
+        with self._lock:
+            parent = self._lookup('/'.join(parts[:-1]))
+            if parent.children is None or parts[-1] not in parent.children:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+            del parent.children[parts[-1]]
+            parent.mtime_ns = time.time_ns()
+
+    def scandir(self, path: str) -> List[MemoryDirEntry]:
+        with self._lock:
+            node = self._lookup(path)
+            if node.children is None:
+                raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), str(path))
+            return [MemoryDirEntry(name, os.path.join(path, name), child) for name, child in node.children.items()]
+
+    def stat(self, path: str) -> FileStat:
+        with self._lock:
+            return self._lookup(path).stat()
+
+
+def _dump_record(rel_path: str, is_dir: bool, size: int, mtime: float) -> Dict[str, Any]:
+    record = {'path': rel_path, 'type': 'dir' if is_dir else 'file', 'mtime': round(mtime, 3)}
+    if not is_dir:
+        record['size'] = size
+    return record
+
+
+def dump_tree(fs: FileSystem, root: str, output_path: str, max_depth: Optional[int] = None) -> int:
+    """root 아래 폴더 구조를 JSONL 트리 덤프로 저장하고 항목 수 반환
+
+    첫 줄은 {"root": 원래 루트}, 이후 한 줄에 한 항목 {"path", "type", "size", "mtime"} (path는 root 기준, / 구분).
+    """
+    count = 0
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'root': root}, ensure_ascii=False) + '\n')
+        stack = [(root, '', 0)]
+        while stack:
+            current, rel_path, depth = stack.pop()
+            try:
+                entries = sorted(fs.scandir(current), key=lambda e: e.name, reverse=True)
+            except OSError as e:
+                logger.warning(f"트리 덤프 중 접근 실패 {current}: {str(e)}")
+                continue
+            for entry in entries:
+                child_path = f"{rel_path}/{entry.name}" if rel_path else entry.name
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    stat = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                f.write(json.dumps(_dump_record(child_path, is_dir, stat.st_size, stat.st_mtime), ensure_ascii=False) + '\n')
+                count += 1
+                if is_dir and (max_depth is None or depth < max_depth):
+                    stack.append((entry.path, child_path, depth + 1))
+    return count
+
+
+# Windows `tree /f` 출력의 들여쓰기 단위 (한글 콘솔은 선 문자가 2칸이라 '│  ', '├─' 형태)
+_TREE_MARKERS = ('├───', '└───', '+---', '\\---', '├─', '└─')
+_TREE_WIDE_MARKERS = ('├───', '└───', '+---', '\\---')
+
+
+def _read_text_lines(path: str) -> List[str]:
+    """덤프 파일을 줄 단위로 읽기 (tree 명령의 UTF-16, cp949 출력도 처리)"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if raw.startswith((b'\xff\xfe', b'\xfe\xff')):
+        text = raw.decode('utf-16')
+    else:
+        try:
+            text = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            text = raw.decode('cp949', errors='replace')
+    return text.splitlines()
+
+
+class TreeDumpFileSystem(MemoryFileSystem):
+    """트리 덤프 파일을 읽어 만든 메모리 파일 시스템
+
+    - JSONL (dump_tree 형식): 크기와 mtime까지 복원, 덤프의 root 아래에 배치
+    - Windows `tree /f` 출력 (예: 저장소의 tree.txt): 폴더/파일 구조만 복원, 루트 줄(T:. 등) 아래에 배치
+    - 경로 목록 (dir /s /b, find 출력 등): 구분자로 끝나는 경로와 중간 경로는 폴더, 나머지는 파일
+    mount를 지정하면 덤프의 루트 대신 그 경로 아래에 배치한다.
+    """
+
+    def __init__(self, dump_path: str, mount: Optional[str] = None):
+        super().__init__()
+        self.dump_path = dump_path
+        self.root = mount
+        self.entries = 0
+        start = time.time()
+        lines = _read_text_lines(dump_path)
+        first = next((line for line in lines if line.strip()), '')
+        if first.lstrip().startswith('{'):
+            self._load_jsonl(lines, mount)
+        elif any(line.lstrip('│| ').startswith(_TREE_MARKERS) for line in lines):
+            self._load_tree(lines, mount)
+        else:
+            self._load_paths(lines, mount)
+        logger.info(f"트리 덤프 로드: {dump_path} ({self.entries}개 항목, 루트 {self.root}, {time.time() - start:.2f}초)")
+
+    def _add_entry(self, path: str, is_dir: bool, size: int = 0, mtime: float = 0) -> None:
+        if is_dir:
+            self.add_dir(path, mtime)
+        else:
+            self.add_file(path, size, mtime)
+        self.entries += 1
+
+    def _load_jsonl(self, lines: List[str], mount: Optional[str]) -> None:
+        records = [json.loads(line) for line in lines if line.strip()]
+        if records and 'root' in records[0] and 'path' not in records[0]:
+            self.root = mount or records.pop(0)['root']
+        self.root = self.root or ''
+        self.add_dir(self.root)
+        for record in records:
+            self._add_entry(posixpath.join(self.root.replace('\\', '/'), record['path']),
+                            record.get('type') == 'dir', record.get('size', 0), record.get('mtime', 0))
+
+    def _load_tree(self, lines: List[str], mount: Optional[str]) -> None:
+        wide = any(marker in line for line in lines for marker in _TREE_WIDE_MARKERS)
+        pipe_units = ('│   ', '|   ') if wide else ('│  ',)
+        stack: List[str] = []
+        root = None
+        for line in lines:
+            if root is None:
+                # 볼륨 정보 줄 다음의 루트 줄 ('T:.', 'C:\\DATA' 등), 구조 줄이 나오기 전 마지막 줄
+                if line.strip() and not line.startswith(pipe_units + ('    ',) + _TREE_MARKERS):
+                    self.root = mount or line.strip().rstrip('.')
+                    continue
+                root = self.root or ''
+                self.add_dir(root)
+            pos, depth, marker = 0, 0, False
+            while True:
+                unit = next((u for u in pipe_units + ('    ',) + _TREE_MARKERS if line.startswith(u, pos)), None)
+                if unit is None:
+                    break
+                pos += len(unit)
+                if unit in _TREE_MARKERS:
+                    marker = True
+                    break
+                depth += 1
+            name = line[pos:].strip()
+            if not name:
+                continue
+            if marker:
+                stack = stack[:depth] + [name]
+                self._add_entry(posixpath.join(root, *stack), True)
+            else:
+                # 파일 줄은 폴더 깊이 + 하위 폴더 유무 표시 한 칸
+                self._add_entry(posixpath.join(root, *stack[:max(depth - 1, 0)], name), False)
+
+    def _load_paths(self, lines: List[str], mount: Optional[str]) -> None:
+        base = (mount or '').replace('\\', '/')
+        for line in lines:
+            if not line.strip():
+                continue
+            full_path = posixpath.join(base, line.replace('\\', '/')) if base else line
+            self._add_entry(full_path, line.endswith(('/', '\\')))
+        if self.root is None:
+            names = list(self._root.children)
+            self.root = names[0] if len(names) == 1 else ''
+
+
+class LatencyFileSystem(FileSystem):
+    """다른 FileSystem을 감싸 호출마다 지연 시간을 더하고 호출 수를 세는 래퍼
+
+    latency는 모든 호출의 기본 지연(초), op_latency로 연산별(scandir, stat, exists ...) 지연을 따로 지정할 수 있다.
+    jitter는 지연에 곱해지는 무작위 비율(0.2 = ±20%)이며 seed를 주면 실행마다 같은 값을 사용한다.
+    scandir이 반환한 항목의 is_dir()/stat()은 SMB처럼 목록 조회 결과에 포함된 정보로 보고 지연을 더하지 않는다.
+    """
+
+    def __init__(self, inner: FileSystem, latency: float = 0.0, op_latency: Optional[Dict[str, float]] = None,
+                 jitter: float = 0.0, seed: Optional[int] = None):
+        self.inner = inner
+        self.latency = latency
+        self.op_latency = dict(op_latency or {})
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls = Counter()
+        self._simulated = 0.0
+
+    def _delay(self, op: str) -> None:
+        delay = self.op_latency.get(op, self.latency)
+        with self._lock:
+            if self.jitter and delay:
+                delay *= 1 + self._random.uniform(-self.jitter, self.jitter)
+            self._calls[op] += 1
+            self._simulated += delay
+        if delay > 0:
+            time.sleep(delay)
+
+    def scandir(self, path: str) -> List[Any]:
+        self._delay('scandir')
+        return self.inner.scandir(path)
+
+    def stat(self, path: str):
+        self._delay('stat')
+        return self.inner.stat(path)
+
+    def exists(self, path: str) -> bool:
+        self._delay('exists')
+        return self.inner.exists(path)
+
+    def isdir(self, path: str) -> bool:
+        self._delay('isdir')
+        return self.inner.isdir(path)
+
+    def isfile(self, path: str) -> bool:
+        self._delay('isfile')
+        return self.inner.isfile(path)
+
+    def listdir(self, path: str) -> List[str]:
+        self._delay('listdir')
+        return self.inner.listdir(path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'calls': dict(self._calls),
+                'total_calls': sum(self._calls.values()),
+                'simulated_seconds': round(self._simulated, 3)
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._simulated = 0.0
+
+
+def index_key(path: str) -> str:
+    """IndexedFileSystem/ShareWatcher가 같은 경로를 같은 키로 찾도록 정규화 (구분자 통일, Windows는 대소문자 무시)"""
+    return os.path.normcase('/'.join(_split(path)))
+
+
+class IndexedFileSystem(FileSystem):
+    """감시 중인 루트 아래의 scandir/stat 결과를 메모리에 보관하는 래퍼
+
+    ShareWatcher가 생성/삭제/이름변경 이벤트로 바뀐 폴더만 다시 읽거나(refresh) 버리므로(invalidate)
+    감사는 공유 폴더를 다시 스캔하지 않고 메모리 상태로 답한다. 감시하지 않는 경로는 캐시하지 않고 그대로 전달한다.
+    """
+
+    def __init__(self, inner: FileSystem):
+        self.inner = inner
+        self._roots = set()
+        # 폴더 키 -> (원래 경로, 목록을 읽기 직전 폴더 mtime_ns, 항목 리스트)
+        self._listings: Dict[str, Any] = {}
+        # 경로 키 -> stat 결과 (없는 경로는 None)
+        self._stats: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    def add_root(self, path: str) -> None:
+        with self._lock:
+            self._roots.add(index_key(path))
+
+    def remove_root(self, path: str) -> None:
+        key = index_key(path)
+        with self._lock:
+            self._roots.discard(key)
+        self.invalidate_tree(path)
+
+    def roots(self) -> List[str]:
+        with self._lock:
+            return sorted(self._roots)
+
+    def _watched_key(self, path: str) -> Optional[str]:
+        key = index_key(path)
+        parts = key.split('/')
+        for i in range(len(parts), 0, -1):
+            if '/'.join(parts[:i]) in self._roots:
+                return key
+        return None
+
+    def scandir(self, path: str) -> List[Any]:
+        key = self._watched_key(path)
+        if key is None:
+            return self.inner.scandir(path)
+        with self._lock:
+            listing = self._listings.get(key)
+        if listing is not None:
+            self.hits += 1
+            return list(listing[2])
+        self.misses += 1
+        # mtime을 먼저 읽어 두면 목록을 읽는 도중 바뀐 경우에도 revalidate()에서 다시 읽게 된다
+        mtime_ns = self.inner.stat(path).st_mtime_ns
+        entries = list(self.inner.scandir(path))
+        with self._lock:
+            self._listings[key] = (path, mtime_ns, entries)
+        return list(entries)
+
+    def stat(self, path: str):
+        key = self._watched_key(path)
+        # 루트 자체는 상위 폴더를 감시하지 않아 생성/삭제를 알 수 없으므로 캐시하지 않음
+        if key is None or key in self._roots:
+            return self.inner.stat(path)
+        with self._lock:
+            cached = self._stats.get(key, False)
+        if cached is not False:
+            self.hits += 1
+            if cached is None:
+                raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+            return cached
+        self.misses += 1
+        try:
+            result = self.inner.stat(path)
+        except FileNotFoundError:
+            result = None
+        with self._lock:
+            self._stats[key] = result
+        if result is None:
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), str(path))
+        return result
+
+    def refresh(self, path: str) -> Tuple[Set[str], Set[str]]:
+        """캐시된 폴더 목록을 다시 읽고 (추가된 이름, 삭제된 이름) 반환 (캐시에 없던 폴더는 읽지 않음)"""
+        key = index_key(path)
+        with self._lock:
+            listing = self._listings.get(key)
+            self._stats.pop(key, None)
+        if listing is None:
+            return set(), set()
+        before = {entry.name for entry in listing[2]}
+        try:
+            mtime_ns = self.inner.stat(path).st_mtime_ns
+            entries = list(self.inner.scandir(path))
+        except OSError:
+            self.invalidate_tree(path)
+            return set(), before
+        after = {entry.name for entry in entries}
+        with self._lock:
+            self._listings[key] = (path, mtime_ns, entries)
+            for name in before ^ after:
+                self._stats.pop(f"{key}/{os.path.normcase(name)}", None)
+        return after - before, before - after
+
+    def invalidate(self, path: str) -> None:
+        """경로 하나의 stat과 (폴더라면) 목록을 버림"""
+        key = index_key(path)
+        with self._lock:
+            self._stats.pop(key, None)
+            self._listings.pop(key, None)
+
+    def invalidate_tree(self, path: str) -> None:
+        """경로와 그 아래의 모든 캐시를 버림 (삭제/이동된 폴더)"""
+        key = index_key(path)
+        prefix = key + '/'
+        with self._lock:
+            for cache in (self._stats, self._listings):
+                for cached_key in [k for k in cache if k == key or k.startswith(prefix)]:
+                    del cache[cached_key]
+
+    def cached_dirs(self, path: Optional[str] = None) -> List[str]:
+        """캐시된 폴더 경로 목록 (path를 주면 그 아래만)"""
+        with self._lock:
+            items = [(key, listing[0]) for key, listing in self._listings.items()]
+        if path is None:
+            return [cached_path for _, cached_path in items]
+        key = index_key(path)
+        return [cached_path for k, cached_path in items if k == key or k.startswith(key + '/')]
+
+    def changed_dirs(self, path: Optional[str] = None) -> List[str]:
+        """캐시된 폴더 중 mtime이 바뀌었거나 사라진 폴더 (stat만 사용, 목록은 다시 읽지 않음)"""
+        changed = []
+        for cached_path in self.cached_dirs(path):
+            with self._lock:
+                listing = self._listings.get(index_key(cached_path))
+            if listing is None:
+                continue
+            try:
+                mtime_ns = self.inner.stat(cached_path).st_mtime_ns
+            except OSError:
+                mtime_ns = None
+            if mtime_ns != listing[1]:
+                changed.append(cached_path)
+        return changed
+
+    def revalidate(self, path: Optional[str] = None) -> List[Tuple[str, Set[str], Set[str]]]:
+        """mtime이 바뀐 캐시 폴더만 다시 읽고 (경로, 추가된 이름, 삭제된 이름) 목록 반환 (이벤트 유실 시 대상 재검색)"""
+        return [(changed_path, *self.refresh(changed_path)) for changed_path in self.changed_dirs(path)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._listings.clear()
+            self._stats.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'roots': len(self._roots),
+                'cached_dirs': len(self._listings),
+                'cached_stats': len(self._stats),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+def create_filesystem(tree_dump: Optional[str] = None, mount: Optional[str] = None,
+                      latency_ms: float = 0.0, indexed: bool = False) -> FileSystem:
+    """설정에 따른 파일 시스템 생성 (덤프가 없으면 로컬, 지연 시간이 있으면 래퍼 추가, indexed면 메모리 인덱스 추가)"""
+    fs: FileSystem = TreeDumpFileSystem(tree_dump, mount) if tree_dump else LocalFileSystem()
+    if latency_ms:
+        fs = LatencyFileSystem(fs, latency=latency_ms / 1000)
+    if indexed:
+        fs = IndexedFileSystem(fs)
+    return fs
+
+
+if __name__ == '__main__':
+    import argparse
+    from config import configure_logging, get_network_drive
+    configure_logging()
+    parser = argparse.ArgumentParser(description="폴더 구조를 트리 덤프(JSONL)로 저장")
+    parser.add_argument('root', nargs='?', default=None, help="덤프할 루트 (기본: 네트워크 드라이브)")
+    parser.add_argument('--output', type=str, required=True, help="저장할 덤프 파일 경로")
+    parser.add_argument('--max-depth', type=int, default=None, help="내려갈 최대 깊이")
+    args = parser.parse_args()
+
+    root = args.root or get_network_drive(verbose=True)
+    start = time.time()
+    count = dump_tree(LocalFileSystem(), root, args.output, args.max_depth)
+    print(f"{root}: {count}개 항목을 {args.output}에 저장 ({time.time() - start:.1f}초)")
+
+# python filesystem.py --output ../static/data/tree_dump.jsonl
+# python filesystem.py T:/01010_도로 --output ../benchmarks/data/road.jsonl --max-depth 4
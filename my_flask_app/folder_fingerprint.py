@@ -0,0 +1,68 @@
+# my_flask_app/folder_fingerprint.py
+# 프로젝트 폴더 변경 여부 판단용 지문(fingerprint) 계산
+
+import os
+import hashlib
+import logging
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# 지문 계산 시 내려갈 최대 깊이 (0 = 프로젝트 폴더 자체만)
+FINGERPRINT_MAX_DEPTH = int(os.getenv('FINGERPRINT_MAX_DEPTH', '3'))
+
+
+def compute_folder_fingerprint(path: str, max_depth: int = FINGERPRINT_MAX_DEPTH, fs=None) -> Optional[Dict[str, Any]]:
+    """얕은 디렉토리 순회로 폴더 지문 계산
+
+    각 디렉토리의 (상대 경로, mtime, 하위 파일 수, 하위 폴더 수)를 정렬된 순서로
+    해시한다. 디렉토리 mtime은 바로 아래 항목이 생성/삭제/이름변경될 때 바뀌므로
+    파일 내용을 읽지 않고도 max_depth 이내의 구조 변경을 감지할 수 있다.
+    폴더가 없으면 None을 반환한다. fs를 주지 않으면 로컬 파일 시스템(os)을 사용한다.
+    """
+    if fs is None:
+        from filesystem import LocalFileSystem
+        fs = LocalFileSystem()
+    if not path or not fs.isdir(path):
+        return None
+
+    digest = hashlib.sha1()
+    total_dirs = 0
+    total_files = 0
+    latest_mtime = 0
+    stack = [(path, 0)]
+    while stack:
+        current, depth = stack.pop()
+        try:
+            stat = fs.stat(current)
+            entries = sorted(fs.scandir(current), key=lambda e: e.name)
+        except OSError as e:
+            logger.debug(f"지문 계산 중 접근 실패 {current}: {str(e)}")
+            continue
+
+        sub_dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+        file_count = len(entries) - len(sub_dirs)
+        rel_path = os.path.relpath(current, path)
+        digest.update(f"{rel_path}|{stat.st_mtime_ns}|{file_count}|{len(sub_dirs)}\n".encode('utf-8'))
+
+        total_dirs += 1
+        total_files += file_count
+        latest_mtime = max(latest_mtime, stat.st_mtime)
+        if depth < max_depth:
+            # 정렬된 순서를 유지하도록 역순으로 스택에 넣음
+            stack.extend((entry.path, depth + 1) for entry in reversed(sub_dirs))
+
+    return {
+        'hash': digest.hexdigest(),
+        'dirs': total_dirs,
+        'files': total_files,
+        'latest_mtime': latest_mtime,
+        'max_depth': max_depth
+    }
+
+
+def fingerprint_matches(saved: Optional[Dict[str, Any]], current: Optional[Dict[str, Any]]) -> bool:
+    """저장된 지문과 현재 지문이 같은 조건(깊이)에서 계산되어 일치하는지"""
+    if not saved or not current:
+        return False
+    return saved.get('max_depth') == current.get('max_depth') and saved.get('hash') == current.get('hash')
@@ -1,7 +1,6 @@
 # -*- coding: utf-8 -*-
 
 # my_flask_app/gemini.py
-import google.generativeai as genai
 import os
 import asyncio
 import hashlib
@@ -9,21 +8,15 @@ import aiohttp
 from datetime import datetime, timedelta
 from typing import List, Dict
 from functools import lru_cache
-from config import GOOGLE_API_KEY, DISCORD_WEBHOOK_URL, DOCUMENT_TYPES, AUDIT_FILTERS
+from config import DISCORD_WEBHOOK_URL, DOCUMENT_TYPES, AUDIT_FILTERS
 import requests
 import logging
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
-# Gemini 설정
-genai.configure(api_key=GOOGLE_API_KEY)
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Gemini 모델은 첫 호출 시 생성 (google.generativeai 임포트가 느림)
+from services import services
+from metrics import AI_CALL_SECONDS, timed
 
 # 캐시 및 rate limit 설정
 _analysis_cache = {}
@@ -104,10 +97,11 @@ class DocumentAnalyzer:
         for attempt in range(max_retries):
             try:
                 await self._wait_for_rate_limit()
-                response = await asyncio.to_thread(model.generate_content, prompt)
+                with timed(AI_CALL_SECONDS, provider='gemini'):
+                    response = await asyncio.to_thread(services.get('gemini_model').generate_content, prompt)
                 return response.text
             except Exception as e:
-                logger.error(f"Gemini API 호출 실패 (시도 {attempt + 1}/{max_retries}): {str(e)}")
+                logger.error("Gemini API 호출 실패 (시도 %s/%s): %s", attempt + 1, max_retries, e)
                 if attempt < max_retries - 1:
                     await asyncio.sleep(1 * (attempt + 1))  # 재시도 전 지연
                 else:
@@ -138,13 +132,13 @@ class DocumentAnalyzer:
             csv_data = project_data.get('csv_data', {})
 
             # 디버깅: Gemini AI에 전달되는 데이터 출력
-            logger.debug(f"Gemini AI에 전달되는 project_data: {project_data}")
-            logger.debug(f"Gemini AI에 전달되는 documents: {documents}")
-            logger.debug(f"Gemini AI에 전달되는 CSV 데이터: {csv_data}")
+            logger.debug("Gemini AI에 전달되는 project_data: %s", project_data)
+            logger.debug("Gemini AI에 전달되는 documents: %s", documents)
+            logger.debug("Gemini AI에 전달되는 CSV 데이터: %s", csv_data)
 
             # 문서 상태 분석 (documents가 딕셔너리 형식이 아닌 경우 처리)
             if not isinstance(documents, dict):
-                logger.error(f"Invalid documents format: {documents}")
+                logger.error("Invalid documents format: %s", documents)
                 documents = {}  # 빈 딕셔너리로 초기화
 
             existing_docs = []
@@ -165,7 +159,7 @@ class DocumentAnalyzer:
                         'details': [{'name': path} for path in doc_data.get('details', []) if isinstance(path, (str, dict))]
                     }
                 else:
-                    logger.warning(f"Unknown documents format for {doc_type}: {doc_data}")
+                    logger.warning("Unknown documents format for %s: %s", doc_type, doc_data)
                     processed_documents[doc_type] = {
                         'exists': False,
                         'details': []
@@ -179,7 +173,7 @@ class DocumentAnalyzer:
                     missing_docs.append(f"{doc_name} (0개)")  # 발견되지 않은 문서는 0개로 표시
 
             # 디버깅: 처리된 documents 출력
-            logger.debug(f"Processed documents for project {project_id}: {processed_documents}")
+            logger.debug("Processed documents for project %s: %s", project_id, processed_documents)
 
             # 오프라인 위험도 계산 (상태와 주관사/비주관사 반영)
             risk_score = self.calculate_risk_score(tuple(doc_type for doc_type, info in processed_documents.items() if not info['exists']), status, contractor)
@@ -211,7 +205,7 @@ class DocumentAnalyzer:
 """
             cache_key = self._generate_cache_key(project_id, processed_documents)
             if cache_key in self._cache:
-                logger.debug(f"캐시에서 결과 반환: {cache_key}")
+                logger.debug("캐시에서 결과 반환: %s", cache_key)
                 return self._cache[cache_key]
 
             # Gemini API 호출
@@ -236,9 +230,9 @@ class DocumentAnalyzer:
                     async with session.post(DISCORD_WEBHOOK_URL, json={'content': notification}, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                         await resp.read()
                 except Exception as e:
-                    logger.error(f"Discord 알림 실패: {str(e)}")
+                    logger.error("Discord 알림 실패: %s", e)
 
-            logger.info(f"프로젝트 {project_id} 분석 완료, 위험도: {risk_score}/100")
+            logger.info("프로젝트 %s 분석 완료, 위험도: %s/100", project_id, risk_score)
             return analysis
 
         except Exception as e:
@@ -249,7 +243,7 @@ class DocumentAnalyzer:
                     async with session.post(DISCORD_WEBHOOK_URL, json={'content': f"❌ {error_msg}"}, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                         await resp.read()
                 except Exception as discord_e:
-                    logger.error(f"Discord 에러 알림 실패: {str(discord_e)}")
+                    logger.error("Discord 에러 알림 실패: %s", discord_e)
             return error_msg
 
         finally:
@@ -261,7 +255,7 @@ class DocumentAnalyzer:
         await asyncio.sleep(delay_seconds)
         if cache_key in self._cache:
             del self._cache[cache_key]
-            logger.debug(f"캐시 삭제: {cache_key}")
+            logger.debug("캐시 삭제: %s", cache_key)
 
     def clear_cache(self):
         """캐시 초기화"""
@@ -288,6 +282,9 @@ def clear_analysis_cache():
 
 # 테스트 코드
 if __name__ == "__main__":
+    from config import configure_logging
+    configure_logging()
+
     async def test():
         # 실제 project_id="20180076" 데이터로 테스트
         test_data = {
@@ -341,7 +338,7 @@ if __name__ == "__main__":
             result = await analyze_with_gemini(test_data)
             logger.info(result)
         except Exception as e:
-            logger.error(f"테스트 실패: {str(e)}")
+            logger.error("테스트 실패: %s", e)
         finally:
             await analyzer.close()
 
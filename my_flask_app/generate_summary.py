@@ -10,17 +10,12 @@ import logging
 import ast
 import asyncio
 
-from config import STATIC_DATA_PATH, PROJECT_LIST_CSV, NETWORK_BASE_PATH, STATIC_PATH
+from config import STATIC_DATA_PATH, PROJECT_LIST_CSV, STATIC_PATH
 from config_assets import DOCUMENT_TYPES
 import argparse
-from git_operations import sync_files_to_github  # git_operations 임포트
+from sync_scheduler import sync_scheduler
+from columnar_export import write_columnar_report
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
 def load_audit_results(results_dir, verbose=False):
@@ -163,7 +158,16 @@ async def generate_combined_report(results_dir, output_path, verbose=False):
         final_output_path = os.path.join(os.path.dirname(output_path), output_filename)
         
         os.makedirs(os.path.dirname(final_output_path), exist_ok=True)
-        merged_df.to_csv(final_output_path, index=False, encoding='utf-8-sig')
+        # 임시 파일에 쓴 뒤 교체하여 API 서버가 쓰는 도중의 파일을 읽지 않도록 함
+        tmp_output_path = f"{final_output_path}.tmp"
+        merged_df.to_csv(tmp_output_path, index=False, encoding='utf-8-sig')
+        os.replace(tmp_output_path, final_output_path)
+        
+        # 클라이언트용 열 기반 파일(Arrow/Parquet) 생성, 실패해도 CSV 보고서는 유지
+        try:
+            await asyncio.to_thread(write_columnar_report, final_output_path)
+        except Exception as e:
+            logger.warning(f"열 기반 보고서 생성 실패: {str(e)}")
         
         logger.info(f"\n=== 통합 보고서 생성 완료 ===")
         logger.info(f"생성된 보고서: {final_output_path}")
@@ -175,9 +179,9 @@ async def generate_combined_report(results_dir, output_path, verbose=False):
         logger.info(f"종료 시간: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         logger.info("="*50)
         
-        # 생성된 파일을 GitHub에 업로드
-        await sync_files_to_github(final_output_path)
-        logger.info(f"✅ 통합 보고서 GitHub에 업로드 완료: {final_output_path}")
+        # GitHub 업로드는 백그라운드 스케줄러가 다른 변경과 묶어서 처리 (여기서는 기다리지 않음)
+        sync_scheduler.mark_dirty(final_output_path)
+        logger.info(f"통합 보고서 GitHub 동기화 예약: {final_output_path}")
         
         return final_output_path
     except Exception as e:
@@ -185,9 +189,14 @@ async def generate_combined_report(results_dir, output_path, verbose=False):
         return None
 
 async def main(results_dir, output_path, verbose=False):
-    return await generate_combined_report(results_dir, output_path, verbose)
+    result = await generate_combined_report(results_dir, output_path, verbose)
+    # 단독 실행 시에는 스케줄러가 없으므로 종료 전에 바로 동기화
+    await sync_scheduler.flush()
+    return result
 
 if __name__ == "__main__":
+    from config import configure_logging
+    configure_logging()
     parser = argparse.ArgumentParser(description="Generate combined report of audit targets and results")
     parser.add_argument('--results-dir', type=str, default=os.path.join(os.path.dirname(STATIC_DATA_PATH), 'results'), help="Directory of audit results JSON files")
     parser.add_argument('--output', type=str, default=os.path.join(os.path.dirname(STATIC_DATA_PATH), 'report', 'combined_report'), help="Output CSV file path prefix (date will be appended)")
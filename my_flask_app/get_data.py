@@ -7,7 +7,9 @@ import re
 import csv
 import pandas as pd
 from config_assets import SCAN_CONFIG, FORCE_SCAN_CONFIG
-from config import PROJECT_LIST_CSV, STATIC_DATA_PATH, NETWORK_BASE_PATH, DEPART_LIST_PATH
+from config import PROJECT_LIST_CSV, STATIC_DATA_PATH, DEPART_LIST_PATH, get_network_drive
+from services import services
+from metrics import DIR_SCAN_SECONDS
 
 # 경로 설정
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -20,12 +22,13 @@ PROJECT_ID_PATTERN = re.compile(r'(?:^|[^\d])((?:199|20[0-2])\d\d{4})(?:[^\d]|$)
 PROJECT_YEAR_SEQ = re.compile(r'((?:199|20[0-2])\d)[^0-9]*(\d{2,3})(?:[^\d]|$)')
 PROJECT_YEAR_DASH_SEQ = re.compile(r'((?:199|20[0-2])\d)-(\d{4})')  # 2023-0104 형식용
 
-def check_network_drive(drive_path):
+def check_network_drive(drive_path, fs=None):
+    fs = fs if fs is not None else services.get('filesystem')
     try:
-        if not os.path.exists(drive_path):
+        if not fs.exists(drive_path):
             print(f"Network drive not found: {drive_path}")
             return False
-        os.listdir(drive_path)
+        fs.listdir(drive_path)
         return True
     except Exception as e:
         print(f"Network drive check failed: {str(e)}")
@@ -87,7 +90,11 @@ def extract_project_id(folder_name, verbose=False):
     
     return None
 
-def scan_directory(path, current_depth=0, verbose=False, scanned_folders=None):
+def scan_directory(path, current_depth=0, verbose=False, scanned_folders=None, fs=None):
+    # fs: 폴더 조회에 사용할 파일 시스템 (기본: services의 공용 파일 시스템, 벤치마크에서는 메모리/지연 래퍼)
+    if fs is None:
+        fs = services.get('filesystem')
+
     if current_depth > SCAN_CONFIG['max_category_depth']:
         return []
     
@@ -101,10 +108,11 @@ def scan_directory(path, current_depth=0, verbose=False, scanned_folders=None):
     projects = []
     
     try:
-        items = os.listdir(path)
+        with DIR_SCAN_SECONDS.time(source='project_list'):
+            items = fs.listdir(path)
         for item in items:
             item_path = os.path.join(path, item)
-            if not os.path.isdir(item_path):
+            if not fs.isdir(item_path):
                 continue
             
             # 전체 경로에서 프로젝트 ID 추출 시도
@@ -128,7 +136,7 @@ def scan_directory(path, current_depth=0, verbose=False, scanned_folders=None):
             
             # 키워드 기반 깊이 탐색 또는 프로젝트 하위 폴더 스캔
             if should_scan_deeper(item, verbose):
-                sub_projects = scan_directory(item_path, current_depth + 1, verbose, scanned_folders)
+                sub_projects = scan_directory(item_path, current_depth + 1, verbose, scanned_folders, fs)
                 projects.extend(sub_projects)
                 
     except Exception as e:
@@ -137,10 +145,11 @@ def scan_directory(path, current_depth=0, verbose=False, scanned_folders=None):
     
     return projects
 
-def create_project_list(root_path, target_departments=None, force_scan=False, verbose=False):
+def create_project_list(root_path, target_departments=None, force_scan=False, verbose=False, fs=None):
     print("=== Starting project list creation ===")
+    fs = fs if fs is not None else services.get('filesystem')
     
-    if not check_network_drive(root_path):
+    if not check_network_drive(root_path, fs):
         raise Exception(f"Cannot access network drive: {root_path}")
     
     os.makedirs(STATIC_DATA_PATH, exist_ok=True)
@@ -165,11 +174,11 @@ def create_project_list(root_path, target_departments=None, force_scan=False, ve
             continue
         
         print(f"\n[SCAN] {dept_folder}")
-        if not os.path.exists(dept_path):
+        if not fs.exists(dept_path):
             print(f"- Folder not found: {dept_path}")
             continue
         
-        projects = scan_directory(dept_path, verbose=verbose)
+        projects = scan_directory(dept_path, verbose=verbose, fs=fs)
         if projects:
             for project in projects:
                 relative_path = project['path'].split(':', 1)[1] if ':' in project['path'] else project['path']
@@ -200,10 +209,14 @@ def create_project_list(root_path, target_departments=None, force_scan=False, ve
     print("\n=== Project list creation completed ===")
 
 if __name__ == "__main__":
+    from config import configure_logging
+    from profiling import profile_run, add_profile_argument
+    configure_logging()
     parser = argparse.ArgumentParser(description="Generate project list from network drive")
     parser.add_argument('--force', action='store_true', help="Force full scan (currently placeholder)")
     parser.add_argument('--verbose', action='store_true', help="Enable detailed debug output")
     parser.add_argument('--department', type=str, help="Scan specific department only (e.g., 01010 for 도로부)")
+    add_profile_argument(parser)
     args = parser.parse_args()
     
     TARGET_DEPARTMENTS = [
@@ -229,18 +242,21 @@ if __name__ == "__main__":
         "99999",  # 준공
     ]
     
-    root_path = NETWORK_BASE_PATH
+    root_path = get_network_drive()
     print(f"\nNetwork drive path: {root_path}")
     
     # 특정 부서만 스캔하는 경우
     if args.department:
         target_dept = args.department.zfill(5)  # 5자리로 패딩
         print(f"Scanning only department: {target_dept}")
-        create_project_list(root_path, [target_dept], force_scan=args.force, verbose=args.verbose)
+        with profile_run(f"project_list_{target_dept}", args.profile):
+            create_project_list(root_path, [target_dept], force_scan=args.force, verbose=args.verbose)
     else:
-        create_project_list(root_path, TARGET_DEPARTMENTS, force_scan=args.force, verbose=args.verbose)
+        with profile_run("project_list", args.profile):
+            create_project_list(root_path, TARGET_DEPARTMENTS, force_scan=args.force, verbose=args.verbose)
 
 # python get_data.py
 # python get_data.py --verbose
 # python get_data.py --department 01010 --verbose  # 도로부만 스캔
-# python get_data.py --department 01010 --force --verbose  # 도로부 강제 스캔
\ No newline at end of file
+# python get_data.py --department 01010 --force --verbose  # 도로부 강제 스캔
+# python get_data.py --department 01010 --profile  # 도로부 스캔을 cProfile로 프로파일링 (static/report/profile_*.prof)
\ No newline at end of file
@@ -2,8 +2,7 @@
 
 import os
 import re
-import pandas as pd
-from config import PROJECT_LIST_CSV, NETWORK_BASE_PATH, CONTRACT_STATUS_CSV, STATIC_DATA_PATH
+from config import PROJECT_LIST_CSV, CONTRACT_STATUS_CSV, STATIC_DATA_PATH, get_network_drive
 from config_assets import DEPARTMENT_MAPPING
 import logging
 import sys
@@ -15,6 +14,9 @@ def get_project_info(project_id, department_code=None):
     numeric_project_id = re.sub(r'[^0-9]', '', str(project_id))
     if not numeric_project_id:
         return None
+    # pandas는 임포트가 느려 실제로 CSV를 읽을 때 임포트 (CLI 시작 시간 단축)
+    import pandas as pd
+
 
     # contract_status.csv에서 데이터 로드 (기본 데이터 소스)
     contract_status_path = os.path.join(STATIC_DATA_PATH, 'data', CONTRACT_STATUS_CSV)
@@ -43,7 +45,7 @@ def get_project_info(project_id, department_code=None):
                             project = project[project['department_code'].str.zfill(5) == department_code]
                         if len(project) > 0:
                             folder_row = project.iloc[0]
-                            original_folder = os.path.join(NETWORK_BASE_PATH, str(folder_row['original_folder']))
+                            original_folder = os.path.join(get_network_drive(), str(folder_row['original_folder']))
                             logger.debug(f"Found original_folder in PROJECT_LIST_CSV: {original_folder}")
                     except Exception as e:
                         logger.error(f"Error loading PROJECT_LIST_CSV: {str(e)}")
@@ -52,7 +54,7 @@ def get_project_info(project_id, department_code=None):
 
                 # original_folder가 없으면 기본 경로 생성
                 if not original_folder or not os.path.exists(original_folder):
-                    original_folder = os.path.join(NETWORK_BASE_PATH, f"{dept_code}_{dept_name}", f"{numeric_project_id}_{row['사업명']}")
+                    original_folder = os.path.join(get_network_drive(), f"{dept_code}_{dept_name}", f"{numeric_project_id}_{row['사업명']}")
                     logger.debug(f"Generated default project folder: {original_folder}")
 
                 # 경로 존재 여부 확인
@@ -102,7 +104,7 @@ def get_project_info(project_id, department_code=None):
                             project = project[project['department_code'].str.zfill(5) == department_code]
                         if len(project) > 0:
                             folder_row = project.iloc[0]
-                            original_folder = os.path.join(NETWORK_BASE_PATH, str(folder_row['original_folder']))
+                            original_folder = os.path.join(get_network_drive(), str(folder_row['original_folder']))
                             logger.debug(f"Found original_folder in PROJECT_LIST_CSV: {original_folder}")
                     except Exception as e:
                         logger.error(f"Error loading PROJECT_LIST_CSV: {str(e)}")
@@ -111,7 +113,7 @@ def get_project_info(project_id, department_code=None):
 
                 # original_folder가 없으면 기본 경로 생성
                 if not original_folder or not os.path.exists(original_folder):
-                    original_folder = os.path.join(NETWORK_BASE_PATH, f"{dept_code}_{dept_name}", f"{numeric_project_id}_{row.get('ProjectName', f'Project {numeric_project_id}')}")
+                    original_folder = os.path.join(get_network_drive(), f"{dept_code}_{dept_name}", f"{numeric_project_id}_{row.get('ProjectName', f'Project {numeric_project_id}')}")
                     logger.debug(f"Generated default project folder: {original_folder}")
 
                 # 경로 존재 여부 확인
@@ -136,7 +138,7 @@ def get_project_info(project_id, department_code=None):
         logger.error(f"audit_targets_new.csv not found: {audit_targets_path}")
 
     # 기본값 반환 (정보가 없는 경우)
-    default_path = os.path.join(NETWORK_BASE_PATH, f"{department_code or '01010'}_Unknown", f"{numeric_project_id}_Project {numeric_project_id}")
+    default_path = os.path.join(get_network_drive(), f"{department_code or '01010'}_Unknown", f"{numeric_project_id}_Project {numeric_project_id}")
     logger.warning(f"Using default project info for {numeric_project_id}: {default_path}")
     return {
         'project_id': numeric_project_id,
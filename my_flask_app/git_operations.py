@@ -1,143 +1,269 @@
 # /my_flask_app/git_operations.py
 
 import os
-import base64
 import requests
-from dotenv import load_dotenv
 import hashlib
-import pandas as pd
 import asyncio
 import logging
 import config
-import subprocess
 from datetime import datetime
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
-# .env 파일 로드
-load_dotenv()
-
 GITHUB_API_URL = "https://api.github.com"
 GITHUB_FLASK_REPO = "photo2story/my-folder-app"
 GITHUB_BRANCH = "main"
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-if not GITHUB_TOKEN:
-    GITHUB_TOKEN = os.getenv("PERSONAL_ACCESS_TOKEN")
+GIT_REMOTE = "origin"
+# 이 시간 동안 추가 동기화 요청이 없으면 모아 둔 파일을 하나의 커밋으로 푸시 (초)
+GIT_SYNC_DEBOUNCE = float(os.getenv("GIT_SYNC_DEBOUNCE", "2.0"))
+# 요청이 계속 들어와도 이 시간 안에는 푸시 (초)
+GIT_SYNC_MAX_DELAY = float(os.getenv("GIT_SYNC_MAX_DELAY", "30.0"))
+# 한 번의 git add에 넘길 경로 수 (Windows 명령줄 길이 제한)
+GIT_ADD_CHUNK = 200
 
-logger.info(f"Using GitHub token: {GITHUB_TOKEN[:10]}...")
+# 로컬 파일의 git blob SHA 캐시 (경로 -> (mtime_ns, size, sha)), 바뀌지 않은 파일은 다시 해시하지 않음
+_blob_sha_cache = {}
 
 # SHA 해시 계산 함수
 def calculate_file_sha(file_path):
-    sha_hash = hashlib.sha1()
+    """git이 blob에 쓰는 SHA-1 계산 (sha1("blob <크기>\\0" + 내용)), GitHub 트리의 sha와 비교 가능"""
+    stat = os.stat(file_path)
+    cached = _blob_sha_cache.get(file_path)
+    if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    sha_hash = hashlib.sha1(f"blob {stat.st_size}\0".encode())
     with open(file_path, "rb") as f:
-        while chunk := f.read(8192):
+        while chunk := f.read(65536):
             sha_hash.update(chunk)
-    return sha_hash.hexdigest()
+    sha = sha_hash.hexdigest()
+    _blob_sha_cache[file_path] = (stat.st_mtime_ns, stat.st_size, sha)
+    return sha
 
-# Git 명령어 실행 함수
-def run_git_command(command):
-    try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.returncode != 0:
-            logger.error(f"Git command failed: {command}\n{result.stderr}")
-            raise Exception(f"Git command failed: {result.stderr}")
-        logger.info(f"Git command succeeded: {command}\n{result.stdout}")
-        return result.stdout
-    except Exception as e:
-        logger.error(f"Error running git command {command}: {str(e)}")
-        raise
+def github_path_for(file_path):
+    """로컬 static 파일 경로를 저장소 내 경로로 변환"""
+    relative_path = os.path.relpath(os.path.dirname(file_path), config.STATIC_PATH).replace(os.sep, '/')
+    return f"static/{relative_path}/{os.path.basename(file_path)}"
 
-async def sync_files_to_github(file_path=None):
-    """특정 파일 또는 results 디렉토리의 모든 JSON 및 CSV 파일을 GitHub에 업로드"""
+def fetch_remote_tree(branch=GITHUB_BRANCH):
+    """브랜치 전체 트리를 한 번에 조회하여 {경로: blob sha} 반환 (실패하면 None)"""
+    github_token = config.GITHUB_TOKEN
+    if not github_token:
+        logger.warning("GITHUB_TOKEN is not set; skipping GitHub tree lookup")
+        return None
+    url = f"{GITHUB_API_URL}/repos/{GITHUB_FLASK_REPO}/git/trees/{branch}"
+    headers = {
+        "Authorization": f"Bearer {github_token}",
+        "Accept": "application/vnd.github.v3+json"
+    }
     try:
-        # 변경된 파일 목록 수집
-        files_to_commit = []
-        if file_path and os.path.exists(file_path):
-            # 단일 파일 처리
-            files_to_commit.append(file_path)
+        response = requests.get(url, headers=headers, params={"recursive": "1"}, timeout=30)
+    except requests.RequestException as e:
+        logger.error(f"Error fetching GitHub tree: {str(e)}")
+        return None
+    if response.status_code != 200:
+        logger.error(f"Error fetching GitHub tree: {response.status_code}, {response.text}")
+        return None
+
+    tree_data = response.json()
+    if tree_data.get('truncated'):
+        # 트리가 너무 커서 잘린 경우, 목록에 없는 파일은 변경된 것으로 처리됨
+        logger.warning("GitHub tree response is truncated; files missing from it will be re-uploaded")
+    return {item['path']: item['sha'] for item in tree_data.get('tree', []) if item.get('type') == 'blob'}
+
+def find_changed_files(files, remote_tree):
+    """원격 트리와 git blob SHA가 다른 파일만 반환 (원격 트리를 모르면 전체)"""
+    if remote_tree is None:
+        return list(files)
+    changed = []
+    for file_path in files:
+        remote_sha = remote_tree.get(github_path_for(file_path))
+        if remote_sha is None:
+            logger.info(f"{os.path.basename(file_path)} does not exist in GitHub, proceeding to upload.")
+            changed.append(file_path)
+        elif remote_sha != calculate_file_sha(file_path):
+            changed.append(file_path)
         else:
-            # results 디렉토리 및 report 디렉토리 전체 처리
-            results_dir = os.path.join(config.STATIC_PATH, 'results')
-            if not os.path.exists(results_dir):
-                logger.warning(f"Results directory does not exist: {results_dir}")
+            logger.debug(f"{os.path.basename(file_path)} is up-to-date in GitHub, skipping upload.")
+    return changed
+
+# Git 명령어 실행 함수
+async def run_git_async(*args, cwd=config.PROJECT_ROOT):
+    """git 명령을 셸 없이 비동기로 실행하여 (returncode, stdout, stderr) 반환"""
+    process = await asyncio.create_subprocess_exec(
+        "git", *args, cwd=cwd,
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    return process.returncode, stdout.decode('utf-8', 'replace'), stderr.decode('utf-8', 'replace')
+
+async def _git(*args, cwd=config.PROJECT_ROOT):
+    returncode, stdout, stderr = await run_git_async(*args, cwd=cwd)
+    if returncode != 0:
+        logger.error(f"Git command failed: git {args[0]}\n{stderr}")
+        raise Exception(f"Git command failed: {stderr}")
+    return stdout
+
+async def _has_unpushed_commits(remote, branch, cwd=config.PROJECT_ROOT):
+    """HEAD가 remote/branch보다 앞서 있는지 (원격 추적 브랜치를 알 수 없으면 True)"""
+    returncode, stdout, _ = await run_git_async("rev-list", "--count", f"{remote}/{branch}..HEAD", cwd=cwd)
+    if returncode != 0:
+        return True
+    return int(stdout.strip() or 0) > 0
+
+async def commit_and_push(file_paths, message, cwd=config.PROJECT_ROOT, remote=GIT_REMOTE, branch=GITHUB_BRANCH):
+    """파일들을 한 번에 스테이징하여 하나의 커밋으로 푸시 (바뀐 내용이 없으면 None, 있으면 커밋 SHA)"""
+    paths = [os.path.relpath(path, cwd).replace(os.sep, '/') for path in file_paths]
+    for start in range(0, len(paths), GIT_ADD_CHUNK):
+        await _git("add", "--", *paths[start:start + GIT_ADD_CHUNK], cwd=cwd)
+
+    # 스테이징된 변경이 없으면 커밋하지 않음 (종료 코드 1 = 변경 있음)
+    returncode, _, _ = await run_git_async("diff", "--cached", "--quiet", "--", *paths, cwd=cwd)
+    if returncode == 0:
+        # 이전 푸시가 실패해 로컬에만 남은 커밋이 있으면 다시 푸시
+        if not await _has_unpushed_commits(remote, branch, cwd=cwd):
+            logger.info("No staged changes to commit to GitHub")
+            return None
+        commit_sha = (await _git("rev-parse", "HEAD", cwd=cwd)).strip()
+        await _git("push", remote, f"HEAD:{branch}", cwd=cwd)
+        logger.info(f"Pushed pending local commit to GitHub ({commit_sha[:7]})")
+        return commit_sha
+
+    # 다른 작업에서 스테이징해 둔 파일이 섞이지 않도록 대상 경로만 커밋
+    await _git("commit", "-m", message, "--", *paths, cwd=cwd)
+    commit_sha = (await _git("rev-parse", "HEAD", cwd=cwd)).strip()
+    await _git("push", remote, f"HEAD:{branch}", cwd=cwd)
+    logger.info(f"Successfully pushed {len(paths)} files to GitHub ({commit_sha[:7]})")
+    return commit_sha
+
+class GitSyncBatcher:
+    """짧은 시간 안에 들어온 동기화 요청을 하나의 커밋/푸시로 묶음
+
+    submit()은 파일을 대기 목록에 넣고, 마지막 요청 후 debounce초 동안 추가 요청이 없거나
+    첫 요청 후 max_delay초가 지나면 대기 목록 전체를 커밋한다. 같은 묶음의 호출자는 모두
+    같은 커밋 SHA(바뀐 내용이 없으면 None)를 받는다. git 명령은 비동기 하위 프로세스로
+    실행되므로 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, debounce=GIT_SYNC_DEBOUNCE, max_delay=GIT_SYNC_MAX_DELAY,
+                 cwd=config.PROJECT_ROOT, remote=GIT_REMOTE, branch=GITHUB_BRANCH):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.cwd = cwd
+        self.remote = remote
+        self.branch = branch
+        self._loop = None
+
+    def _reset(self, loop):
+        # asyncio.run()마다 새 루프가 생기므로 루프가 바뀌면 상태를 새로 만듦
+        self._loop = loop
+        self._pending = set()
+        self._waiters = []
+        self._timer = None
+        self._first_request = None
+        self._push_lock = asyncio.Lock()
+
+    async def submit(self, file_paths):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset(loop)
+        self._pending.update(file_paths)
+        waiter = loop.create_future()
+        self._waiters.append(waiter)
+
+        now = loop.time()
+        if self._first_request is None:
+            self._first_request = now
+        if self._timer is not None:
+            self._timer.cancel()
+        delay = min(self.debounce, max(0.0, self._first_request + self.max_delay - now))
+        self._timer = loop.call_later(delay, lambda: loop.create_task(self._flush()))
+        return await waiter
+
+    async def _flush(self):
+        paths, waiters = sorted(self._pending), self._waiters
+        self._pending, self._waiters = set(), []
+        self._timer = self._first_request = None
+
+        # 이전 묶음의 푸시가 끝난 뒤 커밋 (동시에 git index를 건드리지 않음)
+        async with self._push_lock:
+            try:
+                message = f"Update audit results for {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ({len(paths)} files)"
+                result = await commit_and_push(paths, message, self.cwd, self.remote, self.branch)
+            except Exception as e:
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
                 return
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
 
-            for root, dirs, files in os.walk(results_dir):
-                for filename in files:
-                    if filename.endswith('.json') or filename.endswith('.csv'):
-                        file_path = os.path.join(root, filename)
-                        files_to_commit.append(file_path)
-
-            # report 디렉토리의 combined_report.csv 처리
-            report_dir = os.path.join(config.STATIC_PATH, 'report')
-            if os.path.exists(report_dir):
-                for filename in os.listdir(report_dir):
-                    if filename.startswith("combined_report") and filename.endswith('.csv'):
-                        file_path = os.path.join(report_dir, filename)
-                        files_to_commit.append(file_path)
-
-        if not files_to_commit:
-            logger.info("No files to commit to GitHub")
-            return
-
-        # 파일 상태 확인 및 커밋 준비
-        added_files = []
-        for file_path in files_to_commit:
-            relative_path = os.path.relpath(os.path.dirname(file_path), config.STATIC_PATH).replace(os.sep, '/')
-            github_path = f"static/{relative_path}/{os.path.basename(file_path)}"
-
-            url = f"{GITHUB_API_URL}/repos/{GITHUB_FLASK_REPO}/contents/{github_path}"
-            headers = {
-                "Authorization": f"Bearer {GITHUB_TOKEN}",
-                "Accept": "application/vnd.github.v3+json"
-            }
-            
-            response = requests.get(url, headers=headers, params={"ref": GITHUB_BRANCH})
-            
-            upload_needed = True
-            if response.status_code == 200:
-                file_data = response.json()
-                remote_sha = file_data['sha']
-                local_sha = calculate_file_sha(file_path)
-                if remote_sha == local_sha:
-                    logger.info(f"{os.path.basename(file_path)} is up-to-date in GitHub, skipping upload.")
-                    upload_needed = False
-            elif response.status_code == 404:
-                logger.info(f"{os.path.basename(file_path)} does not exist in GitHub, proceeding to upload.")
-            else:
-                logger.error(f"Error fetching file details from GitHub for {os.path.basename(file_path)}: {response.status_code}, {response.text}")
-                continue
-
-            if upload_needed:
-                added_files.append(file_path)
-
-        # 변경된 파일이 없으면 종료
-        if not added_files:
-            logger.info("No changes to commit to GitHub")
-            return
-
-        # 로컬 Git 리포지토리에 추가 및 커밋
-        for file_path in added_files:
-            run_git_command(f"git add {file_path}")
-        
-        commit_message = f"Update audit results for {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        run_git_command(f'git commit -m "{commit_message}"')
+git_sync_batcher = GitSyncBatcher()
+
+def collect_sync_files(file_path=None):
+    """동기화 대상 파일 목록 (파일 또는 파일 목록, 없으면 results 디렉토리 전체와 통합 보고서)"""
+    files_to_commit = []
+    if isinstance(file_path, (list, tuple, set)):
+        files_to_commit.extend(path for path in file_path if os.path.exists(path))
+    elif file_path and os.path.exists(file_path):
+        # 단일 파일 처리
+        files_to_commit.append(file_path)
+    else:
+        # results 디렉토리 및 report 디렉토리 전체 처리
+        results_dir = os.path.join(config.STATIC_PATH, 'results')
+        if not os.path.exists(results_dir):
+            logger.warning(f"Results directory does not exist: {results_dir}")
+            return []
+
+        for root, dirs, files in os.walk(results_dir):
+            for filename in files:
+                if filename.endswith('.json') or filename.endswith('.csv'):
+                    files_to_commit.append(os.path.join(root, filename))
 
-        # 원격으로 푸시
-        run_git_command("git push origin main")
-        logger.info("Successfully pushed changes to GitHub")
+        # report 디렉토리의 combined_report.csv 처리
+        report_dir = os.path.join(config.STATIC_PATH, 'report')
+        if os.path.exists(report_dir):
+            for filename in os.listdir(report_dir):
+                if filename.startswith("combined_report") and filename.endswith('.csv'):
+                    files_to_commit.append(os.path.join(report_dir, filename))
+    return files_to_commit
 
+async def push_changed_files(files_to_commit):
+    """원격과 다른 파일만 하나의 커밋으로 푸시하고 (커밋 SHA, 푸시한 파일 목록) 반환
+
+    바뀐 파일이 없으면 (None, []), 실패하면 예외.
+    """
+    if not files_to_commit:
+        logger.info("No files to commit to GitHub")
+        return None, []
+
+    # 원격 트리를 한 번만 조회하고 로컬 blob SHA와 비교하여 실제로 바뀐 파일만 선택
+    remote_tree = await asyncio.to_thread(fetch_remote_tree)
+    added_files = await asyncio.to_thread(find_changed_files, files_to_commit, remote_tree)
+    logger.info(f"GitHub sync: {len(added_files)} changed of {len(files_to_commit)} files")
+
+    # 변경된 파일이 없으면 종료
+    if not added_files:
+        logger.info("No changes to commit to GitHub")
+        return None, []
+
+    # 비슷한 시점의 다른 동기화 요청과 묶어 하나의 커밋으로 푸시
+    return await git_sync_batcher.submit(added_files), added_files
+
+async def sync_files_to_github(file_path=None):
+    """특정 파일(또는 파일 목록) 또는 results 디렉토리의 모든 JSON 및 CSV 파일을 GitHub에 업로드"""
+    try:
+        files_to_commit = await asyncio.to_thread(collect_sync_files, file_path)
+        commit, _ = await push_changed_files(files_to_commit)
+        return commit
     except Exception as e:
         logger.error(f"Error during sync_files_to_github: {str(e)}")
 
 # 테스트 코드
 if __name__ == "__main__":
+    config.configure_logging()
+
     # 테스트용 파일 경로
     test_files = [
         os.path.join(config.STATIC_PATH, 'results', '01010_도로부', 'audit_20180076.json'),
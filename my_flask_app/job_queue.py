@@ -0,0 +1,219 @@
+# my_flask_app/job_queue.py
+# 오래 걸리는 봇 명령(전체 감사, 부서 감사)을 백그라운드에서 실행하는 작업 큐
+
+import os
+import json
+import uuid
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Awaitable, List
+
+from config import STATIC_PATH
+
+logger = logging.getLogger(__name__)
+
+JOBS_DIR = os.path.join(STATIC_PATH, 'jobs')
+JOBS_FILE = os.path.join(JOBS_DIR, 'jobs.json')
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = {DONE, FAILED, CANCELLED}
+
+JobHandler = Callable[[Dict[str, Any], 'JobManager'], Awaitable[Any]]
+
+
+def _now() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+class JobManager:
+    """영속 작업 큐 + 워커 풀
+
+    작업 상태는 jobs.json에 저장되므로 봇이 재시작되어도 대기/실행 중이던 작업이
+    다시 큐에 들어가며, 핸들러는 job['checkpoint']를 이용해 이어서 실행할 수 있다.
+    """
+
+    def __init__(self, jobs_file: str = JOBS_FILE, workers: int = 1, keep_finished: int = 50):
+        self.jobs_file = jobs_file
+        self.workers = workers
+        self.keep_finished = keep_finished
+        self._handlers: Dict[str, JobHandler] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested = set()
+        self._load()
+
+    def register(self, kind: str, handler: JobHandler) -> None:
+        """작업 종류별 핸들러 등록"""
+        self._handlers[kind] = handler
+
+    def _load(self) -> None:
+        if not os.path.exists(self.jobs_file):
+            return
+        try:
+            with open(self.jobs_file, 'r', encoding='utf-8') as f:
+                self._jobs = {job['id']: job for job in json.load(f)}
+            logger.info(f"작업 목록 로드 완료: {len(self._jobs)}개 ({self.jobs_file})")
+        except Exception as e:
+            logger.error(f"작업 목록 로드 실패: {str(e)}")
+            self._jobs = {}
+
+    def _save(self) -> None:
+        """작업 목록 저장 (임시 파일에 쓰고 교체하여 원자적으로 저장)"""
+        try:
+            os.makedirs(os.path.dirname(self.jobs_file), exist_ok=True)
+            # 완료된 작업은 최근 keep_finished개만 유지
+            finished = sorted(
+                (job for job in self._jobs.values() if job['status'] in FINISHED_STATES),
+                key=lambda j: j['created_at']
+            )
+            for job in finished[:max(0, len(finished) - self.keep_finished)]:
+                del self._jobs[job['id']]
+            tmp_path = f"{self.jobs_file}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._jobs.values()), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.jobs_file)
+        except Exception as e:
+            logger.error(f"작업 목록 저장 실패: {str(e)}")
+
+    async def start(self) -> None:
+        """워커 시작 및 이전 실행에서 끝나지 않은 작업 재등록"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        unfinished = sorted(
+            (job for job in self._jobs.values() if job['status'] in (QUEUED, RUNNING)),
+            key=lambda j: j['created_at']
+        )
+        for job in unfinished:
+            if job['status'] == RUNNING:
+                logger.info(f"중단된 작업 재개: {job['id']} ({job['kind']})")
+                job['status'] = QUEUED
+                job['resumed'] = job.get('resumed', 0) + 1
+            self._queue.put_nowait(job['id'])
+        self._save()
+        for i in range(self.workers):
+            self._worker_tasks.append(asyncio.create_task(self._worker(i)))
+        logger.info(f"작업 큐 시작: 워커 {self.workers}개, 대기 작업 {len(unfinished)}개")
+
+    def submit(self, kind: str, params: Optional[Dict[str, Any]] = None, channel_id: Optional[int] = None) -> str:
+        """작업 등록 후 즉시 작업 ID 반환"""
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = uuid.uuid4().hex[:8]
+        self._jobs[job_id] = {
+            'id': job_id,
+            'kind': kind,
+            'params': params or {},
+            'channel_id': channel_id,
+            'status': QUEUED,
+            'created_at': _now(),
+            'started_at': None,
+            'finished_at': None,
+            'progress': {'done': 0, 'total': 0},
+            'checkpoint': {},
+            'result': None,
+            'error': None
+        }
+        self._save()
+        if self._queue is not None:
+            self._queue.put_nowait(job_id)
+        logger.info(f"작업 등록: {job_id} ({kind}) {params}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self._jobs.get(job_id)
+
+    def list_jobs(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """최근 작업 목록 (최신순)"""
+        return sorted(self._jobs.values(), key=lambda j: j['created_at'], reverse=True)[:limit]
+
+    def update(self, job_id: str, progress: Optional[Dict[str, int]] = None,
+               checkpoint: Optional[Dict[str, Any]] = None) -> None:
+        """핸들러가 진행률과 체크포인트를 기록 (즉시 디스크에 저장)"""
+        job = self._jobs.get(job_id)
+        if not job:
+            return
+        if progress is not None:
+            job['progress'].update(progress)
+        if checkpoint is not None:
+            job['checkpoint'].update(checkpoint)
+        self._save()
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중이면 취소 표시, 실행 중이면 태스크 취소"""
+        job = self._jobs.get(job_id)
+        if not job or job['status'] in FINISHED_STATES:
+            return False
+        if job['status'] == RUNNING and job_id in self._running:
+            self._cancel_requested.add(job_id)
+            self._running[job_id].cancel()
+        else:
+            job['status'] = CANCELLED
+            job['finished_at'] = _now()
+            self._save()
+        logger.info(f"작업 취소 요청: {job_id}")
+        return True
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job_id = await self._queue.get()
+            try:
+                job = self._jobs.get(job_id)
+                if job and job['status'] == QUEUED:
+                    await self._execute(job)
+            finally:
+                self._queue.task_done()
+
+    async def _execute(self, job: Dict[str, Any]) -> None:
+        handler = self._handlers.get(job['kind'])
+        if handler is None:
+            job['status'] = FAILED
+            job['error'] = f"No handler for job kind: {job['kind']}"
+            job['finished_at'] = _now()
+            self._save()
+            return
+
+        job['status'] = RUNNING
+        job['started_at'] = _now()
+        self._save()
+        logger.info(f"작업 시작: {job['id']} ({job['kind']})")
+
+        task = asyncio.create_task(handler(job, self))
+        self._running[job['id']] = task
+        try:
+            job['result'] = await task
+            job['status'] = DONE
+        except asyncio.CancelledError:
+            if job['id'] not in self._cancel_requested:
+                # 워커 자체가 취소된 경우(봇 종료)는 다음 시작 시 재개되도록 RUNNING으로 남김
+                self._running.pop(job['id'], None)
+                self._save()
+                raise
+            self._cancel_requested.discard(job['id'])
+            job['status'] = CANCELLED
+        except Exception as e:
+            logger.error(f"작업 실패: {job['id']} ({job['kind']}): {str(e)}")
+            job['status'] = FAILED
+            job['error'] = str(e)
+        finally:
+            self._running.pop(job['id'], None)
+            if job['status'] in FINISHED_STATES:
+                job['finished_at'] = _now()
+            self._save()
+        logger.info(f"작업 종료: {job['id']} ({job['status']})")
+
+    async def stop(self) -> None:
+        """워커 종료 (실행 중인 작업은 RUNNING 상태로 남아 다음 시작 시 재개)"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks.clear()
+        self._queue = None
@@ -0,0 +1,235 @@
+# my_flask_app/metrics.py
+# 프로세스 내 성능 지표 (카운터, 히스토그램): Prometheus 텍스트 형식(/metrics)과 봇 !stats 요약으로 노출
+
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+# 기본 히스토그램 구간 (초): 캐시된 디렉토리 조회(ms 이하)부터 느린 SMB 스캔/AI 호출(수십 초)까지
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} 레이블이 맞지 않습니다: {sorted(labels)} (필요: {list(self.labelnames)})")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _header(self, name: Optional[str] = None) -> List[str]:
+        name = name or self.name
+        return [f"# HELP {name} {self.documentation}", f"# TYPE {name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """증가만 하는 카운터"""
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        # 텍스트 형식 0.0.4에서는 TYPE 이름과 샘플 이름이 같아야 카운터로 인식됨
+        return self._header(f"{self.name}_total") + [
+            f"{self.name}_total{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in values
+        ]
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {','.join(key) or '-': value for key, value in sorted(self._values.items())}
+
+
+class Histogram(_Metric):
+    """구간별 관측 수와 합계를 기록하는 히스토그램 (단위: 초)"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                 buckets: Iterable[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블별 [구간별 관측 수..., +Inf 관측 수], 합계
+        self._counts: Dict[Tuple[str, ...], List[int]] = {}
+        self._sums: Dict[Tuple[str, ...], float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._counts.get(key)
+            if counts is None:
+                counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+                self._sums[key] = 0.0
+            counts[index] += 1
+            self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """with 블록 실행 시간 기록 (async 함수 안에서도 await를 감싸서 사용)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _quantile(self, counts: List[int], q: float) -> Optional[float]:
+        """구간 경계 기준 근사 분위수 (해당 분위가 속한 구간의 상한)"""
+        total = sum(counts)
+        if not total:
+            return None
+        target = q * total
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        lines = self._header()
+        for key, counts, total in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = sorted((key, list(counts), self._sums[key]) for key, counts in self._counts.items())
+        return {
+            ','.join(key) or '-': {
+                'count': sum(counts),
+                'sum': round(total, 3),
+                'avg': round(total / sum(counts), 4) if sum(counts) else None,
+                'p50_le': self._quantile(counts, 0.5),
+                'p95_le': self._quantile(counts, 0.95)
+            }
+            for key, counts, total in items
+        }
+
+
+class MetricsRegistry:
+    """이름별 지표 모음 (같은 이름으로 다시 만들면 기존 지표 반환)"""
+
+    def __init__(self, prefix: str = 'audit_'):
+        self.prefix = prefix
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Iterable[str], **kwargs):
+        full_name = f"{self.prefix}{name}"
+        with self._lock:
+            metric = self._metrics.get(full_name)
+            if metric is None:
+                metric = self._metrics[full_name] = cls(full_name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{full_name}은(는) 이미 {metric.kind}로 등록되어 있습니다.")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (),
+                  buckets: Iterable[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        """Prometheus 텍스트 형식 (text/plain; version=0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = [
+            f"# HELP {self.prefix}uptime_seconds 프로세스 시작 후 경과 시간",
+            f"# TYPE {self.prefix}uptime_seconds gauge",
+            f"{self.prefix}uptime_seconds {_format_value(round(time.time() - self.started_at, 3))}"
+        ]
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """지표 이름(접두어 제외) -> 레이블별 값 (봇 !stats 요약용)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name[len(self.prefix):]: metric.snapshot() for metric in metrics}
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels):
+    """with 블록 실행 시간을 outcome 레이블과 함께 기록 (예외가 나면 error, 아니면 ok)"""
+    start = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except BaseException:
+        outcome = 'error'
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, outcome=outcome, **labels)
+
+
+# 프로세스 공용 레지스트리와 계측 지점별 지표
+metrics = MetricsRegistry()
+
+DIR_SCAN_SECONDS = metrics.histogram(
+    'dir_scan_seconds', '디렉토리 조회 시간 (캐시 미스만)', ['source'])
+SEARCHER_CACHE = metrics.counter(
+    'searcher_cache', 'ProjectDocumentSearcher 캐시 조회 수', ['cache', 'result'])
+CSV_LOAD_SECONDS = metrics.histogram(
+    'csv_load_seconds', 'CSV 파일 로드 시간', ['file'])
+AI_CALL_SECONDS = metrics.histogram(
+    'ai_call_seconds', 'AI/검색 API 호출 시간', ['provider', 'outcome'])
+DISCORD_SEND_SECONDS = metrics.histogram(
+    'discord_send_seconds', 'Discord 메시지 전송 시간 (재시도 포함)', ['transport', 'outcome'])
+GIT_SYNC_SECONDS = metrics.histogram(
+    'git_sync_seconds', 'GitHub 동기화 시간', ['outcome'])
+GIT_SYNC_FILES = metrics.counter(
+    'git_sync_files', 'GitHub에 푸시한 파일 수 (원격과 내용이 다른 파일만)')
+AUDIT_STAGE_SECONDS = metrics.histogram(
+    'audit_stage_seconds', '프로젝트 감사 단계별 시간', ['stage'])
+AUDITS = metrics.counter(
+    'audits', '프로젝트 감사 수', ['outcome'])
+WATCH_EVENTS = metrics.counter(
+    'watch_events', '공유 폴더 감시 이벤트 수', ['kind'])
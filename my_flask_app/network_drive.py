@@ -0,0 +1,122 @@
+# my_flask_app/network_drive.py
+# 네트워크 드라이브(공유 폴더 루트) 찾기: 후보를 동시에 확인하고, 선택된 루트를 주기적으로 점검하여 끊기면 다른 루트로 전환
+
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, wait
+from typing import Callable, Dict, Any, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROBE_TIMEOUT = 2.0
+DEFAULT_HEALTH_TTL = 30.0
+
+
+class NetworkDriveLocator:
+    """후보 루트 중 사용 가능한 것을 찾아 캐시
+
+    - probe(): 모든 후보를 동시에 os.path.exists로 확인하고, 제한 시간 안에 응답한 것 중
+      우선순위(후보 순서)가 가장 높은 루트를 고른다. 끊긴 SMB 연결처럼 응답이 없는 확인은
+      기다리지 않으며, 이전 확인이 아직 끝나지 않은 후보는 다시 확인하지 않아 스레드가 쌓이지 않는다.
+    - current(): 캐시된 루트를 반환하되 health_ttl초가 지났으면 다시 확인하고, 응답이 없거나
+      사라졌으면 다른 후보로 전환한다.
+    - report_failure(): 스캔 중 I/O 오류가 난 루트를 즉시 무효화하여 다음 호출에서 전환한다.
+    """
+
+    def __init__(self, candidates: Sequence[str], probe_timeout: float = DEFAULT_PROBE_TIMEOUT,
+                 health_ttl: float = DEFAULT_HEALTH_TTL, default: Optional[str] = None,
+                 exists: Callable[[str], bool] = os.path.exists):
+        if not candidates:
+            raise ValueError("네트워크 드라이브 후보가 없습니다.")
+        self.candidates = tuple(candidates)
+        self.probe_timeout = probe_timeout
+        self.health_ttl = health_ttl
+        self.default = default or self.candidates[0]
+        self._exists = exists
+        self._executor = ThreadPoolExecutor(max_workers=len(self.candidates) * 2, thread_name_prefix='drive-probe')
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._root: Optional[str] = None
+        self._checked_at = 0.0
+        self._stats = {'probes': 0, 'failovers': 0, 'timeouts': 0, 'last_probe_seconds': None}
+
+    def _submit(self, candidate: str) -> Future:
+        """후보 확인 시작 (이전 확인이 아직 실행 중이면 그 결과를 함께 기다림)"""
+        future = self._inflight.get(candidate)
+        if future is None or future.done():
+            future = self._executor.submit(self._exists, candidate)
+            self._inflight[candidate] = future
+        return future
+
+    def _check(self, candidates: Sequence[str]) -> Optional[str]:
+        start = time.monotonic()
+        futures = [(candidate, self._submit(candidate)) for candidate in candidates]
+        deadline = start + self.probe_timeout
+        found = None
+        # 우선순위 순서대로 결과 확인: 앞선 후보가 실패/시간 초과로 확정되면 다음 후보로 넘어감
+        for candidate, future in futures:
+            done, _ = wait([future], timeout=max(0.0, deadline - time.monotonic()))
+            if not done:
+                self._stats['timeouts'] += 1
+                logger.warning(f"Network drive probe timed out: {candidate} ({self.probe_timeout:.1f}s)")
+                continue
+            if future.exception() is None and future.result():
+                found = candidate
+                break
+        self._stats['probes'] += 1
+        self._stats['last_probe_seconds'] = round(time.monotonic() - start, 3)
+        return found
+
+    def probe(self) -> Optional[str]:
+        """모든 후보를 동시에 확인하여 사용 가능한 루트 반환 (없으면 None)"""
+        with self._lock:
+            found = self._check(self.candidates)
+            if found:
+                self._set_root(found)
+            return found
+
+    def _set_root(self, root: str) -> None:
+        if self._root is not None and root != self._root:
+            self._stats['failovers'] += 1
+            logger.warning(f"Network drive failover: {self._root} -> {root}")
+        self._root = root
+        self._checked_at = time.monotonic()
+
+    def current(self) -> str:
+        """사용할 루트 (TTL마다 상태 확인, 실패하면 다른 후보로 전환, 모두 실패하면 기본값)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._root is not None and now - self._checked_at < self.health_ttl:
+                return self._root
+            # 현재 루트를 가장 먼저 확인하여 살아 있으면 유지, 아니면 다음 우선순위 후보로 전환
+            order = self.candidates
+            if self._root is not None:
+                order = (self._root,) + tuple(c for c in self.candidates if c != self._root)
+            found = self._check(order)
+            if found:
+                self._set_root(found)
+                return found
+            if self._root is None:
+                logger.warning(f"No network drive found, using default {self.default}")
+                self._root = self.default
+            # 모두 실패하면 기존 루트를 유지하고 TTL 후 다시 확인 (호출마다 시간 초과를 기다리지 않음)
+            self._checked_at = time.monotonic()
+            return self._root
+
+    def report_failure(self, root: str) -> None:
+        """스캔 중 오류가 난 루트를 무효화 (다음 current() 호출에서 다시 확인)"""
+        with self._lock:
+            if root == self._root:
+                self._checked_at = 0.0
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'root': self._root,
+            'candidates': list(self.candidates),
+            'checked_seconds_ago': round(time.monotonic() - self._checked_at, 1) if self._root else None,
+            'health_ttl': self.health_ttl,
+            'probe_timeout': self.probe_timeout,
+            **self._stats
+        }
@@ -0,0 +1,189 @@
+# my_flask_app/profiling.py
+# 감사 실행 프로파일링 (--profile 또는 봇 profile 옵션을 줄 때만 동작, 끄면 추가 비용 없음)
+
+import os
+import sys
+import time
+import cProfile
+import pstats
+import logging
+import threading
+from collections import Counter
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
+
+from config import STATIC_PATH
+
+logger = logging.getLogger(__name__)
+
+# 프로파일 결과 저장 폴더 (통합 보고서와 같은 static/report, 파일명은 profile_ 로 시작)
+PROFILE_DIR = os.path.join(STATIC_PATH, 'report')
+# cprofile: 호출 스레드의 모든 함수 호출 기록 (.prof, pstats/snakeviz/flameprof로 열기)
+# sample: 모든 스레드의 스택을 주기적으로 수집 (.folded, flamegraph.pl/speedscope로 열기)
+#         asyncio.to_thread로 실행되는 폴더 스캔까지 보려면 sample 사용
+PROFILE_MODES = ('cprofile', 'sample')
+DEFAULT_SAMPLE_INTERVAL = 0.005
+DEFAULT_TOP = 20
+
+# 대기 중인 스레드의 맨 위 프레임 (샘플에서 제외)
+_IDLE_FRAMES = {
+    ('threading.py', 'wait'),
+    ('selectors.py', 'select'),
+    ('queue.py', 'get'),
+    ('thread.py', '_worker'),
+}
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler(threading.Thread):
+    """interval마다 다른 모든 스레드의 스택을 접힌 스택(folded stack) 형식으로 집계"""
+
+    def __init__(self, interval: float):
+        super().__init__(name='profile-sampler', daemon=True)
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own_ident = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                if (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+
+class RunProfiler:
+    """with 블록(감사 실행 한 번)을 프로파일링해 static/report에 저장하고 상위 병목을 로그로 요약"""
+
+    def __init__(self, name: str, mode: str = 'cprofile', output_dir: str = PROFILE_DIR,
+                 top: int = DEFAULT_TOP, interval: float = DEFAULT_SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"지원하지 않는 프로파일 모드: {mode} (가능: {', '.join(PROFILE_MODES)})")
+        self.name = name
+        self.mode = mode
+        self.output_dir = output_dir
+        self.top = top
+        self.interval = interval
+        self.output_path: Optional[str] = None
+        self.elapsed = 0.0
+        # (이름, 누적 값, 자체 값): cprofile은 초, sample은 샘플 비율(%)
+        self.hotspots: List[Tuple[str, float, float]] = []
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            self._sampler = _StackSampler(self.interval)
+            self._sampler.start()
+        logger.info(f"프로파일링 시작: {self.name} ({self.mode})")
+
+    def stop(self) -> str:
+        """프로파일을 멈추고 결과 파일 경로 반환"""
+        if self._profile is not None:
+            self._profile.disable()
+        if self._sampler is not None:
+            self._sampler.stop()
+        self.elapsed = time.perf_counter() - self._started
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = time.strftime('%Y%m%d_%H%M%S')
+        safe_name = ''.join(c if c.isalnum() or c in '-_' else '_' for c in self.name)
+        if self._profile is not None:
+            self.output_path = os.path.join(self.output_dir, f"profile_{safe_name}_{timestamp}.prof")
+            self._profile.dump_stats(self.output_path)
+            self.hotspots = self._cprofile_hotspots()
+        else:
+            self.output_path = os.path.join(self.output_dir, f"profile_{safe_name}_{timestamp}.folded")
+            with open(self.output_path, 'w', encoding='utf-8') as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            self.hotspots = self._sample_hotspots()
+
+        logger.info(self.summary())
+        return self.output_path
+
+    def _cprofile_hotspots(self) -> List[Tuple[str, float, float]]:
+        stats = pstats.Stats(self._profile).stats
+        rows = []
+        for (filename, line, func), (_, _, tottime, cumtime, _) in stats.items():
+            label = func if filename == '~' else f"{func} ({os.path.basename(filename)}:{line})"
+            rows.append((label, cumtime, tottime))
+        # 프로파일러 자신의 호출은 제외
+        rows = [row for row in rows if '_lsprof' not in row[0] and 'profiling.py' not in row[0]]
+        # 자체 시간이 긴 함수가 실제 병목 (누적만 긴 함수는 호출 경로)
+        return sorted(rows, key=lambda row: (row[2], row[1]), reverse=True)[:self.top]
+
+    def _sample_hotspots(self) -> List[Tuple[str, float, float]]:
+        total = sum(self._sampler.stacks.values())
+        if not total:
+            return []
+        inclusive: Counter = Counter()
+        exclusive: Counter = Counter()
+        for stack, count in self._sampler.stacks.items():
+            frames = stack.split(';')[1:]  # 맨 앞은 스레드 이름
+            for frame in set(frames):
+                inclusive[frame] += count
+            if frames:
+                exclusive[frames[-1]] += count
+        # 자체 샘플이 많은 함수가 실제 병목 (누적만 높은 함수는 호출 경로)
+        ranked = sorted(inclusive, key=lambda frame: (exclusive[frame], inclusive[frame]), reverse=True)
+        return [(frame, inclusive[frame] * 100 / total, exclusive[frame] * 100 / total)
+                for frame in ranked[:self.top]]
+
+    def summary(self, top: Optional[int] = None) -> str:
+        """상위 병목 요약 (로그와 Discord 메시지용)"""
+        rows = self.hotspots[:top or self.top]
+        lines = [f"프로파일 {self.name} ({self.mode}, {self.elapsed:.2f}초): {self.output_path}"]
+        if self.mode == 'cprofile':
+            lines.append(f"{'누적(s)':>9} {'자체(s)':>9}  함수")
+            lines += [f"{cumtime:9.3f} {tottime:9.3f}  {label}" for label, cumtime, tottime in rows]
+        else:
+            samples = self._sampler.samples if self._sampler else 0
+            lines.append(f"샘플 {samples}회 ({self.interval * 1000:.0f}ms 간격)")
+            lines.append(f"{'누적(%)':>8} {'자체(%)':>8}  함수")
+            lines += [f"{inclusive:8.1f} {exclusive:8.1f}  {label}" for label, inclusive, exclusive in rows]
+        if not rows:
+            lines.append("(기록된 호출 없음)")
+        return '\n'.join(lines)
+
+    def __enter__(self) -> 'RunProfiler':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+
+def profile_run(name: str, mode: Optional[str] = None, **kwargs):
+    """mode가 없으면 아무 일도 하지 않는 컨텍스트 (CLI --profile 미지정 시 추가 비용 없음)"""
+    return RunProfiler(name, mode, **kwargs) if mode else nullcontext()
+
+
+def add_profile_argument(parser) -> None:
+    """CLI 공용 --profile 옵션 (값 없이 주면 cprofile)"""
+    parser.add_argument('--profile', nargs='?', const='cprofile', default=None, choices=PROFILE_MODES,
+                        help="실행을 프로파일링해 static/report/profile_*.prof|.folded 저장 "
+                             "(cprofile: 함수별 호출 시간, sample: 전체 스레드 스택 샘플링)")
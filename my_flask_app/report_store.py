@@ -0,0 +1,361 @@
+# my_flask_app/report_store.py
+# Flask API용 통합 보고서(combined_report.csv) 인메모리 인덱스
+
+import os
+import re
+import csv
+import glob
+import gzip
+import time
+import base64
+import bisect
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+import orjson
+from config import STATIC_PATH
+from config_assets import DOCUMENT_TYPES, DEPARTMENT_NAMES
+from department_summary import DepartmentSummaryIndex
+
+try:
+    import brotli
+except ImportError:  # brotli가 없으면 gzip만 제공
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+REPORT_DIR = os.path.join(STATIC_PATH, 'report')
+REPORT_FILENAME = 'combined_report.csv'
+
+# /audit_all 페이지 설정
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+PAGE_CACHE_SIZE = 256
+PROJECT_FIELDS = ('project_id', 'project_name', 'department_code', 'department', 'status',
+                  'contractor', 'search_folder', 'documents', 'timestamp')
+
+
+def find_latest_report(report_dir: str = REPORT_DIR) -> Optional[str]:
+    """최신 통합 보고서 경로 (combined_report.csv 우선, 없으면 가장 최근의 날짜별 보고서)"""
+    current = os.path.join(report_dir, REPORT_FILENAME)
+    if os.path.exists(current):
+        return current
+    dated = glob.glob(os.path.join(report_dir, 'combined_report_*.csv'))
+    return max(dated, key=os.path.getmtime) if dated else None
+
+
+def _flag(value: Any) -> bool:
+    try:
+        return bool(int(float(value)))
+    except (TypeError, ValueError):
+        return False
+
+
+def _count(value: Any) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def convert_project_to_json(project: Dict[str, str], timestamp: Optional[str] = None) -> Dict[str, Any]:
+    """보고서 한 행을 API 응답 형식으로 변환
+
+    generate_summary가 만드는 현재 형식(ProjectID, Depart, Depart_ProjectID ...)과
+    이전 형식(project_id, department, timestamp ...)을 모두 지원한다.
+    """
+    documents = {
+        doc_type: {
+            'exists': _flag(project.get(f'{doc_type}_exists')),
+            'count': _count(project.get(f'{doc_type}_count')),
+            'details': []
+        }
+        for doc_type in DOCUMENT_TYPES
+    }
+
+    if 'ProjectID' in project:
+        dept_name = project.get('Depart', '')
+        dept_code = (project.get('Depart_ProjectID') or '').split('_')[0] or DEPARTMENT_NAMES.get(dept_name, '99999')
+        return {
+            'project_id': project['ProjectID'],
+            'project_name': project.get('ProjectName', ''),
+            'department_code': dept_code,
+            'department': f"{dept_code}_{dept_name}",
+            'status': project.get('Status', ''),
+            'contractor': project.get('Contractor', ''),
+            'search_folder': project.get('search_folder', ''),
+            'documents': documents,
+            'timestamp': timestamp
+        }
+
+    department = project.get('department', '')
+    return {
+        'project_id': project.get('project_id', ''),
+        'project_name': project.get('project_name', ''),
+        'department_code': project.get('department_code') or department.split('_')[0],
+        'department': department,
+        'status': project.get('Status', ''),
+        'contractor': project.get('Contractor', ''),
+        'search_folder': '',
+        'documents': documents,
+        'timestamp': project.get('timestamp') or timestamp
+    }
+
+
+def encode_cursor(project_id: str) -> str:
+    return base64.urlsafe_b64encode(project_id.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str) -> str:
+    # urlsafe_b64decode는 잘못된 문자를 조용히 버리므로 엄격하게 디코딩하고 다시 인코딩해 비교
+    try:
+        decoded = base64.b64decode(cursor + '=' * (-len(cursor) % 4), altchars=b'-_', validate=True).decode('utf-8')
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError(f"잘못된 cursor입니다: {cursor}")
+    if encode_cursor(decoded) != cursor:
+        raise ValueError(f"잘못된 cursor입니다: {cursor}")
+    return decoded
+
+
+class ReportPage:
+    """직렬화된 응답 페이지 (압축본은 처음 요청될 때 한 번만 만들어 보관)"""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+        self._encoded = {'identity': body}
+
+    def encode(self, encoding: str) -> bytes:
+        if encoding not in self._encoded:
+            if encoding == 'br' and brotli is not None:
+                self._encoded[encoding] = brotli.compress(self.body, quality=5)
+            elif encoding == 'gzip':
+                self._encoded[encoding] = gzip.compress(self.body, compresslevel=6)
+            else:
+                return self.body
+        return self._encoded[encoding]
+
+
+class ReportSnapshot:
+    """한 번 로드된 보고서와 인덱스 (생성 후 변경하지 않음)"""
+
+    def __init__(self, path: Optional[str], mtime: float, size: int, projects: List[Dict[str, Any]]):
+        self.path = path
+        self.mtime = mtime
+        self.size = size
+        self.loaded_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 커서 페이지네이션을 위해 프로젝트 ID 순으로 정렬해 보관
+        self.projects = sorted(projects, key=lambda p: p['project_id'])
+        self.by_id: Dict[str, Dict[str, Any]] = {}
+        self.by_department: Dict[str, List[Dict[str, Any]]] = {}
+        for project in self.projects:
+            project_id = project['project_id']
+            self.by_id[project_id] = project
+            # 숫자만으로도 조회 가능하도록 (A20230001 -> 20230001), 정확한 ID가 우선
+            self.by_id.setdefault(re.sub(r'[^0-9]', '', project_id), project)
+            self.by_department.setdefault(project['department_code'], []).append(project)
+        self.department_codes = {
+            name: code for code, name in
+            (project['department'].split('_', 1) for project in projects if '_' in project['department'])
+        }
+        self._pages: 'OrderedDict[Tuple, ReportPage]' = OrderedDict()
+        self._pages_lock = threading.Lock()
+        self.department_summaries: List[Dict[str, Any]] = []
+
+    def _cached_page(self, key: Tuple, build) -> ReportPage:
+        with self._pages_lock:
+            cached = self._pages.get(key)
+            if cached is not None:
+                self._pages.move_to_end(key)
+                return cached
+        page = ReportPage(build())
+        with self._pages_lock:
+            self._pages[key] = page
+            if len(self._pages) > PAGE_CACHE_SIZE:
+                self._pages.popitem(last=False)
+        return page
+
+    def department_code(self, department: str) -> str:
+        """부서 코드(01010), 부서명(도로부) 또는 '코드_부서명'을 부서 코드로 변환"""
+        if department[:1].isdigit():
+            return department.split('_')[0]
+        return self.department_codes.get(department, department)
+
+    def filter(self, departments: Iterable[str] = (), statuses: Iterable[str] = (),
+               contractors: Iterable[str] = (), missing: Iterable[str] = ()) -> List[Dict[str, Any]]:
+        """조건별 필터링 (같은 조건의 여러 값은 OR, 서로 다른 조건은 AND)
+
+        missing에 문서 종류를 주면 그 중 하나라도 없는 프로젝트를 고른다.
+        """
+        if departments:
+            codes = {self.department_code(department) for department in departments}
+            candidates = [p for p in self.projects if p['department_code'] in codes]
+        else:
+            candidates = self.projects
+        statuses, contractors, missing = set(statuses), set(contractors), list(missing)
+        return [
+            p for p in candidates
+            if (not statuses or p['status'] in statuses)
+            and (not contractors or p['contractor'] in contractors)
+            and (not missing or any(not p['documents'][doc_type]['exists'] for doc_type in missing))
+        ]
+
+    def page(self, departments: Tuple[str, ...] = (), statuses: Tuple[str, ...] = (),
+             contractors: Tuple[str, ...] = (), missing: Tuple[str, ...] = (),
+             fields: Tuple[str, ...] = (), cursor: Optional[str] = None, limit: int = PAGE_SIZE) -> ReportPage:
+        """직렬화된 페이지 반환 (같은 조건의 페이지는 스냅샷이 바뀔 때까지 재사용)"""
+        def build() -> bytes:
+            matched = self.filter(departments, statuses, contractors, missing)
+            start = 0
+            if cursor:
+                # 마지막으로 받은 프로젝트 ID 다음부터 (보고서가 다시 로드되어도 위치가 유지됨)
+                start = bisect.bisect_right([p['project_id'] for p in matched], decode_cursor(cursor))
+            items = matched[start:start + limit]
+            if fields:
+                items = [{field: p[field] for field in fields} for p in items]
+            has_more = start + limit < len(matched)
+            return orjson.dumps({
+                'projects': items,
+                'count': len(items),
+                'total': len(matched),
+                'next_cursor': encode_cursor(items[-1]['project_id']) if has_more and items else None,
+                'report_loaded_at': self.loaded_at
+            })
+
+        return self._cached_page(('audit_all', departments, statuses, contractors, missing, fields, cursor, limit), build)
+
+    def summary_page(self, department: Optional[str] = None) -> ReportPage:
+        """부서별 집계 페이지 (department를 주면 해당 부서만)"""
+        code = self.department_code(department) if department else None
+
+        def build() -> bytes:
+            departments = [s for s in self.department_summaries if not code or s['department_code'] == code]
+            return orjson.dumps({
+                'departments': departments,
+                'total_projects': sum(s['total_projects'] for s in departments),
+                'report_loaded_at': self.loaded_at
+            })
+
+        return self._cached_page(('summary', code), build)
+
+    def warm(self, limit: int = PAGE_SIZE) -> int:
+        """필터 없는 기본 페이지를 모두 미리 직렬화"""
+        cursor = None
+        pages = 0
+        for start in range(0, len(self.projects), limit):
+            self.page(cursor=cursor, limit=limit)
+            pages += 1
+            cursor = encode_cursor(self.projects[min(start + limit, len(self.projects)) - 1]['project_id'])
+        return pages
+
+
+class ReportStore:
+    """통합 보고서 인메모리 저장소
+
+    프로젝트 ID와 부서 코드로 O(1) 조회한다. 요청 시 최대 check_interval초마다 파일의
+    mtime/크기를 확인하고, 바뀌었으면 새 스냅샷을 만든 뒤 참조를 한 번에 교체하므로
+    읽는 쪽은 락 없이 항상 완전한 데이터를 본다. 새 파일을 읽지 못하면 이전 스냅샷을 유지한다.
+    """
+
+    def __init__(self, report_dir: str = REPORT_DIR, check_interval: float = 2.0):
+        self.report_dir = report_dir
+        self.check_interval = check_interval
+        self._snapshot = ReportSnapshot(None, 0, 0, [])
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.department_summary = DepartmentSummaryIndex()
+
+    def _load(self, path: str, mtime: float, size: int) -> ReportSnapshot:
+        timestamp = datetime.fromtimestamp(mtime).strftime('%Y-%m-%d %H:%M:%S')
+        with open(path, newline='', encoding='utf-8-sig') as csvfile:
+            reader = csv.DictReader(csvfile)
+            if not {'ProjectID', 'project_id'} & set(reader.fieldnames or []):
+                raise ValueError(f"프로젝트 ID 열이 없는 보고서입니다: {reader.fieldnames}")
+            projects = [convert_project_to_json(row, timestamp) for row in reader]
+        return ReportSnapshot(path, mtime, size, projects)
+
+    def refresh(self, force: bool = False) -> ReportSnapshot:
+        """보고서가 바뀌었으면 다시 로드하고 현재 스냅샷 반환"""
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval:
+            return self._snapshot
+        # 다른 스레드가 로드 중이면 기다리지 않고 기존 스냅샷 사용 (아직 로드된 적이 없으면 대기)
+        if not self._reload_lock.acquire(blocking=force or self._snapshot.path is None):
+            return self._snapshot
+        try:
+            self._last_check = now
+            path = find_latest_report(self.report_dir)
+            if path is None:
+                return self._snapshot
+            stat = os.stat(path)
+            current = self._snapshot
+            if not force and (current.path, current.mtime, current.size) == (path, stat.st_mtime, stat.st_size):
+                return current
+            start = time.time()
+            snapshot = self._load(path, stat.st_mtime, stat.st_size)
+            # 부서별 집계는 이전 보고서와 달라진 프로젝트만 반영
+            self.department_summary.apply(snapshot.projects)
+            snapshot.department_summaries = self.department_summary.summary()
+            snapshot.summary_page()
+            pages = snapshot.warm()
+            self._snapshot = snapshot
+            logger.info(f"통합 보고서 로드: {path} ({len(snapshot.projects)}개 프로젝트, 기본 페이지 {pages}개, {time.time() - start:.2f}초)")
+        except Exception as e:
+            logger.error(f"통합 보고서 로드 실패, 이전 데이터 유지: {str(e)}")
+        finally:
+            self._reload_lock.release()
+        return self._snapshot
+
+    def snapshot(self, refresh: bool = True) -> ReportSnapshot:
+        """현재 스냅샷 (refresh=False면 파일을 확인하지 않음: ASGI 서버는 백그라운드 작업에서만 갱신)"""
+        return self.refresh() if refresh else self._snapshot
+
+    def get(self, project_id: str, refresh: bool = True) -> Optional[Dict[str, Any]]:
+        """프로젝트 ID(영문 접두어 유무 무관)로 조회"""
+        snapshot = self.snapshot(refresh)
+        return snapshot.by_id.get(project_id) or snapshot.by_id.get(re.sub(r'[^0-9]', '', project_id))
+
+    def by_department(self, department: str, refresh: bool = True) -> List[Dict[str, Any]]:
+        """부서 코드(01010), 부서명(도로부) 또는 '코드_부서명'으로 조회"""
+        snapshot = self.snapshot(refresh)
+        return snapshot.by_department.get(snapshot.department_code(department), [])
+
+    def query_page(self, department: Iterable[str] = (), status: Iterable[str] = (),
+                   contractor: Iterable[str] = (), missing: Iterable[str] = (),
+                   fields: Iterable[str] = (), cursor: Optional[str] = None,
+                   limit: int = PAGE_SIZE, refresh: bool = True) -> ReportPage:
+        """필터/필드 선택/커서가 적용된 직렬화 페이지 (잘못된 인자는 ValueError)"""
+        unknown_docs = set(missing) - set(DOCUMENT_TYPES)
+        if unknown_docs:
+            raise ValueError(f"알 수 없는 문서 종류: {', '.join(sorted(unknown_docs))}")
+        unknown_fields = set(fields) - set(PROJECT_FIELDS)
+        if unknown_fields:
+            raise ValueError(f"알 수 없는 필드: {', '.join(sorted(unknown_fields))}")
+        if not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError(f"limit은 1~{MAX_PAGE_SIZE} 사이여야 합니다: {limit}")
+        if fields:
+            # 커서 계산에 필요한 project_id는 항상 포함, 순서는 고정하여 캐시 키를 통일
+            fields = ('project_id',) + tuple(f for f in PROJECT_FIELDS if f in set(fields) and f != 'project_id')
+        return self.snapshot(refresh).page(
+            tuple(sorted(department)), tuple(sorted(status)), tuple(sorted(contractor)),
+            tuple(sorted(missing)), tuple(fields), cursor or None, limit
+        )
+
+    def summary_page(self, department: Optional[str] = None, refresh: bool = True) -> ReportPage:
+        return self.snapshot(refresh).summary_page(department)
+
+    def all(self, refresh: bool = True) -> List[Dict[str, Any]]:
+        return self.snapshot(refresh).projects
+
+    def info(self, refresh: bool = True) -> Dict[str, Any]:
+        snapshot = self.snapshot(refresh)
+        return {
+            'path': snapshot.path,
+            'loaded_at': snapshot.loaded_at,
+            'projects': len(snapshot.projects),
+            'departments': len(snapshot.by_department)
+        }
@@ -10,14 +10,13 @@ from pathlib import Path
 from datetime import datetime
 from functools import lru_cache
 import pandas as pd
-from config import PROJECT_LIST_CSV, STATIC_DATA_PATH, get_full_path, NETWORK_BASE_PATH
+from config import PROJECT_LIST_CSV, STATIC_DATA_PATH, get_full_path
 from config_assets import DOCUMENT_TYPES
 from concurrent.futures import ThreadPoolExecutor
+from services import services
+from metrics import DIR_SCAN_SECONDS, SEARCHER_CACHE, CSV_LOAD_SECONDS
 import re
-from unittest.mock import patch, AsyncMock
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(levelname)s] %(message)s')
 logger = logging.getLogger(__name__)
 
 # 정규표현식 미리 컴파일
@@ -31,7 +30,9 @@ DOCUMENT_PRIORITY = ['agreement', 'completion', 'contract', 'specification', 'in
                     'deliverable1', 'deliverable2', 'certificate', 'evaluation']
 
 class ProjectDocumentSearcher:
-    def __init__(self, verbose=False):
+    def __init__(self, verbose=False, fs=None):
+        # 디렉토리 조회에 사용할 파일 시스템 (기본: services의 공용 파일 시스템)
+        self.fs = fs if fs is not None else services.get('filesystem')
         self.base_dir = os.path.dirname(os.path.dirname(__file__))
         self.static_dir = os.path.join(self.base_dir, 'static')
         self.data_dir = os.path.join(self.static_dir, 'data')
@@ -64,11 +65,15 @@ class ProjectDocumentSearcher:
         # 캐시 통계
         self.cache_hits = 0
         self.cache_misses = 0
+        # 지표(SEARCHER_CACHE)에 아직 반영하지 않은 캐시별 적중/미스 수 (파일마다 지표 락을 잡지 않도록 모아서 반영)
+        self._dir_hits = self._dir_misses = 0
+        self._file_hits = self._file_misses = 0
 
     async def _load_project_list(self):
         """프로젝트 목록 로드"""
         try:
-            df = pd.read_csv(PROJECT_LIST_CSV)
+            with CSV_LOAD_SECONDS.time(file='project_list'):
+                df = pd.read_csv(PROJECT_LIST_CSV)
             self._project_df = {
                 str(row['project_id']): {
                     'department_code': str(row['department_code']).zfill(5),
@@ -79,10 +84,10 @@ class ProjectDocumentSearcher:
                 for _, row in df.iterrows()
             }
             if self.verbose:
-                logger.debug(f"프로젝트 목록 로드 완료: {len(self._project_df)}개 프로젝트")
+                logger.debug("프로젝트 목록 로드 완료: %s개 프로젝트", len(self._project_df))
             return self._project_df
         except Exception as e:
-            logger.error(f"프로젝트 목록 로드 실패: {str(e)}")
+            logger.error("프로젝트 목록 로드 실패: %s", e)
             return {}
 
     async def get_project_info(self, project_id, department_code=None):
@@ -94,13 +99,13 @@ class ProjectDocumentSearcher:
             filtered_projects = {k: v for k, v in project_list.items() if k == str(project_id)}
         
         if not filtered_projects:
-            logger.error(f"Project ID {project_id} not found in project list for department {department_code}")
+            logger.error("Project ID %s not found in project list for department %s", project_id, department_code)
             return None
         
         if department_code:
             project_info = next((v for k, v in filtered_projects.items() if v['department_code'] == str(department_code)), None)
             if not project_info:
-                logger.error(f"Department code {department_code} not found for project ID {project_id}")
+                logger.error("Department code %s not found for project ID %s", department_code, project_id)
                 return None
             return project_info
         else:
@@ -115,12 +120,12 @@ class ProjectDocumentSearcher:
         ext = Path(path).suffix.lower()
         if ext not in self._valid_extensions or ext in self._exclude_extensions:
             if self.verbose:
-                logger.debug(f"File {path} excluded: invalid extension {ext}")
+                logger.debug("File %s excluded: invalid extension %s", path, ext)
             return False
         
         if expected_types and ext not in [f'.{t}' for t in expected_types]:
             if self.verbose:
-                logger.debug(f"File {path} excluded: extension {ext} not in expected types {expected_types}")
+                logger.debug("File %s excluded: extension %s not in expected types %s", path, ext, expected_types)
             return False
         return True
 
@@ -134,37 +139,72 @@ class ProjectDocumentSearcher:
         cache_key = str(path)  # 리스트가 아닌 문자열 키 사용
         if cache_key in self._dir_cache:
             self.cache_hits += 1
+            self._dir_hits += 1
             return self._dir_cache[cache_key]
 
         self.cache_misses += 1
+        self._dir_misses += 1
         try:
             loop = asyncio.get_event_loop()
-            entries = await loop.run_in_executor(self.executor, os.scandir, str(path))
-            result = list(entries)
+            with DIR_SCAN_SECONDS.time(source='searcher'):
+                result = await loop.run_in_executor(self.executor, self.fs.scandir, str(path))
             self._dir_cache[cache_key] = result
             if self.verbose:
-                logger.debug(f"Scanned directory: {path}, entries: {len(result)}")
+                logger.debug("Scanned directory: %s, entries: %s", path, len(result))
             return result
         except Exception as e:
-            logger.error(f"디렉토리 스캔 실패 {path}: {str(e)}")
+            logger.error("디렉토리 스캔 실패 %s: %s", path, e)
             return []
 
+    def should_skip(self, name):
+        """검색/목록에서 제외할 이름인지 (임시 파일, 백업 폴더 등)"""
+        return self._should_skip_path(name)
+
+    def classify(self, file_name):
+        """파일 이름으로 판별한 문서 유형 (없으면 None)"""
+        return self._match_document_type(file_name)
+
+    def list_dir(self, path, refresh=False):
+        """디렉토리 항목 목록 (블로킹 I/O, 검색과 같은 디렉토리 캐시 사용)
+
+        refresh=True면 캐시된 목록을 버리고 다시 읽는다. 폴더가 아니면 FileNotFoundError.
+        """
+        cache_key = str(path)
+        if refresh:
+            self._dir_cache.pop(cache_key, None)
+        entries = self._dir_cache.get(cache_key)
+        if entries is not None:
+            self.cache_hits += 1
+            self._dir_hits += 1
+            return entries
+
+        self.cache_misses += 1
+        self._dir_misses += 1
+        if not self.fs.isdir(cache_key):
+            raise FileNotFoundError(cache_key)
+        with DIR_SCAN_SECONDS.time(source='browser'):
+            entries = self.fs.scandir(cache_key)
+        self._dir_cache[cache_key] = entries
+        return entries
+
     def _match_document_type(self, file_name, expected_types=None):
         """파일 이름에서 문서 유형 매칭 (중복 방지, 우선순위 적용, 재검사 포함)"""
         file_lower = file_name.lower()
         if file_lower in self._file_cache:
             self.cache_hits += 1
-            logger.debug(f"Cache hit for {file_name}: {self._file_cache[file_lower]}")
+            self._file_hits += 1
+            logger.debug("Cache hit for %s: %s", file_name, self._file_cache[file_lower])
             return self._file_cache[file_lower]
 
         self.cache_misses += 1
+        self._file_misses += 1
         for doc_type in DOCUMENT_PRIORITY:
             if KEYWORD_PATTERNS[doc_type].search(file_lower):  # 키워드 매핑
                 # 확장자 검증
                 expected_types_str = ','.join(DOCUMENT_TYPES[doc_type].get('type', ['pdf']))
                 if not self.is_valid_document(file_name, expected_types_str):
                     continue
-                logger.debug(f"Matched {file_name} with {doc_type} using pattern: {KEYWORD_PATTERNS[doc_type].pattern}")
+                logger.debug("Matched %s with %s using pattern: %s", file_name, doc_type, KEYWORD_PATTERNS[doc_type].pattern)
                 self._file_cache[file_lower] = doc_type
                 return doc_type
 
@@ -175,16 +215,26 @@ class ProjectDocumentSearcher:
                 expected_types_str = ','.join(DOCUMENT_TYPES[doc_type].get('type', ['pdf']))
                 if not self.is_valid_document(file_name, expected_types_str):
                     continue
-                logger.debug(f"Re-matched {file_name} with {doc_type} using pattern: {KEYWORD_PATTERNS[doc_type].pattern}")
+                logger.debug("Re-matched %s with %s using pattern: %s", file_name, doc_type, KEYWORD_PATTERNS[doc_type].pattern)
                 self._file_cache[file_lower] = doc_type
                 if self.verbose:
-                    logger.debug(f"재검사 성공 - 파일: {file_name}, 유형: {doc_type}")
+                    logger.debug("재검사 성공 - 파일: %s, 유형: %s", file_name, doc_type)
                 return doc_type
 
-        logger.debug(f"매칭 실패 - 파일: {file_name}")
+        logger.debug("매칭 실패 - 파일: %s", file_name)
         self._file_cache[file_lower] = None
         return None
 
+    def flush_cache_metrics(self):
+        """모아 둔 캐시 적중/미스 수를 SEARCHER_CACHE 지표에 반영 (검색 한 번, 폴더 조회 한 번마다 호출)"""
+        counts = (('dir', 'hit', self._dir_hits), ('dir', 'miss', self._dir_misses),
+                  ('file', 'hit', self._file_hits), ('file', 'miss', self._file_misses))
+        self._dir_hits = self._dir_misses = 0
+        self._file_hits = self._file_misses = 0
+        for cache, result, count in counts:
+            if count:
+                SEARCHER_CACHE.inc(count, cache=cache, result=result)
+
     async def search_document(self, project_path, doc_type, depth=0, max_found=3, found_count=0):
         """프로젝트 폴더에서 특정 유형의 문서 파일을 검색 (최대 3개까지)"""
         if found_count >= max_found or depth > 15:  # 깊이 제한 10 -> 15로 늘림
@@ -199,7 +249,7 @@ class ProjectDocumentSearcher:
 
         try:
             if self.verbose:
-                logger.debug(f"Searching in {project_path}, depth: {depth}, doc_type: {doc_type}, expected_types: {expected_types}")
+                logger.debug("Searching in %s, depth: %s, doc_type: %s, expected_types: %s", project_path, depth, doc_type, expected_types)
             entries = await self._scan_directory_entries(project_path)
             
             # 파일 먼저 처리 (최대 3개까지만)
@@ -214,7 +264,7 @@ class ProjectDocumentSearcher:
                             item_lower = item_path.name.lower()
                             matched_type = self._match_document_type(item_lower, expected_types)
                             if matched_type == doc_type:
-                                logger.info(f"[발견] {doc_name}: {item_path.name}")
+                                logger.info("[발견] %s: %s", doc_name, item_path.name)
                                 found_items.append({
                                     'type': 'file',
                                     'name': item_path.name,
@@ -227,12 +277,12 @@ class ProjectDocumentSearcher:
                                 if total_found >= max_found:
                                     break
                             elif matched_type is None and self.verbose:
-                                logger.debug(f"매칭 실패 - 파일: {item_path.name}, 예상 유형: {doc_type}")
+                                logger.debug("매칭 실패 - 파일: %s, 예상 유형: %s", item_path.name, doc_type)
                     elif entry.is_dir() and not self._should_skip_path(entry.path):
                         if self.verbose:
-                            logger.debug(f"Found directory: {entry.path}")
+                            logger.debug("Found directory: %s", entry.path)
                 except Exception as item_error:
-                    logger.error(f"항목 처리 중 오류 {entry.path}: {str(item_error)}")
+                    logger.error("항목 처리 중 오류 %s: %s", entry.path, item_error)
                     continue
 
             # 아직 3개를 못 찾았다면 디렉토리 검색 (최대 10개 디렉토리만)
@@ -262,7 +312,7 @@ class ProjectDocumentSearcher:
             return found_items
 
         except Exception as e:
-            logger.error(f"[오류] 검색 중 오류 발생: {str(e)}")
+            logger.error("[오류] 검색 중 오류 발생: %s", e)
             return []
 
     async def process_single_project(self, project_id, department_code=None):
@@ -283,7 +333,7 @@ class ProjectDocumentSearcher:
                 project = df[df['project_id'] == str(project_id)]
             
             if len(project) == 0:
-                logger.error(f"프로젝트 ID {project_id}를 부서 {department_code}에서 찾을 수 없습니다.")
+                logger.error("프로젝트 ID %s를 부서 %s에서 찾을 수 없습니다.", project_id, department_code)
                 return None
             
             # 지정된 부서가 있으면 해당 부서만 처리, 없으면 첫 번째 부서 처리
@@ -291,7 +341,7 @@ class ProjectDocumentSearcher:
             dept_code = row['department_code'].zfill(5)
             project_path = get_full_path(row['original_folder'], verbose=self.verbose)
             
-            logger.info(f"\n=== 프로젝트 {project_id} 검색 시작 (부서: {dept_code}_{row['department_name']}) ===")
+            logger.info("\n=== 프로젝트 %s 검색 시작 (부서: %s_%s) ===", project_id, dept_code, row['department_name'])
             
             # 각 문서 유형별로 검색 수행
             all_documents = {}
@@ -302,7 +352,7 @@ class ProjectDocumentSearcher:
                 
                 if found_items:  # 발견된 항목이 있을 때만 저장 및 로깅
                     all_documents[doc_type] = found_items[:3]  # 최대 3개로 확실히 제한
-                    logger.info(f"{info['name']}: {len(found_items[:3])}개 발견 ({time.time() - type_start:.2f}초)")
+                    logger.info("%s: %s개 발견 (%.2f초)", info['name'], len(found_items[:3]), time.time() - type_start)
             
             # 결과를 저장
             result = {
@@ -327,32 +377,38 @@ class ProjectDocumentSearcher:
             async with aiofiles.open(json_path, 'w', encoding='utf-8') as f:
                 await f.write(json.dumps(result, ensure_ascii=False, indent=2))
             
-            logger.info(f"\n=== 검색 완료 (부서: {dept_code}_{row['department_name']}, 소요 시간: {time.time() - start_time:.2f}초) ===")
-            logger.info(f"- 발견된 문서 유형: {len(all_documents)}개")
-            logger.info(f"- 총 발견 파일 수: {sum(len(docs) for docs in all_documents.values())}개")
+            logger.info("\n=== 검색 완료 (부서: %s_%s, 소요 시간: %.2f초) ===", dept_code, row['department_name'], time.time() - start_time)
+            logger.info("- 발견된 문서 유형: %s개", len(all_documents))
+            logger.info("- 총 발견 파일 수: %s개", sum(len(docs) for docs in all_documents.values()))
             return result
                 
         except Exception as e:
-            logger.error(f"프로젝트 처리 중 오류 발생: {str(e)}")
+            logger.error("프로젝트 처리 중 오류 발생: %s", e)
             if self.verbose:
                 logger.exception("상세 오류:")
             return None
+        finally:
+            self.flush_cache_metrics()
 
-    async def search_all_documents(self, project_id, department_code=None):
-        """모든 문서 유형에 대한 검색 수행 (부서별 병렬 처리, audit_service와 호환성 보장)"""
+    async def search_all_documents(self, project_id, department_code=None, project_info=None):
+        """모든 문서 유형에 대한 검색 수행 (부서별 병렬 처리, audit_service와 호환성 보장)
+
+        project_info(original_folder 포함)를 주면 project_list.csv를 다시 읽지 않는다 (sharded_crawl 워커).
+        """
         try:
             # 프로젝트 정보 조회
-            project_info = await self.get_project_info(project_id, department_code)
+            if project_info is None:
+                project_info = await self.get_project_info(project_id, department_code)
             if not project_info:
-                logger.error(f"프로젝트 ID {project_id}를 부서 {department_code}에서 찾을 수 없습니다.")
+                logger.error("프로젝트 ID %s를 부서 %s에서 찾을 수 없습니다.", project_id, department_code)
                 return {
                     'documents': {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES},
                     'performance': {'search_time': 0, 'document_counts': {}}
                 }
             
             project_path = project_info['original_folder']
-            if not Path(project_path).exists():
-                logger.error(f"프로젝트 경로를 찾을 수 없습니다: {project_path}")
+            if not self.fs.exists(project_path):
+                logger.error("프로젝트 경로를 찾을 수 없습니다: %s", project_path)
                 return {
                     'documents': {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES},
                     'performance': {'search_time': 0, 'document_counts': {}}
@@ -375,11 +431,11 @@ class ProjectDocumentSearcher:
                     'details': found_items[:3]  # 최대 3개로 확실히 제한
                 }
                 if self.verbose and found_items:
-                    logger.info(f"{DOCUMENT_TYPES[doc_type]['name']}: {len(found_items[:3])}개 발견 ({time.time() - search_start:.2f}초)")
+                    logger.info("%s: %s개 발견 (%.2f초)", DOCUMENT_TYPES[doc_type]['name'], len(found_items[:3]), time.time() - search_start)
             
             search_time = time.time() - search_start
             document_counts = {doc_type: len(all_documents[doc_type]['details']) for doc_type in all_documents}
-            logger.info(f"\n전체 문서 검색 완료: {len([d for d in all_documents.values() if d['exists']])}개 유형 발견 ({search_time:.2f}초)")
+            logger.info("\n전체 문서 검색 완료: %s개 유형 발견 (%.2f초)", len([d for d in all_documents.values() if d['exists']]), search_time)
             
             return {
                 'documents': all_documents,
@@ -390,16 +446,19 @@ class ProjectDocumentSearcher:
             }
             
         except Exception as e:
-            logger.error(f"문서 검색 중 오류 발생: {str(e)}")
+            logger.error("문서 검색 중 오류 발생: %s", e)
             if self.verbose:
                 logger.exception("상세 오류:")
             return {
                 'documents': {doc_type: {'exists': False, 'details': []} for doc_type in DOCUMENT_TYPES},
                 'performance': {'search_time': time.time() - search_start if 'search_start' in locals() else 0, 'document_counts': {}}
             }
+        finally:
+            self.flush_cache_metrics()
 
     def clear_cache(self):
         """캐시 초기화"""
+        self.flush_cache_metrics()
         self._cache.clear()
         self._dir_cache.clear()
         self._file_cache.clear()
@@ -407,13 +466,33 @@ class ProjectDocumentSearcher:
         self.cache_misses = 0
         logger.info("Searcher cache cleared")
 
+    def invalidate_paths(self, paths, trees=()):
+        """공유 폴더 감시(ShareWatcher) 이벤트로 바뀐 폴더와 삭제/이동된 하위 트리의 디렉토리 캐시만 제거"""
+        from filesystem import index_key
+        keys = {index_key(path) for path in paths}
+        prefixes = tuple(index_key(tree) for tree in trees)
+        # ShareWatcher 스레드에서 호출되고 이벤트 루프는 같은 dict에 계속 추가하므로 키 목록을 복사해서 순회
+        stale = [
+            cache_key for cache_key in list(self._dir_cache)
+            if (key := index_key(cache_key)) in keys
+            or any(key == prefix or key.startswith(prefix + '/') for prefix in prefixes)
+        ]
+        for cache_key in stale:
+            self._dir_cache.pop(cache_key, None)
+        if stale:
+            logger.debug("디렉토리 캐시 %d개 무효화", len(stale))
+
 if __name__ == "__main__":
     import argparse
+    from config import configure_logging
+    from profiling import profile_run, add_profile_argument
+    configure_logging()
     
     parser = argparse.ArgumentParser(description="프로젝트 문서 검색")
     parser.add_argument('--project-id', type=str, required=True, help="검색할 프로젝트 ID")
     parser.add_argument('--department-code', type=str, default=None, help="부서 코드 (예: 01010, 01030)")
     parser.add_argument('--verbose', action='store_true', help="상세 로그 출력")
+    add_profile_argument(parser)
     args = parser.parse_args()
     
     if args.verbose:
@@ -423,11 +502,13 @@ if __name__ == "__main__":
     searcher = ProjectDocumentSearcher(verbose=args.verbose)
     searcher.clear_cache()  # 캐시 초기화
     
-    asyncio.run(searcher.process_single_project(args.project_id, args.department_code))
+    with profile_run(f"search_{args.project_id}", args.profile):
+        asyncio.run(searcher.process_single_project(args.project_id, args.department_code))
     
     logger.info("\n=== 검색 완료 ===")
 
 # python search_project_data.py
 # python search_project_data.py --project-id 20180076 --department-code 01010 --verbose
 # python search_project_data.py --project-id 20240178 --department-code 06010 --verbose
-# python search_project_data.py --project-id 20240178 --verbose
\ No newline at end of file
+# python search_project_data.py --project-id 20240178 --verbose
+# python search_project_data.py --project-id 20240178 --profile  # 검색을 cProfile로 프로파일링
\ No newline at end of file
@@ -0,0 +1,97 @@
+# my_flask_app/services.py
+# 무거운 서비스/외부 API 클라이언트를 처음 사용할 때 생성하는 서비스 컨테이너
+
+import threading
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODEL_NAME = 'gemini-1.5-flash'
+
+
+class ServiceContainer:
+    """이름별 팩토리를 등록해 두고 get()을 처음 호출할 때 한 번만 생성
+
+    google.generativeai, tavily처럼 임포트만으로 시간이 걸리는 모듈은 팩토리 안에서
+    임포트하므로, 해당 서비스를 쓰지 않는 CLI 도구나 API 서버는 그 비용을 내지 않는다.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        with self._lock:
+            self._factories[name] = factory
+
+    def set(self, name: str, instance: Any) -> None:
+        """이미 만들어진 인스턴스 사용 (봇과 API 서버가 같은 AuditService를 공유할 때)"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            # 다른 스레드가 먼저 만들었을 수 있으므로 잠금 안에서 다시 확인
+            if name not in self._instances:
+                if name not in self._factories:
+                    raise KeyError(f"등록되지 않은 서비스입니다: {name}")
+                self._instances[name] = self._factories[name]()
+                logger.debug(f"서비스 생성: {name}")
+            return self._instances[name]
+
+    def created(self, name: str) -> bool:
+        return name in self._instances
+
+
+def _create_filesystem():
+    from filesystem import create_filesystem
+    from config import get_settings
+    settings = get_settings()
+    return create_filesystem(settings.fs_tree_dump, latency_ms=settings.fs_latency_ms, indexed=settings.watch_share)
+
+
+def _create_audit_service():
+    from audit_service import AuditService
+    return AuditService()
+
+
+def _create_file_browser():
+    from file_browser import FileBrowser
+    # 감사 검색기의 디렉토리 캐시 공유
+    return FileBrowser(services.get('audit_service').searcher)
+
+
+def _create_share_watcher():
+    from share_watcher import ShareWatcher
+    from config import get_settings
+    settings = get_settings()
+    return ShareWatcher(services.get('filesystem'), backend=settings.watch_backend,
+                        poll_interval=settings.watch_poll_interval)
+
+
+def _create_gemini_model():
+    import google.generativeai as genai
+    from config import GOOGLE_API_KEY
+    genai.configure(api_key=GOOGLE_API_KEY)
+    return genai.GenerativeModel(GEMINI_MODEL_NAME)
+
+
+def _create_tavily_client():
+    from tavily import TavilyClient
+    from config import TAVILY_API_KEY
+    return TavilyClient(api_key=TAVILY_API_KEY)
+
+
+# 프로세스 공용 컨테이너
+services = ServiceContainer()
+services.register('filesystem', _create_filesystem)
+services.register('audit_service', _create_audit_service)
+services.register('file_browser', _create_file_browser)
+services.register('share_watcher', _create_share_watcher)
+services.register('gemini_model', _create_gemini_model)
+services.register('tavily_client', _create_tavily_client)
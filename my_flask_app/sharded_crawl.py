@@ -0,0 +1,289 @@
+# my_flask_app/sharded_crawl.py
+# 전사 문서 검색/감사를 프로세스 풀로 나눠 실행 (GIL 때문에 스레드 풀로는 정규식 분류가 한 코어에 묶이는 문제 해결)
+#
+# - 샤드: 부서 코드별(department) 또는 프로젝트 폴더 경로 해시별(folder)로 프로젝트를 묶고,
+#         묶음을 크기가 큰 순서로 워커 수만큼의 샤드에 나눠 담는다 (같은 입력이면 항상 같은 샤드).
+# - 워커: 샤드 하나를 받아 자체 ProjectDocumentSearcher/AuditService로 처리하고 압축된 결과만 돌려준다.
+# - 병합: 부모 프로세스가 (부서 코드, 프로젝트 ID) 순으로 정렬하므로 워커 수와 완료 순서에 관계없이 출력이 같다.
+
+import os
+import json
+import time
+import zlib
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+
+from config import PROJECT_LIST_CSV, STATIC_DATA_PATH, configure_logging, get_full_path
+
+logger = logging.getLogger(__name__)
+
+SHARD_MODES = ('department', 'folder')
+# folder 모드의 해시 구간 수 (워커당 구간 수, 구간이 잘게 나뉠수록 샤드 크기가 고르게 됨)
+FOLDER_BUCKETS_PER_WORKER = 8
+CRAWL_OUTPUT = os.path.join(STATIC_DATA_PATH, 'crawl_results.json')
+AUDIT_OUTPUT = os.path.join(STATIC_DATA_PATH, 'sharded_audit_results.json')
+
+
+def shard_key(department_code: str, folder: Optional[str], shard_by: str, buckets: int) -> str:
+    """프로젝트가 속할 묶음 키 (hash()는 프로세스마다 달라지므로 crc32 사용)"""
+    if shard_by == 'department':
+        return str(department_code).zfill(5)
+    normalized = (folder or '').replace('\\', '/').rstrip('/').lower()
+    return f"{zlib.crc32(normalized.encode('utf-8')) % buckets:04d}"
+
+
+def plan_shards(items: List[Dict[str, Any]], workers: int, shard_by: str = 'department') -> List[List[Dict[str, Any]]]:
+    """items(department_code, folder 키 포함)를 최대 workers개 샤드로 분배
+
+    묶음은 쪼개지 않고, 큰 묶음부터 가장 작은 샤드에 넣는다 (동점은 키 순서로 결정되므로 항상 같은 결과).
+    """
+    if shard_by not in SHARD_MODES:
+        raise ValueError(f"지원하지 않는 샤드 기준: {shard_by} (가능: {', '.join(SHARD_MODES)})")
+    buckets = max(1, workers) * FOLDER_BUCKETS_PER_WORKER
+    groups: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        key = shard_key(item['department_code'], item.get('folder'), shard_by, buckets)
+        groups.setdefault(key, []).append(item)
+
+    shards: List[List[Dict[str, Any]]] = [[] for _ in range(max(1, min(workers, len(groups))))]
+    for key in sorted(groups, key=lambda key: (-len(groups[key]), key)):
+        smallest = min(range(len(shards)), key=lambda index: (len(shards[index]), index))
+        shards[smallest].extend(sorted(groups[key], key=_order_key))
+    return [shard for shard in shards if shard]
+
+
+def _order_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return str(item['department_code']).zfill(5), str(item['project_id'])
+
+
+def _compact_documents(documents: Dict[str, Any], keep_paths: bool) -> Dict[str, Any]:
+    """문서 유형별 결과 축약 (crawl: 발견한 상대 경로 목록, audit: 파일 수)"""
+    compact = {}
+    for doc_type, info in documents.items():
+        if not info.get('exists'):
+            continue
+        details = info.get('details', [])
+        if keep_paths:
+            compact[doc_type] = [item['path'] if isinstance(item, dict) else str(item) for item in details]
+        else:
+            compact[doc_type] = len(details)
+    return compact
+
+
+def _crawl_shard(shard_index: int, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """워커 프로세스: 샤드의 프로젝트 문서를 검색하고 압축된 결과 반환"""
+    from search_project_data import ProjectDocumentSearcher
+
+    async def run() -> Tuple[List[Dict[str, Any]], int, int]:
+        searcher = ProjectDocumentSearcher(verbose=False)
+        results = []
+        try:
+            for item in items:
+                # 부모가 읽은 폴더 경로를 그대로 사용 (워커마다 project_list.csv를 다시 읽지 않음)
+                project_info = {'original_folder': get_full_path(item['folder'])}
+                found = await searcher.search_all_documents(item['project_id'], item['department_code'], project_info)
+                results.append({
+                    'project_id': item['project_id'],
+                    'department_code': item['department_code'],
+                    'documents': _compact_documents(found['documents'], keep_paths=True)
+                })
+        finally:
+            searcher.executor.shutdown(wait=False)
+        return results, searcher.cache_hits, searcher.cache_misses
+
+    start = time.perf_counter()
+    results, hits, misses = asyncio.run(run())
+    return {
+        'shard': shard_index,
+        'pid': os.getpid(),
+        'projects': len(items),
+        'elapsed': time.perf_counter() - start,
+        'cache_hits': hits,
+        'cache_misses': misses,
+        'results': results
+    }
+
+
+def _audit_shard(shard_index: int, items: List[Dict[str, Any]], use_ai: bool, skip_unchanged: bool) -> Dict[str, Any]:
+    """워커 프로세스: 샤드의 프로젝트를 감사하고(결과 JSON은 워커가 저장) 압축된 결과 반환"""
+    from audit_service import AuditService
+
+    async def run() -> List[Dict[str, Any]]:
+        service = AuditService()
+        results = []
+        for item in items:
+            result = await service.audit_project(item['project_id'], use_ai=use_ai, skip_unchanged=skip_unchanged)
+            results.append({
+                'project_id': item['project_id'],
+                'department_code': item['department_code'],
+                'outcome': ('unchanged' if result.get('skipped_unchanged') else 'ok') if result else 'failed',
+                'documents': _compact_documents(result.get('documents', {}), keep_paths=False) if result else {},
+                'result_file': result.get('result_file') if result else None
+            })
+        return results
+
+    start = time.perf_counter()
+    results = asyncio.run(run())
+    return {
+        'shard': shard_index,
+        'pid': os.getpid(),
+        'projects': len(items),
+        'elapsed': time.perf_counter() - start,
+        'results': results
+    }
+
+
+def _init_worker(level: int) -> None:
+    """워커 프로세스 로그 설정 (spawn으로 시작하므로 부모 설정이 전달되지 않음)"""
+    configure_logging(level)
+
+
+def run_sharded(worker, items: List[Dict[str, Any]], workers: int, shard_by: str = 'department',
+                worker_args: Tuple = ()) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """샤드별로 worker(shard_index, items, *worker_args)를 별도 프로세스에서 실행하고 결과를 정렬해 병합
+
+    반환: (프로젝트별 결과, 샤드별 통계)
+    """
+    shards = plan_shards(items, workers, shard_by)
+    if not shards:
+        # 대상 프로젝트가 없으면 프로세스 풀을 만들지 않음 (max_workers=0은 ValueError)
+        logger.warning("실행할 프로젝트가 없습니다.")
+        return [], []
+    logger.info("프로젝트 %d개를 %d개 샤드로 분배 (%s 기준): %s",
+                len(items), len(shards), shard_by, [len(shard) for shard in shards])
+
+    results: List[Dict[str, Any]] = []
+    shard_stats: List[Dict[str, Any]] = []
+    # Windows와 같은 방식(spawn)으로 통일: 부모의 스레드(로그 큐, 스레드 풀)를 fork로 복제하지 않음
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=context, initializer=_init_worker,
+                             initargs=(logging.getLogger().getEffectiveLevel(),)) as executor:
+        futures = {executor.submit(worker, index, shard, *worker_args): index for index, shard in enumerate(shards)}
+        for future in as_completed(futures):
+            output = future.result()
+            results.extend(output.pop('results'))
+            shard_stats.append(output)
+            logger.info("샤드 %d 완료: 프로젝트 %d개 (%.2f초, pid %d)",
+                        output['shard'], output['projects'], output['elapsed'], output['pid'])
+
+    # 완료 순서와 관계없이 같은 출력이 되도록 정렬
+    results.sort(key=_order_key)
+    shard_stats.sort(key=lambda stats: stats['shard'])
+    return results, shard_stats
+
+
+def load_crawl_items(project_list_csv: str = PROJECT_LIST_CSV, department: Optional[str] = None) -> List[Dict[str, Any]]:
+    """project_list.csv의 프로젝트 (folder: 샤드 해시에 쓰는 원래 폴더 경로)"""
+    import pandas as pd
+    df = pd.read_csv(project_list_csv, dtype={'project_id': str, 'department_code': str}).fillna('')
+    items = [
+        {'project_id': row.project_id, 'department_code': row.department_code.zfill(5), 'folder': row.original_folder}
+        for row in df.itertuples(index=False)
+    ]
+    if department:
+        items = [item for item in items if item['department_code'] == department.zfill(5)]
+    return items
+
+
+def load_audit_items(department: Optional[str] = None) -> List[Dict[str, Any]]:
+    """감사 대상 (부서 지정 시 contract_status.csv의 해당 부서, 아니면 audit_targets_new.csv 전체)"""
+    import re
+    from audit_service import AuditService
+    contract_df = AuditService().load_contract_data()
+    if department:
+        contract_df = contract_df[contract_df['Depart_Code'] == department.zfill(5)]
+        project_ids = contract_df['ProjectID'].tolist()
+    else:
+        import pandas as pd
+        targets = pd.read_csv(os.path.join(STATIC_DATA_PATH, 'audit_targets_new.csv'), encoding='utf-8-sig')
+        project_ids = [str(project_id) for project_id in targets['ProjectID'].tolist()]
+
+    departments = dict(zip(contract_df['ProjectID'].astype(str), contract_df['Depart_Code'].astype(str)))
+    items = []
+    for project_id in project_ids:
+        department_code = departments.get(str(project_id), '99999').zfill(5)
+        numeric_id = re.sub(r'[^0-9]', '', str(project_id))
+        # 감사 폴더({드라이브}/{부서코드}_{프로젝트ID})가 곧 최상위 폴더
+        items.append({'project_id': str(project_id), 'department_code': department_code,
+                      'folder': f"{department_code}_{numeric_id}"})
+    return items
+
+
+def crawl(workers: int, shard_by: str = 'department', department: Optional[str] = None,
+          output_path: Optional[str] = CRAWL_OUTPUT) -> Dict[str, Any]:
+    """전체(또는 부서) 프로젝트 문서 검색을 샤드로 나눠 실행하고 결과 파일 저장"""
+    start = time.time()
+    items = load_crawl_items(department=department)
+    results, shard_stats = run_sharded(_crawl_shard, items, workers, shard_by)
+    report = {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'shard_by': shard_by,
+        'workers': len(shard_stats),
+        'elapsed': round(time.time() - start, 3),
+        'shards': shard_stats,
+        'projects': results
+    }
+    _save_report(report, output_path)
+    return report
+
+
+def _save_report(report: Dict[str, Any], output_path: Optional[str]) -> None:
+    if not output_path:
+        return
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    logger.info("결과 저장: %s (프로젝트 %d개, %.2f초)", output_path, len(report['projects']), report['elapsed'])
+
+
+def audit(workers: int, shard_by: str = 'department', department: Optional[str] = None,
+          use_ai: bool = False, skip_unchanged: bool = False,
+          output_path: Optional[str] = AUDIT_OUTPUT) -> Dict[str, Any]:
+    """전체(또는 부서) 감사를 샤드로 나눠 실행하고 요약 파일 저장 (프로젝트별 결과 JSON은 각 워커가 static/results에 저장)"""
+    start = time.time()
+    items = load_audit_items(department)
+    results, shard_stats = run_sharded(_audit_shard, items, workers, shard_by, (use_ai, skip_unchanged))
+    report = {
+        'generated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'shard_by': shard_by,
+        'workers': len(shard_stats),
+        'elapsed': round(time.time() - start, 3),
+        'shards': shard_stats,
+        'projects': results
+    }
+    _save_report(report, output_path)
+    return report
+
+
+if __name__ == '__main__':
+    import argparse
+
+    configure_logging()
+    parser = argparse.ArgumentParser(description="프로세스 풀로 나눠 실행하는 전사 문서 검색/감사")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="워커 프로세스 수 (기본: CPU 코어 수)")
+    parser.add_argument('--shard-by', choices=SHARD_MODES, default='department',
+                        help="department: 부서별, folder: 프로젝트 폴더 해시별 (준공 부서처럼 큰 부서가 있을 때 고르게 분배)")
+    parser.add_argument('--department', type=str, default=None, help="특정 부서만 실행 (예: 01010)")
+    parser.add_argument('--audit', action='store_true', help="문서 검색 대신 감사 실행 (audit_targets_new.csv)")
+    parser.add_argument('--use-ai', action='store_true', help="감사 시 AI 분석 사용 여부")
+    parser.add_argument('--skip-unchanged', action='store_true', help="감사 시 폴더 지문이 같은 프로젝트는 저장된 결과 사용")
+    parser.add_argument('--output', type=str, default=None,
+                        help=f"결과 저장 경로 (기본: 검색 {os.path.basename(CRAWL_OUTPUT)}, 감사 {os.path.basename(AUDIT_OUTPUT)})")
+    args = parser.parse_args()
+
+    if args.audit:
+        report = audit(args.workers, args.shard_by, args.department, args.use_ai, args.skip_unchanged,
+                       args.output or AUDIT_OUTPUT)
+    else:
+        report = crawl(args.workers, args.shard_by, args.department, args.output or CRAWL_OUTPUT)
+    for stats in report['shards']:
+        print(f"샤드 {stats['shard']}: 프로젝트 {stats['projects']}개, {stats['elapsed']:.2f}초")
+    print(f"총 {len(report['projects'])}개 프로젝트, 워커 {report['workers']}개, {report['elapsed']:.2f}초")
+
+# python sharded_crawl.py --workers 8
+# python sharded_crawl.py --workers 8 --shard-by folder  # 프로젝트 폴더 해시로 고르게 분배
+# python sharded_crawl.py --workers 4 --department 01010
+# python sharded_crawl.py --workers 8 --audit --skip-unchanged  # 전사 감사
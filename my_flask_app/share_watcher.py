@@ -0,0 +1,444 @@
+# my_flask_app/share_watcher.py
+# 프로젝트 폴더 감시: 생성/삭제/이름변경 이벤트로 메모리 인덱스(IndexedFileSystem)와 검색기 캐시를 갱신
+#
+# - inotify: Linux 로컬 마운트에서 폴더마다 watch를 걸고 이벤트가 온 폴더만 다시 읽는다.
+# - polling: 그 외 환경(Windows 드라이브, SMB, 트리 덤프)에서는 인덱스에 캐시된 폴더의 mtime만 주기적으로 확인한다.
+# 이벤트 큐가 넘치면(IN_Q_OVERFLOW) 캐시된 폴더 중 mtime이 바뀐 폴더만 다시 읽는 대상 재검색으로 복구한다.
+
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Callable, Iterable, List, NamedTuple, Optional, Set
+
+from config import PROJECT_LIST_CSV, get_full_path, get_network_drive
+from filesystem import FileSystem, IndexedFileSystem, LocalFileSystem
+from metrics import WATCH_EVENTS
+
+logger = logging.getLogger(__name__)
+
+# inotify 상수 (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_CLOSE_WRITE | IN_ATTRIB
+              | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR)
+_EVENT_HEADER = struct.Struct('iIII')
+
+# 이벤트 종류
+CREATED = 'created'
+DELETED = 'deleted'
+MOVED = 'moved'
+MODIFIED = 'modified'
+OVERFLOW = 'overflow'
+
+
+class WatchEvent(NamedTuple):
+    kind: str
+    path: Optional[str]
+    dest_path: Optional[str] = None
+    is_dir: bool = False
+
+
+class WatchLimitError(OSError):
+    """inotify watch 수 제한(fs.inotify.max_user_watches) 초과"""
+
+
+def inotify_available() -> bool:
+    return sys.platform.startswith('linux') and _load_libc() is not None
+
+
+_libc = None
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+            libc.inotify_init1, libc.inotify_add_watch, libc.inotify_rm_watch
+        except (OSError, AttributeError):
+            return None
+        _libc = libc
+    return _libc
+
+
+class InotifyBackend:
+    """inotify로 루트 아래의 모든 폴더를 감시 (새로 생긴 폴더에도 watch 추가)"""
+    name = 'inotify'
+
+    def __init__(self):
+        import ctypes
+        self._ctypes = ctypes
+        self._libc = _load_libc()
+        if self._libc is None:
+            raise OSError(errno.ENOSYS, "inotify를 사용할 수 없습니다.")
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._paths: Dict[int, str] = {}
+        self._wds: Dict[str, int] = {}
+        self._roots: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def _add_watch(self, path: str) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = self._ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise WatchLimitError(err, "inotify watch 수 제한 초과 (fs.inotify.max_user_watches)", path)
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return
+            raise OSError(err, os.strerror(err), path)
+        with self._lock:
+            self._paths[wd] = path
+            self._wds[path] = wd
+
+    def _watch_tree(self, root: str) -> int:
+        """root와 하위 폴더 전체에 watch 추가 (이미 있는 watch는 inotify가 그대로 유지)"""
+        count = 0
+        stack = [root]
+        while stack:
+            path = stack.pop()
+            self._add_watch(path)
+            count += 1
+            try:
+                with os.scandir(path) as it:
+                    stack.extend(entry.path for entry in it if entry.is_dir(follow_symlinks=False))
+            except OSError:
+                continue
+        return count
+
+    def add_root(self, path: str) -> int:
+        self._roots.add(path)
+        return self._watch_tree(path)
+
+    def resync(self) -> None:
+        """이벤트 유실 후 빠진 폴더에 watch를 다시 추가"""
+        for root in list(self._roots):
+            self._watch_tree(root)
+
+    def _rename_tree(self, src: str, dest: str) -> None:
+        prefix = src + os.sep
+        with self._lock:
+            for wd, path in list(self._paths.items()):
+                if path == src or path.startswith(prefix):
+                    new_path = dest + path[len(src):]
+                    self._paths[wd] = new_path
+                    self._wds.pop(path, None)
+                    self._wds[new_path] = wd
+
+    def _forget(self, wd: int) -> None:
+        with self._lock:
+            path = self._paths.pop(wd, None)
+            if path is not None:
+                self._wds.pop(path, None)
+
+    def watch_count(self) -> int:
+        return len(self._paths)
+
+    def read(self, timeout: float) -> List[WatchEvent]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 1024 * 64)
+        except BlockingIOError:
+            return []
+
+        events = []
+        moved_from: Dict[int, WatchEvent] = {}
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(WatchEvent(OVERFLOW, None))
+                continue
+            if mask & IN_IGNORED:
+                self._forget(wd)
+                continue
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+            is_dir = bool(mask & IN_ISDIR)
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                # 감시 중인 폴더 자체가 사라짐 (루트 삭제/이동, 상위 폴더 이벤트가 없는 경우)
+                events.append(WatchEvent(DELETED, directory, is_dir=True))
+                continue
+
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_CREATE:
+                if is_dir:
+                    self._watch_tree(path)
+                events.append(WatchEvent(CREATED, path, is_dir=is_dir))
+            elif mask & IN_DELETE:
+                events.append(WatchEvent(DELETED, path, is_dir=is_dir))
+            elif mask & IN_MOVED_FROM:
+                moved_from[cookie] = WatchEvent(DELETED, path, is_dir=is_dir)
+            elif mask & IN_MOVED_TO:
+                source = moved_from.pop(cookie, None)
+                if source is None:
+                    # 감시 범위 밖에서 들어온 항목
+                    if is_dir:
+                        self._watch_tree(path)
+                    events.append(WatchEvent(CREATED, path, is_dir=is_dir))
+                else:
+                    if is_dir:
+                        self._rename_tree(source.path, path)
+                    events.append(WatchEvent(MOVED, source.path, path, is_dir))
+            elif mask & (IN_CLOSE_WRITE | IN_ATTRIB | IN_MODIFY):
+                events.append(WatchEvent(MODIFIED, path, is_dir=is_dir))
+        # 짝이 없는 MOVED_FROM은 감시 범위 밖으로 나간 항목
+        events.extend(moved_from.values())
+        return events
+
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingBackend:
+    """인덱스에 캐시된 폴더의 mtime만 주기적으로 확인 (바뀐 폴더만 다시 읽음)
+
+    감사/검색이 한 번도 읽지 않은 폴더는 캐시에 없으므로 확인할 필요도 없다.
+    폴더 mtime은 바로 아래 항목이 생성/삭제/이름변경될 때 바뀐다 (Windows, SMB 공유 포함).
+    """
+    name = 'polling'
+
+    def __init__(self, index: IndexedFileSystem, interval: float):
+        self.index = index
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def add_root(self, path: str) -> int:
+        return 0
+
+    def resync(self) -> None:
+        pass
+
+    def watch_count(self) -> int:
+        return len(self.index.cached_dirs())
+
+    def read(self, timeout: float) -> List[WatchEvent]:
+        # 폴링은 interval마다 한 번 (timeout은 무시하고 stop()이 호출되면 바로 반환)
+        if self._stop_event.wait(self.interval):
+            return []
+        # 바뀐 폴더의 목록은 ShareWatcher.apply()가 다시 읽고 추가/삭제된 항목을 반영
+        return [WatchEvent(MODIFIED, directory, is_dir=True) for directory in self.index.changed_dirs()]
+
+    def close(self) -> None:
+        self._stop_event.set()
+
+
+def load_watch_roots(project_list_csv: str = PROJECT_LIST_CSV) -> List[str]:
+    """project_list.csv의 프로젝트 폴더와 감사 폴더({드라이브}/{부서코드}_{프로젝트ID})"""
+    import pandas as pd
+    df = pd.read_csv(project_list_csv, dtype=str).fillna('')
+    drive = get_network_drive()
+    roots = []
+    for row in df.itertuples(index=False):
+        if row.original_folder:
+            roots.append(get_full_path(row.original_folder))
+        if row.project_id and row.department_code:
+            roots.append(os.path.join(drive, f"{row.department_code.zfill(5)}_{row.project_id}"))
+    return list(dict.fromkeys(root for root in roots if root))
+
+
+def _innermost(fs: FileSystem) -> FileSystem:
+    while hasattr(fs, 'inner'):
+        fs = fs.inner
+    return fs
+
+
+class ShareWatcher:
+    """프로젝트 루트를 감시하여 IndexedFileSystem과 검색기 캐시를 최신 상태로 유지
+
+    이벤트가 온 폴더는 인덱스에 캐시되어 있을 때만 다시 읽고(refresh), 삭제/이동된 폴더는 하위 캐시를 버린다.
+    add_listener()로 등록한 콜백(검색기 캐시 무효화)에는 바뀐 폴더 경로와 버린 하위 트리 경로를 전달한다.
+    """
+
+    def __init__(self, index: IndexedFileSystem, roots: Optional[Iterable[str]] = None, backend: str = 'auto',
+                 poll_interval: float = 30.0, roots_loader: Callable[[], List[str]] = load_watch_roots):
+        if not isinstance(index, IndexedFileSystem):
+            raise TypeError("ShareWatcher에는 IndexedFileSystem이 필요합니다 (AUDIT_WATCH_SHARE=1).")
+        self.index = index
+        self.requested_backend = backend
+        self.poll_interval = poll_interval
+        self._roots = list(roots) if roots is not None else None
+        self._roots_loader = roots_loader
+        self._listeners: List[Callable[[Set[str], Set[str]], None]] = []
+        self._backend = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._stats = {'events': 0, 'overflows': 0, 'rescans': 0, 'refreshed_dirs': 0,
+                       'last_event': None, 'last_rescan': None, 'last_error': None, 'started_at': None}
+
+    def add_listener(self, callback: Callable[[Set[str], Set[str]], None]) -> None:
+        """callback(바뀐 폴더 경로 집합, 버린 하위 트리 경로 집합)"""
+        self._listeners.append(callback)
+
+    def _create_backend(self):
+        local = isinstance(_innermost(self.index), LocalFileSystem)
+        if self.requested_backend == 'inotify' or (self.requested_backend == 'auto' and local and inotify_available()):
+            try:
+                return InotifyBackend()
+            except OSError as e:
+                logger.warning("inotify를 시작할 수 없어 폴링으로 감시합니다: %s", e)
+        return PollingBackend(self.index, self.poll_interval)
+
+    def _add_roots(self, roots: List[str]) -> None:
+        for root in roots:
+            self.index.add_root(root)
+        try:
+            watches = sum(self._backend.add_root(root) for root in roots)
+        except WatchLimitError as e:
+            logger.warning("%s, 폴링으로 전환합니다.", e)
+            self._backend.close()
+            self._backend = PollingBackend(self.index, self.poll_interval)
+            watches = 0
+        logger.info("공유 폴더 감시 시작: 루트 %d개 (%s, watch %d개)", len(roots), self._backend.name, watches)
+
+    def start(self) -> None:
+        """백그라운드 스레드에서 감시 시작 (루트 목록 로드와 watch 추가도 스레드에서 수행)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='share-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._backend is not None:
+            self._backend.close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        try:
+            roots = self._roots if self._roots is not None else self._roots_loader()
+            self._backend = self._create_backend()
+            self._add_roots(roots)
+            self._stats['started_at'] = time.time()
+        except Exception as e:
+            self._stats['last_error'] = str(e)
+            logger.error("공유 폴더 감시를 시작하지 못했습니다: %s", e)
+            return
+
+        while not self._stop_event.is_set():
+            try:
+                events = self._backend.read(timeout=1.0)
+                if events:
+                    self.apply(events)
+            except Exception as e:
+                if self._stop_event.is_set():
+                    break
+                self._stats['last_error'] = str(e)
+                logger.error("공유 폴더 감시 중 오류: %s", e)
+                self._stop_event.wait(self.poll_interval)
+
+    def rescan(self) -> Set[str]:
+        """캐시된 폴더 중 mtime이 바뀐 폴더만 다시 읽는 대상 재검색 (이벤트 유실 복구)"""
+        start = time.time()
+        if self._backend is not None:
+            self._backend.resync()
+        changed = self.index.revalidate()
+        self._stats['rescans'] += 1
+        self._stats['last_rescan'] = time.time()
+        logger.info("대상 재검색 완료: 캐시 폴더 %d개 중 %d개 갱신 (%.2f초)",
+                    len(self.index.cached_dirs()), len(changed), time.time() - start)
+        return {directory for directory, _, _ in changed}
+
+    def _refresh_dir(self, directory: str, dropped_trees: Set[str]) -> None:
+        """폴더 목록을 다시 읽고 사라진 항목의 하위 캐시와 새 항목의 '없음' 캐시를 버림"""
+        added, removed = self.index.refresh(directory)
+        for name in removed:
+            path = os.path.join(directory, name)
+            self.index.invalidate_tree(path)
+            dropped_trees.add(path)
+        for name in added:
+            self.index.invalidate_tree(os.path.join(directory, name))
+        if added:
+            WATCH_EVENTS.inc(len(added), kind=CREATED)
+        if removed:
+            WATCH_EVENTS.inc(len(removed), kind=DELETED)
+
+    def apply(self, events: List[WatchEvent]) -> None:
+        """이벤트 묶음을 인덱스에 반영 (같은 폴더는 한 번만 다시 읽음)"""
+        dirty_dirs: Set[str] = set()
+        dropped_trees: Set[str] = set()
+        for event in events:
+            WATCH_EVENTS.inc(kind=event.kind)
+            if event.kind == OVERFLOW:
+                self._stats['overflows'] += 1
+                logger.warning("감시 이벤트 큐가 넘쳤습니다. 캐시된 폴더를 대상으로 재검색합니다.")
+                dirty_dirs |= self.rescan()
+                continue
+            if event.kind in (DELETED, MOVED):
+                self.index.invalidate_tree(event.path)
+                dropped_trees.add(event.path)
+                dirty_dirs.add(os.path.dirname(event.path))
+            if event.kind in (CREATED, MOVED):
+                target = event.dest_path or event.path
+                # 새 경로에 남아 있을 수 있는 '없음' 캐시 제거
+                self.index.invalidate_tree(target)
+                dirty_dirs.add(os.path.dirname(target))
+            if event.kind == MODIFIED:
+                if event.is_dir:
+                    # 폴링: 폴더 mtime 변경 (추가/삭제된 항목은 목록을 다시 읽어 확인)
+                    self._refresh_dir(event.path, dropped_trees)
+                else:
+                    self.index.invalidate(event.path)
+                    dirty_dirs.add(os.path.dirname(event.path))
+
+        for directory in dirty_dirs:
+            self.index.refresh(directory)
+        refreshed = dirty_dirs | {event.path for event in events if event.kind == MODIFIED and event.is_dir}
+        self._stats['events'] += len(events)
+        self._stats['refreshed_dirs'] += len(refreshed)
+        self._stats['last_event'] = time.time()
+        for listener in self._listeners:
+            try:
+                listener(refreshed, dropped_trees)
+            except Exception as e:
+                logger.error("감시 이벤트 리스너 오류: %s", e)
+
+    def status(self) -> Dict[str, Any]:
+        def fmt(timestamp):
+            return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else None
+
+        return {
+            'running': self._thread is not None and self._thread.is_alive(),
+            'backend': self._backend.name if self._backend else None,
+            'watches': self._backend.watch_count() if self._backend else 0,
+            'poll_interval': self.poll_interval,
+            'index': self.index.stats(),
+            **self._stats,
+            'last_event': fmt(self._stats['last_event']),
+            'last_rescan': fmt(self._stats['last_rescan']),
+            'started_at': fmt(self._stats['started_at'])
+        }
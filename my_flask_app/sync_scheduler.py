@@ -0,0 +1,169 @@
+# my_flask_app/sync_scheduler.py
+# 변경된 보고서/결과 파일을 모아 두었다가 백그라운드에서 GitHub에 동기화
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional
+
+from git_operations import push_changed_files
+from metrics import GIT_SYNC_SECONDS, GIT_SYNC_FILES
+
+logger = logging.getLogger(__name__)
+
+# 마지막 변경 후 이 시간 동안 새 변경이 없으면 동기화 (초)
+SYNC_IDLE_SECONDS = float(os.getenv('GIT_SYNC_IDLE', '30'))
+# 변경이 계속 들어와도 가장 오래된 변경이 이 시간을 넘기면 동기화 (초)
+SYNC_INTERVAL_SECONDS = float(os.getenv('GIT_SYNC_INTERVAL', '300'))
+
+
+def _format_time(timestamp: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S') if timestamp else None
+
+
+class SyncScheduler:
+    """파일을 dirty로 표시만 하고, 유휴 시간 또는 최대 대기 시간이 지나면 한 번에 동기화
+
+    보고서 생성이나 감사 명령은 mark_dirty()만 호출하고 바로 반환하므로 GitHub 응답을
+    기다리지 않는다. 짧은 시간에 여러 번 표시된 파일은 한 번의 커밋으로 묶이며,
+    동기화에 실패한 파일은 다시 dirty로 남겨 다음 주기에 재시도한다.
+    """
+
+    def __init__(self, idle: float = SYNC_IDLE_SECONDS, interval: float = SYNC_INTERVAL_SECONDS, push=push_changed_files):
+        self.idle = idle
+        self.interval = interval
+        self._push = push
+        self._lock = threading.Lock()
+        self._dirty = set()
+        self._first_dirty: Optional[float] = None
+        self._last_dirty: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._syncing = False
+        # 실패 후에는 최대 대기 시간이 지난 뒤 재시도
+        self._retry_after = 0.0
+        self._stats = {'flushes': 0, 'files_synced': 0, 'failures': 0, 'last_sync': None,
+                       'last_commit': None, 'last_error': None, 'last_duration': None}
+
+    def mark_dirty(self, *paths: str) -> None:
+        """동기화할 파일 표시 (어느 스레드에서 호출해도 되며 즉시 반환)"""
+        now = time.time()
+        with self._lock:
+            self._dirty.update(path for path in paths if path)
+            if self._first_dirty is None:
+                self._first_dirty = now
+            self._last_dirty = now
+        if self._loop is not None and self._wakeup is not None:
+            try:
+                self._loop.call_soon_threadsafe(self._wakeup.set)
+            except RuntimeError:
+                # 스케줄러 루프가 이미 닫힘
+                pass
+
+    def start(self) -> None:
+        """현재 이벤트 루프에서 백그라운드 동기화 시작 (이미 실행 중이면 무시)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = self._loop.create_task(self._run())
+        logger.info(f"GitHub 동기화 스케줄러 시작 (유휴 {self.idle:.0f}초, 최대 대기 {self.interval:.0f}초)")
+
+    async def stop(self, flush: bool = True) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if flush:
+            await self.flush()
+
+    def _due_in(self, now: float) -> Optional[float]:
+        """다음 동기화까지 남은 시간 (dirty 파일이 없으면 None)"""
+        with self._lock:
+            if not self._dirty:
+                return None
+            due = min(self._last_dirty + self.idle, self._first_dirty + self.interval)
+            return max(0.0, due - now, self._retry_after - now)
+
+    async def _run(self) -> None:
+        while True:
+            due_in = self._due_in(time.time())
+            if due_in == 0:
+                await self.flush()
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=due_in)
+            except asyncio.TimeoutError:
+                pass
+
+    async def flush(self) -> Optional[str]:
+        """dirty 파일을 지금 동기화하고 커밋 SHA 반환 (바뀐 내용이 없거나 실패하면 None)"""
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+        async with self._flush_lock:
+            with self._lock:
+                paths = sorted(self._dirty)
+                self._dirty.clear()
+                self._first_dirty = self._last_dirty = None
+            if not paths:
+                return None
+
+            self._syncing = True
+            start = time.time()
+            try:
+                commit, pushed = await self._push([path for path in paths if os.path.exists(path)])
+            except Exception as e:
+                GIT_SYNC_SECONDS.observe(time.time() - start, outcome='error')
+                logger.error(f"GitHub 동기화 실패, 다음 주기에 재시도: {str(e)}")
+                self._stats['failures'] += 1
+                self._stats['last_error'] = str(e)
+                self._retry_after = time.time() + self.interval
+                self.mark_dirty(*paths)
+                return None
+            finally:
+                self._syncing = False
+                self._stats['last_duration'] = round(time.time() - start, 2)
+
+            GIT_SYNC_SECONDS.observe(time.time() - start, outcome='ok')
+            GIT_SYNC_FILES.inc(len(pushed))
+            self._retry_after = 0.0
+            self._stats['flushes'] += 1
+            self._stats['files_synced'] += len(paths)
+            self._stats['last_sync'] = time.time()
+            self._stats['last_error'] = None
+            if commit:
+                self._stats['last_commit'] = commit
+            logger.info(f"GitHub 동기화 완료: {len(paths)}개 파일, 커밋 {commit[:7] if commit else '없음(변경 없음)'}")
+            return commit
+
+    def status(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            pending = len(self._dirty)
+            oldest = self._first_dirty
+        due_in = self._due_in(now)
+        return {
+            'running': self._task is not None and not self._task.done(),
+            'syncing': self._syncing,
+            'pending_files': pending,
+            'oldest_pending_seconds': round(now - oldest, 1) if oldest else None,
+            'next_sync_in_seconds': round(due_in, 1) if due_in is not None else None,
+            'idle_seconds': self.idle,
+            'interval_seconds': self.interval,
+            **self._stats,
+            'last_sync': _format_time(self._stats['last_sync'])
+        }
+
+
+# 프로세스 공용 스케줄러 (봇이 시작, 보고서 생성/감사가 dirty 표시)
+sync_scheduler = SyncScheduler()